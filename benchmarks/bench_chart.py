@@ -0,0 +1,77 @@
+"""
+Benchmark chart rendering: drawing a 1M-point line chart, and repeated
+updates of it through ChartView (decimated, redrawn in place or blitted)
+against rebuilding the axes and plotting every point.
+
+Usage:
+    python benchmarks/bench_chart.py [points]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from core.ui.components import ChartView, decimate_minmax
+
+UPDATES = 20
+
+def time_call(fn, repeat: int = UPDATES) -> float:
+    """Return the median time of fn() in milliseconds."""
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+def main() -> None:
+    """Run the benchmark."""
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    app = QApplication.instance() or QApplication([])
+    x = np.arange(n_points, dtype=np.float64)
+    series = [np.sin(x / 1e4 + i) * (1 + 0.01 * i) for i in range(UPDATES)]
+
+    view = ChartView()
+    view.resize(800, 600)
+
+    def rebuild(i: int) -> None:
+        view.ax.clear()
+        view.ax.plot(x, series[i])
+        view.figure.tight_layout()
+        view.canvas.draw()
+
+    ms = time_call(lambda i: decimate_minmax(x, series[i], 800))
+    print(f"decimate_minmax of {n_points:,} points: {ms:.1f} ms")
+
+    ms = time_call(rebuild, repeat=5)
+    print(f"Full rebuild, all points:        {ms:8.1f} ms per update")
+
+    view._kind = None
+    view.plot_line_chart(x, series[0], "Sweep", "x", "y")
+    view.flush()
+
+    def update(i: int) -> None:
+        view.plot_line_chart(x, series[i], "Sweep", "x", "y")
+        view.flush()
+
+    ms = time_call(update)
+    print(f"ChartView update (decimated):    {ms:8.1f} ms per update")
+
+    def update_blit(i: int) -> None:
+        view.plot_line_chart(x, 0.5 * series[i], "Sweep", "x", "y")
+        view.flush()
+
+    ms = time_call(update_blit)
+    print(f"ChartView update within limits:  {ms:8.1f} ms per update (blitted)")
+    app.processEvents()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark the memory-mapped factor store: importing a large CSV factor dump,
+opening the store, and encoding activity names against it, compared with
+parsing the CSV into a FactorMatrix on every start.
+
+Usage:
+    python benchmarks/bench_factor_store.py [activities]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "modules", "lca", "src"))
+
+from engine import FactorMatrix, IMPACT_CATEGORIES
+from factor_store import build_factor_store, FactorStore
+
+def timed(fn):
+    """Return fn()'s result and elapsed milliseconds."""
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def main() -> None:
+    """Run the benchmark."""
+    n_activities = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "factors.csv"
+        frame = pd.DataFrame(rng.lognormal(0.0, 1.0, (n_activities, 3)), columns=list(IMPACT_CATEGORIES))
+        frame.insert(0, "activity", [f"activity_{i:08d}_{rng.integers(1e6)}" for i in range(n_activities)])
+        frame.to_csv(source, index=False)
+        names = frame["activity"].sample(10_000, random_state=0).tolist()
+
+        def parse_csv() -> FactorMatrix:
+            data = pd.read_csv(source)
+            return FactorMatrix(data["activity"].tolist(), data[list(IMPACT_CATEGORIES)].to_numpy())
+
+        parsed, ms = timed(parse_csv)
+        print(f"Parse CSV into a FactorMatrix ({n_activities:,} activities): {ms:8.0f} ms")
+        _, ms = timed(lambda: parsed.encode(names))
+        print(f"  encode 10,000 names:                           {ms:8.1f} ms")
+
+        _, ms = timed(lambda: build_factor_store(source, Path(directory) / "store"))
+        print(f"Import into factor store (once):                 {ms:8.0f} ms")
+        store, ms = timed(lambda: FactorStore(Path(directory) / "store"))
+        print(f"Open factor store:                               {ms:8.1f} ms")
+        _, ms = timed(lambda: store.matrix.encode(names))
+        print(f"  encode 10,000 names:                           {ms:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark the vectorized impact engine against the pure-Python loop.
+
+Usage:
+    python benchmarks/bench_impact_engine.py
+"""
+import os
+import sys
+import time
+from typing import List, Dict, Any, Callable
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "modules", "lca", "src"))
+
+from engine import FactorMatrix, encode_stages, stage_impacts, total_impacts
+from config.module_config.lca_config import DEFAULT_IMPACT_FACTORS
+
+SIZES = [10_000, 100_000, 1_000_000]
+ACTIVITIES_PER_STAGE = 50
+
+def make_stages(n_activities: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Create random stages with n_activities activity entries in total."""
+    rng = np.random.default_rng(seed)
+    names = list(DEFAULT_IMPACT_FACTORS.keys())
+    picks = rng.integers(0, len(names), n_activities)
+    quantities = rng.uniform(0.1, 1000.0, n_activities)
+
+    stages = []
+    for start in range(0, n_activities, ACTIVITIES_PER_STAGE):
+        stop = min(start + ACTIVITIES_PER_STAGE, n_activities)
+        stages.append({
+            "name": f"Stage {len(stages)}",
+            "activities": [
+                {"activity": names[picks[i]], "quantity": float(quantities[i])}
+                for i in range(start, stop)
+            ]
+        })
+    return stages
+
+def python_loop(stages: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Reference implementation: the original per-activity Python loop."""
+    factors = {
+        activity: {"co2": values[0], "water": values[1], "energy": values[2]}
+        for activity, values in DEFAULT_IMPACT_FACTORS.items()
+    }
+    results = {"co2": 0.0, "water": 0.0, "energy": 0.0}
+    for stage in stages:
+        for activity_data in stage.get("activities", []):
+            activity_name = activity_data.get("activity")
+            quantity = float(activity_data.get("quantity", 1.0))
+            if activity_name in factors:
+                impact = factors[activity_name]
+                results["co2"] += impact["co2"] * quantity
+                results["water"] += impact["water"] * quantity
+                results["energy"] += impact["energy"] * quantity
+    return results
+
+def best_of(func: Callable[[], Any], repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    factors = FactorMatrix.from_defaults()
+
+    print(f"{'activities':>12} {'python (s)':>12} {'engine (s)':>12} {'encoded (s)':>12} "
+          f"{'speedup':>9} {'kernel speedup':>15}")
+    for size in SIZES:
+        stages = make_stages(size)
+        inventory = encode_stages(stages, factors)
+
+        python_time = best_of(lambda: python_loop(stages))
+        engine_time = best_of(lambda: total_impacts(encode_stages(stages, factors), factors))
+        kernel_time = best_of(lambda: (total_impacts(inventory, factors),
+                                       stage_impacts(inventory, factors)))
+
+        print(f"{size:>12,} {python_time:>12.4f} {engine_time:>12.4f} {kernel_time:>12.4f} "
+              f"{python_time / engine_time:>8.1f}x {python_time / kernel_time:>14.1f}x")
+
+if __name__ == "__main__":
+    main()
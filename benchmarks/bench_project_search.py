@@ -0,0 +1,85 @@
+"""
+Benchmark project search over 100k projects.
+
+Usage:
+    python benchmarks/bench_project_search.py
+"""
+import os
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+from sqlalchemy import insert
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from core.data.database import configure_database, init_db, session_scope, get_engine
+from core.data.models import Project, Tag, tags_association
+from core.data.search import search_projects, rebuild_search_index
+
+N_PROJECTS = 100_000
+N_TAGS = 200
+TAGS_PER_PROJECT = 5
+REPEATS = 20
+WORDS = ["steel", "concrete", "bridge", "tunnel", "plant", "retrofit", "pipeline",
+         "warehouse", "solar", "timber", "offshore", "substation", "hospital", "school"]
+
+def populate(seed: int = 0) -> None:
+    """Insert random projects and tag links with Core inserts."""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+    projects = [
+        {"id": i + 1,
+         "name": " ".join(words[rng.integers(0, len(WORDS), 2)]) + f" {i}",
+         "description": " ".join(words[rng.integers(0, len(WORDS), 8)])}
+        for i in range(N_PROJECTS)
+    ]
+    links = {
+        (int(tag), project_id)
+        for project_id in range(1, N_PROJECTS + 1)
+        for tag in rng.integers(1, N_TAGS + 1, TAGS_PER_PROJECT)
+    }
+    with session_scope() as db:
+        db.execute(insert(Tag.__table__), [{"id": i, "name": f"tag{i}"} for i in range(1, N_TAGS + 1)])
+        db.execute(insert(Project.__table__), projects)
+        db.execute(insert(tags_association), [{"tag_id": t, "project_id": p} for t, p in links])
+    with get_engine().begin() as connection:
+        rebuild_search_index(connection)
+
+def time_query(label: str, query: Callable[[], dict]) -> None:
+    """Print the median time of a search."""
+    query()
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = query()
+        times.append(time.perf_counter() - start)
+    print(f"{label:<40} {np.median(times) * 1000:8.2f} ms  ({len(result['results'])} results)")
+
+def main() -> None:
+    """Run the benchmark."""
+    db_path = os.path.join(PROJECT_ROOT, "benchmarks", "bench_search.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    configure_database(f"sqlite:///{db_path}")
+    init_db()
+
+    start = time.perf_counter()
+    populate()
+    print(f"Indexed {N_PROJECTS} projects in {time.perf_counter() - start:.1f}s")
+
+    with session_scope() as db:
+        time_query("text: 'steel bridge'", lambda: search_projects(db, "steel bridge"))
+        time_query("text prefix: 'sub'", lambda: search_projects(db, "sub"))
+        time_query("tags: tag1 & tag2", lambda: search_projects(db, tags=["tag1", "tag2"]))
+        time_query("text + tags", lambda: search_projects(db, "solar", tags=["tag3"]))
+        time_query("text, page 50", lambda: search_projects(db, "timber", page=50))
+
+    get_engine().dispose()
+    os.remove(db_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark stage memoization on a portfolio of projects that share stages:
+every stage computed, a cold cache, a warm cache, and a warm cache after
+5% of the shared stages changed.
+
+Usage:
+    python benchmarks/bench_stage_cache.py [projects]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "modules", "lca", "src"))
+
+from engine import FactorMatrix, encode_stages, stage_impacts
+from stage_cache import StageCache, cached_stage_impacts
+
+def timed(fn):
+    """Return fn()'s result and elapsed milliseconds."""
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def main() -> None:
+    """Run the benchmark."""
+    n_projects = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = np.random.default_rng(0)
+    n_activities = 5000
+    factors = FactorMatrix([f"activity_{i}" for i in range(n_activities)], rng.uniform(0.0, 10.0, (n_activities, 3)))
+
+    # 300 distinct stages of 200 activities, 20 per project
+    pool = [
+        {"name": f"Stage {i}", "activities": [
+            {"activity": f"activity_{a}", "quantity": float(q)}
+            for a, q in zip(rng.integers(0, n_activities, 200), rng.uniform(0.1, 100.0, 200))
+        ]}
+        for i in range(300)
+    ]
+    portfolio = [[pool[i] for i in rng.integers(0, len(pool), 20)] for _ in range(n_projects)]
+
+    def compute(stages):
+        return stage_impacts(encode_stages(stages, factors), factors)
+
+    def run(cache):
+        return [cached_stage_impacts(stages, factors, cache, compute) for stages in portfolio]
+
+    _, ms = timed(lambda: [compute(stages) for stages in portfolio])
+    print(f"{n_projects} projects, no cache:         {ms:8.1f} ms")
+    cache = StageCache()
+    _, ms = timed(lambda: run(cache))
+    print(f"Cold cache:                       {ms:8.1f} ms")
+    _, ms = timed(lambda: run(cache))
+    print(f"Warm cache:                       {ms:8.1f} ms")
+    for stage in pool[:15]:
+        stage["activities"][0]["quantity"] += 1.0
+    _, ms = timed(lambda: run(cache))
+    print(f"Warm cache, 5% of stages changed: {ms:8.1f} ms")
+    stats = cache.stats
+    print(f"Hit rate {stats['hit_rate']:.1%} ({stats['hits']:,} hits, {stats['misses']:,} misses)")
+
+if __name__ == "__main__":
+    main()
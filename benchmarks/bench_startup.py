@@ -0,0 +1,74 @@
+"""
+Benchmark application startup: time from interpreter start to the first
+painted main window, which heavy libraries were imported by then, and when
+the modules' background initialization finished.
+
+Each run starts a fresh interpreter so import caches don't carry over.
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAVY_MODULES = ["matplotlib", "pandas", "numpy", "openpyxl"]
+
+# Runs in the child interpreter
+CHILD_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+sys.path.insert(0, os.path.join({root!r}, "src"))
+
+from PyQt5.QtWidgets import QApplication
+import main
+
+app = QApplication([])
+window = main.create_main_window()
+window.run()
+app.processEvents()
+first_window = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+
+window.module_registry.wait()
+ready = time.perf_counter() - start
+window.module_registry.shutdown()
+print(json.dumps({{"seconds": first_window, "ready": ready, "loaded": loaded,
+                  "timings": window.module_registry.timings}}))
+"""
+
+def run_once(database_uri: str, index_path: str) -> dict:
+    """Start the application in a child process and return its timing."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", DATABASE_URI=database_uri,
+               MODULE_INDEX_FILE=index_path)
+    script = CHILD_SCRIPT.format(root=PROJECT_ROOT, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", script], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main() -> None:
+    """Run the benchmark."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = f"sqlite:///{os.path.join(directory, 'startup.db')}"
+        index_path = os.path.join(directory, "module_index.json")
+        results = [run_once(database_uri, index_path) for _ in range(runs)]
+
+    seconds = np.array([result["seconds"] for result in results])
+    print(f"Time to first window over {runs} runs: median {np.median(seconds) * 1000:.0f} ms, "
+          f"min {seconds.min() * 1000:.0f} ms, max {seconds.max() * 1000:.0f} ms")
+    ready = np.array([result["ready"] for result in results])
+    print(f"Modules initialized after: median {np.median(ready) * 1000:.0f} ms")
+    for name, phases in results[-1]["timings"].items():
+        print(f"  {name}: " + ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in phases.items()))
+    print(f"Heavy modules imported by the first window: {', '.join(results[-1]['loaded']) or 'none'}")
+
+if __name__ == "__main__":
+    main()
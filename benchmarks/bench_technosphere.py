@@ -0,0 +1,63 @@
+"""
+Benchmark the sparse technosphere solver on a random linked process network:
+factorization time, cradle-to-gate solves for single and batched demand
+vectors, and cumulative factors for all processes.
+
+Usage:
+    python benchmarks/bench_technosphere.py [processes] [inputs_per_process]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "modules", "lca", "src"))
+
+from engine import FactorMatrix
+from technosphere import Technosphere
+
+def make_network(n_processes: int, inputs_per_process: int, seed: int = 0) -> Technosphere:
+    """Create a random network whose columns consume less than one unit in total (so it is solvable)."""
+    rng = np.random.default_rng(seed)
+    factors = FactorMatrix([f"process_{i}" for i in range(n_processes)],
+                           rng.lognormal(0.0, 1.0, (n_processes, 3)))
+    process_index = np.repeat(np.arange(n_processes), inputs_per_process)
+    input_index = rng.integers(0, n_processes, process_index.shape[0])
+    amounts = rng.uniform(0.0, 0.9 / inputs_per_process, process_index.shape[0])
+    return Technosphere.from_exchanges(factors, process_index, input_index, amounts)
+
+def timed(fn):
+    """Return fn()'s result and elapsed milliseconds."""
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def main() -> None:
+    """Run the benchmark."""
+    n_processes = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    inputs_per_process = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    technosphere, ms = timed(lambda: make_network(n_processes, inputs_per_process))
+    print(f"Network: {technosphere.n_activities:,} processes, {technosphere.n_exchanges:,} exchanges "
+          f"(built in {ms:.0f} ms)")
+
+    _, ms = timed(technosphere.factorize)
+    print(f"Sparse LU factorization:        {ms:8.1f} ms")
+
+    demand = np.zeros(n_processes)
+    demand[0] = 1.0
+    _, ms = timed(lambda: technosphere.impacts(demand))
+    print(f"Cradle-to-gate solve (cached):  {ms:8.1f} ms")
+
+    demands = np.random.default_rng(1).uniform(0.0, 1.0, (n_processes, 100))
+    _, ms = timed(lambda: technosphere.impacts(demands))
+    print(f"100 demand vectors:             {ms:8.1f} ms")
+
+    _, ms = timed(technosphere.cumulative_factors)
+    print(f"Cumulative factors (all):       {ms:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
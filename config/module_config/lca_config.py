@@ -0,0 +1,80 @@
+"""
+Configuration settings for the Life Cycle Analysis (LCA) module.
+"""
+
+# Default impact factors for common activities
+# Format: activity_name: (co2_kg, water_l, energy_kwh)
+DEFAULT_IMPACT_FACTORS = {
+    "electricity_generation_coal_kwh": (1.1, 2.0, 1.0),
+    "electricity_generation_natural_gas_kwh": (0.5, 1.0, 1.0),
+    "electricity_generation_solar_kwh": (0.05, 0.1, 1.0),
+    "electricity_generation_wind_kwh": (0.02, 0.1, 1.0),
+    "transportation_truck_km": (0.1, 0.02, 0.4),
+    "transportation_ship_km": (0.01, 0.005, 0.1),
+    "transportation_rail_km": (0.03, 0.01, 0.2),
+    "material_steel_kg": (2.0, 50.0, 25.0),
+    "material_aluminum_kg": (8.0, 100.0, 45.0),
+    "material_plastic_kg": (3.0, 80.0, 30.0),
+    "material_glass_kg": (0.8, 10.0, 15.0),
+    "material_concrete_kg": (0.2, 1.0, 1.0),
+    "material_paper_kg": (1.0, 30.0, 10.0),
+    "waste_landfill_kg": (0.5, 0.1, 0.1),
+    "waste_recycling_kg": (0.1, 5.0, 1.0),
+    "waste_incineration_kg": (2.0, 0.5, -0.5)  # Negative energy means energy recovery
+}
+
+# LCA default settings
+DEFAULT_SETTINGS = {
+    "default_stages": ["Raw Material Extraction", "Manufacturing", "Transportation", "Use", "End of Life"],
+    "chart_colors": ["#3366CC", "#DC3912", "#FF9900", "#109618", "#990099"],
+    "export_formats": ["pdf", "csv", "xlsx", "parquet", "feather"],
+    "calculation_precision": 3,  # Decimal places
+    "include_uncertainty": True,  # Whether to include uncertainty in calculations
+    "recompute_interval": 1000  # Edits between full recalculations of live (incremental) results
+}
+
+# Monte Carlo uncertainty settings (used when DEFAULT_SETTINGS["include_uncertainty"] is True)
+UNCERTAINTY = {
+    "default_distribution": None,  # Distribution for factors without one: lognormal, triangular or None (no uncertainty)
+    "default_sigma": 0.1,      # Lognormal standard deviation of ln(value)
+    "default_min": 0.9,        # Triangular lower bound as a multiple of the value
+    "default_max": 1.1,        # Triangular upper bound as a multiple of the value
+    "max_samples": 100000,
+    "min_samples": 2000,       # Samples drawn before early stopping is considered
+    "block_size": 1000,        # Samples per vectorized block
+    "tolerance": 0.005,        # Stop once percentile CI half-widths are within 0.5% of the median
+    "confidence": 0.95,
+    "seed": None,              # Set to an integer for reproducible results
+    "max_workers": None        # Worker processes for sampling (None = single process)
+}
+
+# Global sensitivity analysis settings (Saltelli sampling with Sobol indices)
+SENSITIVITY = {
+    "base_samples": 1024,      # Initial Sobol sequence points (a power of two)
+    "max_samples": 16384,      # Points drawn at most while the indices haven't converged
+    "quantity_range": 0.1,     # Quantities vary uniformly within +/-10%
+    "n_bootstrap": 200,        # Bootstrap resamples for the index confidence intervals
+    "confidence": 0.95,
+    "tolerance": 0.05,         # Stop once every index's CI half-width is within 0.05
+    "chunk_size": 32,          # Parameters evaluated per batched product
+    "seed": None,              # Set to an integer for reproducible results
+    "max_workers": None        # Worker processes for evaluating chunks (None = single process)
+}
+
+# Memoization of per-stage impact results (see stage_cache.py)
+STAGE_CACHE = {
+    "enabled": True,
+    "max_entries": 100000,        # Stage results kept in memory
+    "max_bytes": 64 * 1024 * 1024,  # Estimated memory bound (least recently used results are evicted)
+    "persistent": False,          # Also keep results in a SQLite file across runs
+    "path": "",                   # SQLite file (default: lca_stage_cache.db in the application data directory)
+    "max_disk_entries": 1000000   # Stage results kept in the SQLite file
+}
+
+# LCA database settings
+DATABASE = {
+    "use_external_db": False,  # Set to True to use external LCA database
+    "external_db_path": "",    # Path to external database (e.g., ecoinvent): CSV/XML dump or factor store directory
+    "cache_external_data": True,  # Keep the imported factor store for later runs
+    "store_path": ""           # Factor store directory for imported dumps (default: <external_db_path>.store)
+}
\ No newline at end of file
@@ -17,10 +17,38 @@ DATABASE = {
 }
 DATABASE_URI = f"{DATABASE['dialect']}:///{DATABASE['path']}/{DATABASE['name']}"
 
+# SQLite PRAGMAs applied to every new connection (None skips a PRAGMA)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",      # Readers don't block the writer
+    "synchronous": "NORMAL",    # Safe with WAL, far fewer fsyncs than FULL
+    "busy_timeout": 5000,       # Milliseconds to wait for a lock before failing
+    "cache_size": -64000,       # Negative values are KiB (64 MB page cache)
+    "mmap_size": 268435456,     # Bytes of the database file to memory-map (256 MB)
+    "temp_store": "MEMORY"
+}
+
+# Connection pool settings for file databases
+DATABASE_POOL = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_timeout": 30
+}
+
+# Audit log writer settings
+AUDIT = {
+    "enabled": True,
+    "queue_size": 10000,     # Queued records before commits block on the writer
+    "batch_size": 500,       # Records per insert
+    "flush_interval": 0.5    # Maximum seconds a record waits before being written
+}
+
 # Logging settings
 LOG_LEVEL = "INFO"  # Options: DEBUG, INFO, WARNING, ERROR, CRITICAL
-LOG_FILE = PROJECT_ROOT / "logs" / "app.log"
+LOG_FILE = Path(os.environ.get("LOG_FILE", PROJECT_ROOT / "logs" / "app.log"))  # Overridden by the LOG_FILE environment variable
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Size at which the log file is rotated
+LOG_BACKUP_COUNT = 5  # Rotated log files to keep
+LOG_DEDUP_INTERVAL = 60.0  # Seconds during which repeated warnings are counted instead of logged
 
 # UI settings
 APPLICATION_NAME = "Process & Safety Suite"
@@ -36,5 +64,12 @@ ENABLED_MODULES = [
     # Add other modules as they are developed
 ]
 
+# Cached index of installed modules (rebuilt when module files change);
+# the MODULE_INDEX_FILE environment variable overrides the location
+MODULE_INDEX_FILE = Path(os.environ.get("MODULE_INDEX_FILE", DATABASE["path"] / "module_index.json"))
+
+# Threads running module initialization in the background at startup
+MODULE_INIT_WORKERS = 4
+
 # Development mode (set to False in production)
 DEBUG = True
\ No newline at end of file
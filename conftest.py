@@ -0,0 +1,25 @@
+"""
+Shared pytest configuration for the application and module test suites.
+"""
+import os
+import sys
+import shutil
+import tempfile
+
+_log_dir = None
+
+def pytest_configure(config):
+    """Send log output to a temporary file instead of the project log."""
+    global _log_dir
+    if "LOG_FILE" not in os.environ:
+        _log_dir = tempfile.mkdtemp(prefix="test-logs-")
+        os.environ["LOG_FILE"] = os.path.join(_log_dir, "app.log")
+
+def pytest_unconfigure(config):
+    """Stop the logging threads and remove the temporary log file."""
+    if _log_dir is None:
+        return
+    logger_module = sys.modules.get("core.utils.logger")
+    if logger_module is not None:
+        logger_module.shutdown_logging()
+    shutil.rmtree(_log_dir, ignore_errors=True)
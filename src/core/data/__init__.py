@@ -1,5 +1,11 @@
 """
 Data package for database models and ORM functionality.
 """
-from core.data.database import Base, get_db, init_db
-from core.data.models import User, Project, Tag, Audit
\ No newline at end of file
+from core.data.database import (
+    Base, get_db, init_db, session_scope, configure_database, get_engine, create_db_engine
+)
+from core.data.models import User, Project, Tag, Audit
+from core.data.audit import (
+    AuditWriter, AuditRecord, enable_auditing, disable_auditing, get_audit_page, iter_audit_trail
+)
+from core.data.search import ProjectHit, search_projects, ensure_search_index, rebuild_search_index
@@ -0,0 +1,383 @@
+"""
+Asynchronous audit logging and audit trail queries.
+
+Changes are captured from SQLAlchemy session events as compact JSON diffs,
+held on the session until the transaction commits, and then handed to a
+background thread that batch-inserts them into audit_log. Committing
+therefore only costs a queue put; a bounded queue applies backpressure if
+the writer falls behind.
+
+The trail is read with keyset pagination over the audit_log indexes, so a
+page costs the same at the end of a long history as at the start.
+"""
+import atexit
+import json
+import queue
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple
+
+from sqlalchemy import event, insert, inspect, select, tuple_
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from core.data.database import get_engine
+from core.data.models import Audit
+from core.utils.logger import get_logger
+from config.settings import AUDIT
+
+# Set up logger
+logger = get_logger(__name__)
+
+# Session.info keys
+PENDING_KEY = "audit_pending"
+USER_KEY = "user_id"
+
+# Row returned by the audit trail queries
+AuditRecord = namedtuple(
+    "AuditRecord", ["id", "user_id", "timestamp", "action", "entity_type", "entity_id", "changes"]
+)
+
+# Position after the last row of a page: (timestamp, id)
+AuditCursor = Tuple[datetime, int]
+
+def _serialize(changes: Dict[str, Any]) -> str:
+    """Serialize changes as compact JSON."""
+    return json.dumps(changes, separators=(",", ":"), default=str)
+
+def _entity_id(obj: Any) -> Optional[int]:
+    """Get the (single-column integer) primary key of an object, if any."""
+    # Read from the attributes: the identity key isn't set yet in after_flush
+    identity = inspect(obj).mapper.primary_key_from_instance(obj)
+    if len(identity) == 1 and isinstance(identity[0], int):
+        return identity[0]
+    return None
+
+def _record(session: Session, obj: Any, action: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+    """Build an audit_log row."""
+    return {
+        "user_id": session.info.get(USER_KEY),
+        "timestamp": datetime.utcnow(),
+        "action": action,
+        "entity_type": type(obj).__name__,
+        "entity_id": _entity_id(obj),
+        "changes": _serialize(changes)
+    }
+
+def _column_values(obj: Any) -> Dict[str, Any]:
+    """Get the non-null column values of an object."""
+    state = inspect(obj)
+    values = {}
+    for attr in state.mapper.column_attrs:
+        value = state.attrs[attr.key].loaded_value
+        if value is not None and value is not NO_VALUE:
+            values[attr.key] = value
+    return values
+
+def _column_diff(obj: Any) -> Dict[str, List[Any]]:
+    """Get [old, new] pairs for the modified columns of an object."""
+    state = inspect(obj)
+    diff = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if history.has_changes():
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+            diff[attr.key] = [old, new]
+    return diff
+
+def _is_audited(obj: Any) -> bool:
+    """Check whether changes to an object are audited."""
+    return not isinstance(obj, Audit)
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    """Capture updates and deletes while attribute history is available."""
+    pending = session.info.setdefault(PENDING_KEY, [])
+    for obj in session.dirty:
+        if _is_audited(obj) and session.is_modified(obj, include_collections=False):
+            diff = _column_diff(obj)
+            if diff:
+                pending.append(_record(session, obj, "update", diff))
+    for obj in session.deleted:
+        if _is_audited(obj):
+            pending.append(_record(session, obj, "delete", {}))
+
+def _after_flush(session: Session, flush_context) -> None:
+    """Capture creates once primary keys have been assigned."""
+    pending = session.info.setdefault(PENDING_KEY, [])
+    for obj in session.new:
+        if _is_audited(obj):
+            pending.append(_record(session, obj, "create", _column_values(obj)))
+
+def _after_commit(session: Session) -> None:
+    """Hand the committed transaction's audit records to the writer."""
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending and audit_writer is not None:
+        audit_writer.submit(pending, bind=_session_engine(session))
+
+def _session_engine(session: Session) -> Optional[Engine]:
+    """Get the engine a session writes to (None if it isn't bound)."""
+    try:
+        bind = session.get_bind()
+    except Exception:
+        return None
+    # Connections belong to the committing thread; the writer opens its own
+    return bind.engine if isinstance(bind, Connection) else bind
+
+def _after_rollback(session: Session) -> None:
+    """Discard audit records of a rolled-back transaction."""
+    session.info.pop(PENDING_KEY, None)
+
+class AuditWriter:
+    """Background thread that batch-inserts audit records."""
+
+    def __init__(self, engine_factory: Callable[[], Engine] = get_engine,
+                 queue_size: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 0.5) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            engine_factory: Function returning the engine to write records
+                submitted without a bind to
+            queue_size: Maximum number of queued records before submit() blocks
+            batch_size: Maximum number of records per insert
+            flush_interval: Maximum seconds a record waits before being written
+        """
+        self.engine_factory = engine_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Tuple[Optional[Engine], Dict[str, Any]]]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="AuditWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, records: List[Dict[str, Any]], bind: Optional[Engine] = None,
+               timeout: Optional[float] = None) -> None:
+        """
+        Queue audit records for writing.
+
+        Blocks while the queue is full. Records that can't be queued within
+        the timeout are dropped and logged rather than failing the caller.
+
+        Args:
+            records: audit_log rows
+            bind: Engine of the database the records belong to (defaults to
+                the engine_factory engine)
+            timeout: Optional maximum seconds to wait per record
+        """
+        for record in records:
+            try:
+                self._queue.put((bind, record), timeout=timeout)
+            except queue.Full:
+                self.dropped += 1
+                logger.error(f"Audit queue full, dropped {record['action']} "
+                             f"{record['entity_type']} {record['entity_id']}")
+
+    def flush(self) -> None:
+        """Block until every queued record has been written."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def stop(self) -> None:
+        """Write the remaining records and stop the writer thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _write(self, batch: List[Tuple[Optional[Engine], Dict[str, Any]]]) -> None:
+        """Insert a batch of records, one transaction per database."""
+        by_engine: Dict[Optional[Engine], List[Dict[str, Any]]] = {}
+        for bind, record in batch:
+            by_engine.setdefault(bind, []).append(record)
+
+        for bind, records in by_engine.items():
+            try:
+                with (bind or self.engine_factory()).begin() as connection:
+                    connection.execute(insert(Audit.__table__), records)
+                self.written += len(records)
+            except Exception as e:
+                self.dropped += len(records)
+                logger.error(f"Error writing {len(records)} audit records: {e}")
+        for _ in batch:
+            self._queue.task_done()
+
+    def _run(self) -> None:
+        """Collect records into batches and write them."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            # Coalesce records arriving within flush_interval into one insert
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            if stopping:
+                self._queue.task_done()
+                return
+
+# Writer used by the session event listeners (None while auditing is disabled)
+audit_writer: Optional[AuditWriter] = None
+
+_LISTENERS = (
+    ("before_flush", _before_flush),
+    ("after_flush", _after_flush),
+    ("after_commit", _after_commit),
+    ("after_rollback", _after_rollback)
+)
+
+def enable_auditing(writer: Optional[AuditWriter] = None) -> AuditWriter:
+    """
+    Start audit logging for all sessions.
+
+    Args:
+        writer: Optional writer (defaults to one configured from settings.AUDIT)
+
+    Returns:
+        The running writer
+    """
+    global audit_writer
+
+    if audit_writer is not None:
+        return audit_writer
+
+    audit_writer = writer or AuditWriter(
+        queue_size=AUDIT["queue_size"],
+        batch_size=AUDIT["batch_size"],
+        flush_interval=AUDIT["flush_interval"]
+    )
+    audit_writer.start()
+
+    for name, listener in _LISTENERS:
+        event.listen(Session, name, listener)
+    atexit.register(disable_auditing)
+
+    logger.info("Audit logging enabled")
+    return audit_writer
+
+def disable_auditing() -> None:
+    """Stop audit logging, writing any queued records first."""
+    global audit_writer
+
+    if audit_writer is None:
+        return
+
+    for name, listener in _LISTENERS:
+        if event.contains(Session, name, listener):
+            event.remove(Session, name, listener)
+
+    writer = audit_writer
+    audit_writer = None
+    writer.stop()
+    atexit.unregister(disable_auditing)
+    logger.info(f"Audit logging disabled ({writer.written} records written, {writer.dropped} dropped)")
+
+def get_audit_page(db: Session, entity_type: Optional[str] = None, entity_id: Optional[int] = None,
+                   user_id: Optional[int] = None, since: Optional[datetime] = None,
+                   until: Optional[datetime] = None, after: Optional[AuditCursor] = None,
+                   limit: int = 100, newest_first: bool = True
+                   ) -> Tuple[List[AuditRecord], Optional[AuditCursor]]:
+    """
+    Get one page of the audit trail.
+
+    Args:
+        db: Database session
+        entity_type: Optional entity type filter (e.g. "Project")
+        entity_id: Optional entity ID filter (used with entity_type)
+        user_id: Optional user ID filter
+        since: Optional inclusive lower bound on the timestamp
+        until: Optional exclusive upper bound on the timestamp
+        after: Cursor returned with the previous page
+        limit: Maximum number of records in the page
+        newest_first: Whether to page backwards in time
+
+    Returns:
+        Tuple of the page's records and the cursor of the next page (None
+        when there are no more records)
+    """
+    table = Audit.__table__
+    columns = [table.c[name] for name in AuditRecord._fields]
+    statement = select(*columns)
+
+    if entity_type is not None:
+        statement = statement.where(table.c.entity_type == entity_type)
+    if entity_id is not None:
+        statement = statement.where(table.c.entity_id == entity_id)
+    if user_id is not None:
+        statement = statement.where(table.c.user_id == user_id)
+    if since is not None:
+        statement = statement.where(table.c.timestamp >= since)
+    if until is not None:
+        statement = statement.where(table.c.timestamp < until)
+
+    key = tuple_(table.c.timestamp, table.c.id)
+    if after is not None:
+        statement = statement.where(key < tuple_(*after) if newest_first else key > tuple_(*after))
+    if newest_first:
+        statement = statement.order_by(table.c.timestamp.desc(), table.c.id.desc())
+    else:
+        statement = statement.order_by(table.c.timestamp, table.c.id)
+
+    # Fetch one extra row to tell whether another page follows
+    rows = db.execute(statement.limit(limit + 1)).all()
+    records = [AuditRecord._make(row) for row in rows[:limit]]
+    cursor = None
+    if len(rows) > limit:
+        cursor = (records[-1].timestamp, records[-1].id)
+    return records, cursor
+
+def iter_audit_trail(db: Session, entity_type: Optional[str] = None, entity_id: Optional[int] = None,
+                     user_id: Optional[int] = None, since: Optional[datetime] = None,
+                     until: Optional[datetime] = None, page_size: int = 1000,
+                     newest_first: bool = True) -> Iterator[AuditRecord]:
+    """
+    Stream the audit trail a page at a time.
+
+    Args:
+        db: Database session
+        entity_type: Optional entity type filter
+        entity_id: Optional entity ID filter
+        user_id: Optional user ID filter
+        since: Optional inclusive lower bound on the timestamp
+        until: Optional exclusive upper bound on the timestamp
+        page_size: Number of records fetched per query
+        newest_first: Whether to stream backwards in time
+
+    Returns:
+        Iterator of AuditRecord tuples
+    """
+    cursor = None
+    while True:
+        records, cursor = get_audit_page(db, entity_type, entity_id, user_id, since, until,
+                                         after=cursor, limit=page_size, newest_first=newest_first)
+        yield from records
+        if cursor is None:
+            return
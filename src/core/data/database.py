@@ -1,37 +1,162 @@
 """
 Database setup and connection handling.
 """
-from typing import Optional
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator
 import os
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, StaticPool
 
-from config.settings import DATABASE_URI
-
-# Create directory for database if it doesn't exist
-db_path = Path(DATABASE_URI.split('///')[-1]).parent
-os.makedirs(db_path, exist_ok=True)
-
-# Create engine and session
-engine = create_engine(DATABASE_URI, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from config.settings import DATABASE_URI, SQLITE_PRAGMAS, DATABASE_POOL
 
 # Base class for all models
 Base = declarative_base()
 
+# Session factory; rebound to a new engine by configure_database()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Engine currently used by SessionLocal
+engine: Optional[Engine] = None
+
+def _is_memory_database(uri: str) -> bool:
+    """Check whether a SQLite URI refers to an in-memory database."""
+    database = make_url(uri).database
+    return database in (None, "", ":memory:") or "mode=memory" in uri
+
+def _apply_sqlite_pragmas(dbapi_connection, pragmas: Dict[str, Any]) -> None:
+    """Apply PRAGMA statements to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if value is not None:
+                cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def create_db_engine(uri: Optional[str] = None, pragmas: Optional[Dict[str, Any]] = None,
+                     echo: bool = False) -> Engine:
+    """
+    Create a database engine with connection tuning.
+
+    SQLite file databases get a connection pool and the PRAGMAs from
+    settings.SQLITE_PRAGMAS (WAL journal, synchronous=NORMAL, busy timeout,
+    cache and mmap sizes) applied to every new connection. In-memory
+    databases share a single connection so all sessions see the same data.
+
+    Args:
+        uri: Database URI (defaults to settings.DATABASE_URI)
+        pragmas: Optional PRAGMA overrides merged into settings.SQLITE_PRAGMAS
+        echo: Whether to log SQL statements
+
+    Returns:
+        The configured engine
+    """
+    uri = uri or DATABASE_URI
+    url = make_url(uri)
+
+    if url.get_backend_name() != "sqlite":
+        return create_engine(uri, echo=echo, pool_pre_ping=True, **DATABASE_POOL)
+
+    sqlite_pragmas = dict(SQLITE_PRAGMAS)
+    sqlite_pragmas.update(pragmas or {})
+
+    if _is_memory_database(uri):
+        # WAL and mmap don't apply to in-memory databases
+        sqlite_pragmas.pop("journal_mode", None)
+        sqlite_pragmas.pop("mmap_size", None)
+        new_engine = create_engine(
+            uri, echo=echo, poolclass=StaticPool,
+            connect_args={"check_same_thread": False}
+        )
+    else:
+        # Create directory for database if it doesn't exist
+        os.makedirs(Path(url.database).parent, exist_ok=True)
+        new_engine = create_engine(
+            uri, echo=echo, poolclass=QueuePool,
+            connect_args={"check_same_thread": False},
+            **DATABASE_POOL
+        )
+
+    @event.listens_for(new_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        _apply_sqlite_pragmas(dbapi_connection, sqlite_pragmas)
+
+    return new_engine
+
+def configure_database(uri: Optional[str] = None, pragmas: Optional[Dict[str, Any]] = None,
+                       echo: bool = False) -> Engine:
+    """
+    Create the application engine and bind the session factory to it.
+
+    Call this to swap the database, e.g. to "sqlite:///:memory:" in tests.
+    The DATABASE_URI environment variable overrides settings.DATABASE_URI
+    when no URI is given.
+
+    Args:
+        uri: Database URI
+        pragmas: Optional SQLite PRAGMA overrides
+        echo: Whether to log SQL statements
+
+    Returns:
+        The new engine
+    """
+    global engine
+
+    new_engine = create_db_engine(uri or os.environ.get("DATABASE_URI"), pragmas, echo)
+    if engine is not None:
+        engine.dispose()
+    engine = new_engine
+    SessionLocal.configure(bind=engine)
+    return engine
+
+def get_engine() -> Engine:
+    """
+    Get the application engine, creating it on first use.
+
+    Returns:
+        The engine bound to SessionLocal
+    """
+    if engine is None:
+        configure_database()
+    return engine
+
 def get_db() -> Session:
     """
     Get a database session.
-    
+
+    The caller owns the session and must close it; prefer session_scope().
+
     Returns:
         A SQLAlchemy Session instance
     """
-    db = SessionLocal()
+    get_engine()
+    return SessionLocal()
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Provide a transactional session scope.
+
+    The session is committed when the block exits normally, rolled back if
+    an exception is raised, and closed (returning its connection to the
+    pool) in both cases.
+
+    Yields:
+        A SQLAlchemy Session instance
+    """
+    db = get_db()
     try:
-        return db
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
@@ -41,14 +166,28 @@ def init_db() -> None:
     """
     # Import all models to ensure they're registered with Base
     from core.data.models import User
-    
+    from core.data.search import ensure_search_index
+
     # Create all tables
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
+    
+    # create_all() skips existing tables, so add indexes introduced since
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=get_engine(), checkfirst=True)
     
+    if get_engine().dialect.name == "sqlite":
+        ensure_search_index(get_engine())
+
 def reset_db() -> None:
     """
     Reset the database by dropping and recreating all tables.
     WARNING: This will delete all data!
     """
-    Base.metadata.drop_all(bind=engine)
-    init_db()
\ No newline at end of file
+    from core.data.search import FTS_TABLE
+    
+    Base.metadata.drop_all(bind=get_engine())
+    if get_engine().dialect.name == "sqlite":
+        with get_engine().begin() as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    init_db()
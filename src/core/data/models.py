@@ -4,7 +4,7 @@ Base data models shared across modules.
 from datetime import datetime
 from typing import Optional, List
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -42,16 +42,19 @@ class Project(Base):
     
     # Relationships
     owner = relationship("User", back_populates="projects")
+    tags = relationship("Tag", secondary="tags_association", back_populates="projects")
     
     def __repr__(self) -> str:
         return f"<Project {self.name}>"
 
-# Association table for tagging
+# Association table for tagging; the (tag_id, project_id) primary key serves
+# tag lookups and the project_id index serves project-to-tags lookups
 tags_association = Table(
     'tags_association',
     Base.metadata,
-    Column('tag_id', Integer, ForeignKey('tags.id')),
-    Column('project_id', Integer, ForeignKey('projects.id'))
+    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), primary_key=True),
+    Index('ix_tags_association_project_id', 'project_id')
 )
 
 class Tag(Base):
@@ -62,7 +65,7 @@ class Tag(Base):
     name = Column(String, nullable=False, unique=True)
     
     # Relationships
-    projects = relationship("Project", secondary=tags_association)
+    projects = relationship("Project", secondary=tags_association, back_populates="tags")
     
     def __repr__(self) -> str:
         return f"<Tag {self.name}>"
@@ -79,6 +82,14 @@ class Audit(Base):
     entity_id = Column(Integer)
     changes = Column(String)  # JSON string of changes
     
+    # Indexes match the keyset-paginated queries in core.data.audit:
+    # newest-first by entity, by user, or by time alone
+    __table_args__ = (
+        Index("ix_audit_log_entity", "entity_type", "entity_id", "timestamp", "id"),
+        Index("ix_audit_log_user", "user_id", "timestamp", "id"),
+        Index("ix_audit_log_timestamp", "timestamp", "id"),
+    )
+    
     # Relationships
     user = relationship("User")
     
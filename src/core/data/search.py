@@ -0,0 +1,200 @@
+"""
+Project search.
+
+Project names and descriptions are indexed in a SQLite FTS5 table
+(projects_fts, keyed by project ID) that is kept in sync by mapper events
+on Project, so updates join the same transaction as the change itself.
+Tag filters are answered from the tags_association primary key index.
+"""
+import re
+import weakref
+from collections import namedtuple
+from typing import Optional, List, Dict, Any, Sequence
+
+from sqlalchemy import event, inspect, text, bindparam
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from core.data.models import Project
+from core.utils.logger import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+FTS_TABLE = "projects_fts"
+
+# bm25 column weights: a match in the name outranks one in the description
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Search result row; higher scores rank first
+ProjectHit = namedtuple("ProjectHit", ["id", "name", "description", "score"])
+
+# Engines whose database has the index (mapper events are global, so other
+# databases must be skipped)
+_indexed_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+def _after_insert(mapper, connection, target: Project) -> None:
+    """Index a new project."""
+    if connection.engine not in _indexed_engines:
+        return
+    connection.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, name, description) VALUES (:id, :name, :description)"),
+        {"id": target.id, "name": target.name, "description": target.description or ""}
+    )
+
+def _after_update(mapper, connection, target: Project) -> None:
+    """Reindex a project whose name or description changed."""
+    if connection.engine not in _indexed_engines:
+        return
+    state = inspect(target)
+    if not (state.attrs.name.history.has_changes() or state.attrs.description.history.has_changes()):
+        return
+    connection.execute(
+        text(f"UPDATE {FTS_TABLE} SET name = :name, description = :description WHERE rowid = :id"),
+        {"id": target.id, "name": target.name, "description": target.description or ""}
+    )
+
+def _after_delete(mapper, connection, target: Project) -> None:
+    """Remove a deleted project from the index."""
+    if connection.engine not in _indexed_engines:
+        return
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": target.id})
+
+_LISTENERS = (
+    ("after_insert", _after_insert),
+    ("after_update", _after_update),
+    ("after_delete", _after_delete)
+)
+
+def rebuild_search_index(connection) -> int:
+    """
+    Rebuild the search index from the projects table.
+
+    Args:
+        connection: Database connection or session
+
+    Returns:
+        Number of indexed projects
+    """
+    connection.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    result = connection.execute(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, name, description) "
+        f"SELECT id, name, coalesce(description, '') FROM projects"
+    ))
+    return result.rowcount
+
+def ensure_search_index(engine: Engine) -> bool:
+    """
+    Create the search index if needed and start keeping it in sync.
+
+    A newly created index is filled from the existing projects.
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        True if the index is available, False if SQLite lacks FTS5
+    """
+    try:
+        with engine.begin() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLE}
+            ).first() is not None
+            if not exists:
+                connection.execute(text(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                    f"name, description, tokenize = 'unicode61 remove_diacritics 2')"
+                ))
+                count = rebuild_search_index(connection)
+                logger.info(f"Created project search index ({count} projects)")
+    except OperationalError as e:
+        logger.warning(f"Project search index unavailable: {e}")
+        return False
+
+    _indexed_engines.add(engine)
+    for name, listener in _LISTENERS:
+        if not event.contains(Project, name, listener):
+            event.listen(Project, name, listener)
+    return True
+
+def to_match_query(query: str) -> Optional[str]:
+    """
+    Convert free text to an FTS5 query matching all words as prefixes.
+
+    Args:
+        query: Search text
+
+    Returns:
+        FTS5 MATCH expression, or None if the text has no words
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+def search_projects(db: Session, query: Optional[str] = None, tags: Optional[Sequence[str]] = None,
+                    page: int = 1, page_size: int = 20) -> Dict[str, Any]:
+    """
+    Search projects by text and tags.
+
+    Args:
+        db: Database session
+        query: Optional text matched against project names and descriptions
+            (every word must match, as a prefix)
+        tags: Optional tag names; projects must have all of them
+        page: 1-based page number
+        page_size: Number of results per page
+
+    Returns:
+        Dictionary with 'results' (list of ProjectHit, best match first),
+        'page', 'page_size' and 'has_more'
+    """
+    match = to_match_query(query) if query else None
+    tag_names = sorted(set(tags or []))
+    params: Dict[str, Any] = {"limit": page_size + 1, "offset": (max(page, 1) - 1) * page_size}
+    conditions: List[str] = []
+
+    if tag_names:
+        # Intersection: projects linked to as many distinct tags as were requested
+        # (databases created before the primary key was added may repeat a link)
+        conditions.append(
+            "p.id IN (SELECT ta.project_id FROM tags_association ta "
+            "JOIN tags t ON t.id = ta.tag_id WHERE t.name IN :tags "
+            "GROUP BY ta.project_id HAVING COUNT(DISTINCT t.id) = :tag_count)"
+        )
+        params.update(tags=tag_names, tag_count=len(tag_names))
+
+    if match:
+        conditions.insert(0, f"{FTS_TABLE} MATCH :match")
+        params["match"] = match
+        sql = (
+            f"SELECT p.id, p.name, p.description, "
+            f"-bm25({FTS_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}) AS score "
+            f"FROM {FTS_TABLE} JOIN projects p ON p.id = {FTS_TABLE}.rowid "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY score DESC, p.id LIMIT :limit OFFSET :offset"
+        )
+    elif query:
+        # Text without any words can't match anything
+        return {"results": [], "page": page, "page_size": page_size, "has_more": False}
+    else:
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        sql = (
+            f"SELECT p.id, p.name, p.description, 0.0 AS score FROM projects p "
+            f"{where}ORDER BY p.name, p.id LIMIT :limit OFFSET :offset"
+        )
+
+    statement = text(sql)
+    if tag_names:
+        statement = statement.bindparams(bindparam("tags", expanding=True))
+
+    rows = db.execute(statement, params).all()
+    return {
+        "results": [ProjectHit._make(row) for row in rows[:page_size]],
+        "page": page,
+        "page_size": page_size,
+        "has_more": len(rows) > page_size
+    }
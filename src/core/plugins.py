@@ -0,0 +1,542 @@
+"""
+Module (plugin) discovery and loading.
+
+Modules are directories with a src/main.py entry point and an optional
+module.json manifest with their title, entry point and background
+initialization function. The registry discovers them from a cached index
+that is only rebuilt when the files' modification times change, and runs
+their initialization concurrently on a thread pool.
+
+Registering a module only adds an item to the Modules menu; the entry
+point, and with it the module's views, controllers and their dependencies,
+is imported when the module is first opened. A module opened while its
+initialization is still running gets a placeholder tab that is replaced
+once the initialization finishes, so the GUI thread never waits for it.
+"""
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List, Sequence
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtWidgets import QLabel
+
+from core.utils.logger import get_logger
+from config.settings import MODULES_DIR, MODULE_INDEX_FILE, MODULE_INIT_WORKERS
+
+# Set up logger
+logger = get_logger(__name__)
+
+MANIFEST_FILE = "module.json"
+
+class ModuleManifest:
+    """Lightweight description of a module, read without importing it."""
+
+    def __init__(self, name: str, title: str, path: Path, entry_point: str = "main:run_module",
+                 description: str = "", init: Optional[str] = None) -> None:
+        """
+        Initialize the manifest.
+
+        Args:
+            name: Module package name (the directory under modules/)
+            title: Title shown in the Modules menu and on the module's tab
+            path: Module directory
+            entry_point: "<module>:<function>" in the module's src package;
+                the function is called with the main window
+            description: Optional description shown as the menu item's tooltip
+            init: Optional "<module>:<function>" run without arguments in the
+                background at startup (table creation, data preloading); it
+                must not create widgets
+        """
+        self.name = name
+        self.title = title
+        self.path = Path(path)
+        self.entry_point = entry_point
+        self.description = description
+        self.init = init
+
+    @classmethod
+    def from_file(cls, manifest_path: Path) -> "ModuleManifest":
+        """
+        Read a manifest file.
+
+        Args:
+            manifest_path: Path to a module.json file
+
+        Returns:
+            The manifest
+
+        Raises:
+            ValueError: If the manifest is not valid JSON or lacks a title
+        """
+        manifest_path = Path(manifest_path)
+        try:
+            data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid module manifest {manifest_path}: {e}") from e
+        if not data.get("title"):
+            raise ValueError(f"Module manifest {manifest_path} has no title")
+
+        return cls(
+            name=data.get("name", manifest_path.parent.name),
+            title=data["title"],
+            path=manifest_path.parent,
+            entry_point=data.get("entry_point", "main:run_module"),
+            description=data.get("description", ""),
+            init=data.get("init")
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModuleManifest":
+        """Create a manifest from the output of as_dict()."""
+        return cls(data["name"], data["title"], Path(data["path"]), data["entry_point"],
+                   data.get("description", ""), data.get("init"))
+
+    @property
+    def src_dir(self) -> Path:
+        """Directory of the module's source files."""
+        return self.path / "src"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert the manifest to a dictionary."""
+        return {
+            "name": self.name,
+            "title": self.title,
+            "path": str(self.path),
+            "entry_point": self.entry_point,
+            "description": self.description,
+            "init": self.init
+        }
+
+def load_manifest(module_name: str, modules_dir: Path = MODULES_DIR) -> Optional[ModuleManifest]:
+    """
+    Load a module's manifest.
+
+    Args:
+        module_name: Module directory name
+        modules_dir: Directory containing the modules
+
+    Returns:
+        The manifest, or None if the module has no valid manifest
+    """
+    manifest_path = Path(modules_dir) / module_name / MANIFEST_FILE
+    if not manifest_path.is_file():
+        logger.warning(f"Module {module_name} not found (no {manifest_path})")
+        return None
+    try:
+        return ModuleManifest.from_file(manifest_path)
+    except ValueError as e:
+        logger.error(str(e))
+        return None
+
+def _import_function(manifest: ModuleManifest, spec: str, default_name: str) -> Callable:
+    """Import a "<module>:<function>" reference from a module's src package."""
+    src_dir = str(manifest.src_dir)
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+
+    module_path, _, function_name = spec.partition(":")
+    module = importlib.import_module(f"modules.{manifest.name}.src.{module_path}")
+    try:
+        return getattr(module, function_name or default_name)
+    except AttributeError as e:
+        raise ImportError(f"Module {manifest.name} has no function {spec}") from e
+
+def load_entry_point(manifest: ModuleManifest) -> Callable:
+    """
+    Import a module's entry point.
+
+    The module's src directory is put on sys.path first, since module
+    sources import their siblings directly (e.g. "from views import ...").
+
+    Args:
+        manifest: Module manifest
+
+    Returns:
+        The entry point function
+
+    Raises:
+        ImportError: If the entry point can't be imported
+    """
+    return _import_function(manifest, manifest.entry_point, "run_module")
+
+def _mtime(path: Path) -> int:
+    """Get a file's modification time in nanoseconds (0 if it doesn't exist)."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+class ModuleRegistry:
+    """
+    Discovers modules and runs their background initialization.
+
+    Example:
+        registry = ModuleRegistry()
+        manifests = registry.enabled(ENABLED_MODULES)
+        registry.initialize(manifests)
+        ...
+        registry.wait("lca")
+        print(registry.timings)
+    """
+
+    def __init__(self, modules_dir: Path = MODULES_DIR, index_path: Optional[Path] = MODULE_INDEX_FILE,
+                 max_workers: int = MODULE_INIT_WORKERS) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            modules_dir: Directory containing the modules
+            index_path: Manifest index cache file (None disables caching)
+            max_workers: Number of threads for background initialization
+        """
+        self.modules_dir = Path(modules_dir)
+        self.index_path = Path(index_path) if index_path is not None else None
+        self.max_workers = max_workers
+        self.manifests: Dict[str, ModuleManifest] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.errors: Dict[str, str] = {}
+        self.index_rebuilt = False
+        self._futures: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _signature(self, module_dir: Path) -> List[int]:
+        """Modification times that invalidate a module's index entry."""
+        return [_mtime(module_dir / MANIFEST_FILE), _mtime(module_dir / "src" / "main.py")]
+
+    def _read_index(self) -> Optional[Dict[str, Any]]:
+        """Read the cached index, or None if it is missing or stale."""
+        if self.index_path is None or not self.index_path.is_file():
+            return None
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if index.get("modules_dir") != str(self.modules_dir) or \
+                index.get("mtime") != _mtime(self.modules_dir):
+            return None
+        for name, entry in index.get("modules", {}).items():
+            if entry.get("signature") != self._signature(self.modules_dir / name):
+                return None
+        return index
+
+    def _build_index(self) -> Dict[str, Any]:
+        """Scan the modules directory for src/main.py entry points."""
+        modules = {}
+        for main_path in sorted(self.modules_dir.glob("*/src/main.py")):
+            module_dir = main_path.parent.parent
+            manifest_path = module_dir / MANIFEST_FILE
+            try:
+                if manifest_path.is_file():
+                    manifest = ModuleManifest.from_file(manifest_path)
+                else:
+                    manifest = ModuleManifest(module_dir.name, module_dir.name.replace("_", " ").title(),
+                                              module_dir)
+            except ValueError as e:
+                logger.error(str(e))
+                continue
+            modules[module_dir.name] = {
+                "signature": self._signature(module_dir),
+                "manifest": manifest.as_dict()
+            }
+
+        index = {"modules_dir": str(self.modules_dir), "mtime": _mtime(self.modules_dir), "modules": modules}
+        if self.index_path is not None:
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                self.index_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+            except OSError as e:
+                logger.warning(f"Could not write module index {self.index_path}: {e}")
+        return index
+
+    def discover(self) -> Dict[str, ModuleManifest]:
+        """
+        Find the installed modules.
+
+        Returns:
+            Dictionary mapping module names to manifests
+        """
+        start_time = time.perf_counter()
+        index = self._read_index()
+        self.index_rebuilt = index is None
+        if index is None:
+            index = self._build_index()
+
+        self.manifests = {name: ModuleManifest.from_dict(entry["manifest"])
+                          for name, entry in index["modules"].items()}
+        logger.info(f"Discovered {len(self.manifests)} modules in {time.perf_counter() - start_time:.3f}s "
+                    f"({'rebuilt' if self.index_rebuilt else 'cached'} index)")
+        return self.manifests
+
+    def enabled(self, module_names: Sequence[str]) -> List[ModuleManifest]:
+        """
+        Get the manifests of the enabled modules that are installed.
+
+        Modules that aren't installed are skipped without trying to import them.
+
+        Args:
+            module_names: Names of the enabled modules
+
+        Returns:
+            Manifests in the order of module_names
+        """
+        if not self.manifests:
+            self.discover()
+        skipped = [name for name in module_names if name not in self.manifests]
+        if skipped:
+            logger.info(f"Skipping modules that aren't installed: {', '.join(skipped)}")
+        return [self.manifests[name] for name in module_names if name in self.manifests]
+
+    def _run_init(self, manifest: ModuleManifest) -> None:
+        """Run a module's initialization function and time it."""
+        start_time = time.perf_counter()
+        try:
+            _import_function(manifest, manifest.init, "initialize")()
+        except Exception as e:
+            self.errors[manifest.name] = str(e)
+            logger.error(f"Error initializing module {manifest.name}: {e}")
+        finally:
+            seconds = time.perf_counter() - start_time
+            self.record_timing(manifest.name, "init", seconds)
+            logger.info(f"Initialized module {manifest.name} in {seconds:.2f}s")
+
+    def initialize(self, manifests: Sequence[ModuleManifest]) -> None:
+        """
+        Start the modules' initialization functions on the thread pool.
+
+        A failing module is logged and recorded in errors without affecting
+        the others.
+
+        Args:
+            manifests: Manifests of the modules to initialize
+        """
+        pending = [manifest for manifest in manifests
+                   if manifest.init and manifest.name not in self._futures]
+        if not pending:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="module-init")
+        for manifest in pending:
+            self._futures[manifest.name] = self._executor.submit(self._run_init, manifest)
+
+    def wait(self, module_name: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for background initialization to finish.
+
+        Args:
+            module_name: Module to wait for (all modules if None)
+            timeout: Optional maximum seconds to wait per module
+
+        Returns:
+            True if the initialization succeeded (or there was none)
+        """
+        names = [module_name] if module_name is not None else list(self._futures)
+        for name in names:
+            future = self._futures.get(name)
+            if future is not None:
+                future.result(timeout=timeout)
+        return all(name not in self.errors for name in names)
+
+    def is_initializing(self, module_name: str) -> bool:
+        """Check whether a module's background initialization is still running."""
+        future = self._futures.get(module_name)
+        return future is not None and not future.done()
+
+    def when_initialized(self, module_name: str, callback: Callable[[bool], None]) -> None:
+        """
+        Call a function once a module's background initialization has finished.
+
+        The callback runs immediately if the initialization has already
+        finished (or there is none), otherwise on the initialization thread.
+
+        Args:
+            module_name: Module name
+            callback: Function called with True if the initialization succeeded
+        """
+        future = self._futures.get(module_name)
+        if future is None:
+            callback(module_name not in self.errors)
+        else:
+            future.add_done_callback(lambda _: callback(module_name not in self.errors))
+
+    def record_timing(self, module_name: str, phase: str, seconds: float) -> None:
+        """
+        Record how long a loading phase of a module took.
+
+        Args:
+            module_name: Module name
+            phase: Phase name (e.g. "init" or "import")
+            seconds: Duration in seconds
+        """
+        self.timings.setdefault(module_name, {})[phase] = seconds
+
+    def report(self) -> str:
+        """
+        Format the per-module timings and errors.
+
+        Returns:
+            One line per module
+        """
+        lines = []
+        for name in self.manifests:
+            phases = self.timings.get(name, {})
+            times = ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in phases.items())
+            error = f" (failed: {self.errors[name]})" if name in self.errors else ""
+            lines.append(f"{name}: {times or 'not loaded'}{error}")
+        return "\n".join(lines)
+
+    def shutdown(self) -> None:
+        """Wait for running initialization and release the thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+class _InitSignals(QObject):
+    """Delivers finished module initializations to the GUI thread."""
+    initialized = pyqtSignal(str)
+
+class PluginLoader:
+    """Registers modules in the main window and opens them on demand."""
+
+    def __init__(self, window, registry: Optional[ModuleRegistry] = None) -> None:
+        """
+        Initialize the loader.
+
+        Args:
+            window: The main application window
+            registry: Optional registry whose background initialization of a
+                module has to finish before the module is opened
+        """
+        self.window = window
+        self.registry = registry
+        self.manifests: Dict[str, ModuleManifest] = {}
+        self._entry_points: Dict[str, Callable] = {}
+        self._views: Dict[str, Any] = {}
+        self._placeholders: Dict[str, QLabel] = {}
+        self._signals = _InitSignals()
+        self._signals.initialized.connect(self._on_initialized)
+
+    def register(self, manifest: ModuleManifest) -> None:
+        """
+        Add a module to the Modules menu without importing it.
+
+        Args:
+            manifest: Module manifest
+        """
+        self.manifests[manifest.name] = manifest
+        self.window.add_module_action(
+            manifest.title,
+            lambda checked=False, name=manifest.name: self.open_module(name),
+            manifest.description
+        )
+        logger.info(f"Registered module {manifest.name}")
+
+    def register_module(self, module_name: str, modules_dir: Path = MODULES_DIR) -> Optional[ModuleManifest]:
+        """
+        Register a module by directory name.
+
+        Args:
+            module_name: Module directory name
+            modules_dir: Directory containing the modules
+
+        Returns:
+            The module's manifest, or None if it has no valid manifest
+        """
+        manifest = load_manifest(module_name, modules_dir)
+        if manifest is not None:
+            self.register(manifest)
+        return manifest
+
+    def is_loaded(self, module_name: str) -> bool:
+        """Check whether a module's entry point has been imported."""
+        return module_name in self._entry_points
+
+    def open_module(self, module_name: str) -> bool:
+        """
+        Open a module's tab, importing the module on first use.
+
+        If the module's tab is already open it is brought to the front. If
+        the module is still initializing in the background, a placeholder
+        tab is shown and replaced by the module once it is ready.
+
+        Args:
+            module_name: Name of a registered module
+
+        Returns:
+            True if the module's (or its placeholder) tab is shown, False otherwise
+        """
+        view = self._views.get(module_name) or self._placeholders.get(module_name)
+        if view is not None and self.window.tabs.indexOf(view) >= 0:
+            self.window.tabs.setCurrentWidget(view)
+            return True
+
+        if module_name in self._placeholders:
+            # The placeholder was closed; show a new one for the same initialization
+            self._show_placeholder(module_name)
+            return True
+
+        if (module_name not in self._entry_points and self.registry is not None
+                and self.registry.is_initializing(module_name)):
+            self._show_placeholder(module_name)
+            self.registry.when_initialized(
+                module_name, lambda ok: self._signals.initialized.emit(module_name)
+            )
+            return True
+
+        return self._load(module_name)
+
+    def _show_placeholder(self, module_name: str) -> None:
+        """Show a tab standing in for a module that is still initializing."""
+        manifest = self.manifests[module_name]
+        placeholder = QLabel(f"Loading {manifest.title}...")
+        placeholder.setAlignment(Qt.AlignCenter)
+        self._placeholders[module_name] = placeholder
+        self.window.add_module(placeholder, manifest.title)
+
+    def _on_initialized(self, module_name: str) -> None:
+        """Replace a module's placeholder tab once its initialization has finished."""
+        placeholder = self._placeholders.pop(module_name, None)
+        if placeholder is None:
+            return
+
+        tabs = self.window.tabs
+        index = tabs.indexOf(placeholder)
+        placeholder.deleteLater()
+        if index < 0:
+            # The placeholder was closed before the module was ready
+            return
+        current = tabs.currentWidget()
+        tabs.removeTab(index)
+        if self._load(module_name):
+            tabs.tabBar().moveTab(tabs.indexOf(self._views[module_name]), index)
+            # Don't take the focus from another tab the user switched to
+            if current is not placeholder:
+                tabs.setCurrentWidget(current)
+
+    def _load(self, module_name: str) -> bool:
+        """Import a module if needed and call its entry point."""
+        manifest = self.manifests[module_name]
+        try:
+            if module_name not in self._entry_points:
+                if self.registry is not None and module_name in self.registry.errors:
+                    logger.warning(f"Opening module {module_name} after failed initialization")
+                start_time = time.perf_counter()
+                self._entry_points[module_name] = load_entry_point(manifest)
+                seconds = time.perf_counter() - start_time
+                if self.registry is not None:
+                    self.registry.record_timing(module_name, "import", seconds)
+                logger.info(f"Imported module {module_name} in {seconds:.2f}s")
+            self._entry_points[module_name](self.window)
+        except Exception as e:
+            logger.error(f"Error opening module {module_name}: {e}")
+            self.window.status_bar.showMessage(f"Could not open {manifest.title}")
+            return False
+
+        # Entry points add their view with MainWindow.add_module, which makes it current
+        self._views[module_name] = self.window.tabs.currentWidget()
+        return True
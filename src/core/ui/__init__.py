@@ -1,5 +1,28 @@
 """
 UI package for user interface components.
+
+Exports are resolved on first access, so importing the main window doesn't
+pull in matplotlib through the components module.
 """
-from core.ui.main_window import MainWindow
-from core.ui.components import FormView, TableView, ChartView
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    "MainWindow": "core.ui.main_window",
+    "FormView": "core.ui.components",
+    "TableView": "core.ui.components",
+    "ChartView": "core.ui.components",
+    "ArrayTableModel": "core.ui.table_model",
+    "TaskRunner": "core.ui.tasks",
+    "TaskContext": "core.ui.tasks",
+    "TaskCancelled": "core.ui.tasks"
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    """Import exported classes lazily."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
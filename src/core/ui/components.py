@@ -1,21 +1,29 @@
 """
 Reusable UI components and styles.
 """
+import time
 from typing import Optional, List, Dict, Any, Callable
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, 
     QLineEdit, QTextEdit, QComboBox, QPushButton, QTabWidget,
-    QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox,
-    QGroupBox, QSpinBox, QDoubleSpinBox, QFileDialog, QMessageBox
+    QHeaderView, QCheckBox,
+    QGroupBox, QSpinBox, QDoubleSpinBox, QFileDialog, QMessageBox, QProgressBar,
+    QTableView, QApplication
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QSize
-from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtCore import Qt, pyqtSignal, QSize, QTimer
+from PyQt5.QtGui import QColor, QPalette, QKeySequence
+
+import numpy as np
+import pandas as pd
 
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from core.ui.tasks import TaskRunner, TaskHandle
+from core.ui.table_model import ArrayTableModel
+
 class FormView(QWidget):
     """Base class for form-based views."""
     
@@ -55,6 +63,19 @@ class FormView(QWidget):
         self.clear_button = QPushButton("Clear")
         self.clear_button.clicked.connect(self.on_clear)
         self.buttons_layout.addWidget(self.clear_button)
+        
+        # Background tasks started with run_async
+        self.task_runner = TaskRunner(self)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # Busy indicator until progress is reported
+        self.progress_bar.setVisible(False)
+        self.buttons_layout.addWidget(self.progress_bar)
+        
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.task_runner.cancel_all)
+        self.cancel_button.setVisible(False)
+        self.buttons_layout.addWidget(self.cancel_button)
     
     def add_text_field(self, label: str, placeholder: str = "") -> QLineEdit:
         """
@@ -140,6 +161,79 @@ class FormView(QWidget):
         self.form_layout.addRow(label, checkbox)
         return checkbox
     
+    def run_async(self, fn: Callable, *args,
+                  on_finished: Optional[Callable[[Any], None]] = None,
+                  on_failed: Optional[Callable[[Exception], None]] = None,
+                  pass_context: bool = False, **kwargs) -> TaskHandle:
+        """
+        Run a (controller) function off the GUI thread.
+        
+        While the task runs the Calculate button is disabled and a progress
+        bar and Cancel button are shown. Callbacks run on the GUI thread.
+        
+        Args:
+            fn: Function to call
+            *args: Positional arguments for fn
+            on_finished: Called with the return value
+            on_failed: Called with the exception (defaults to on_task_failed)
+            pass_context: Whether to pass the TaskContext to fn as "context"
+                (for progress reporting and cancellation checks)
+            **kwargs: Keyword arguments for fn
+            
+        Returns:
+            Handle for cancelling the task
+        """
+        def done(callback: Optional[Callable], *values) -> None:
+            self._set_busy(self.task_runner.active_count > 0)
+            if callback is not None:
+                callback(*values)
+        
+        task = self.task_runner.submit(
+            fn, *args,
+            on_finished=lambda result: done(on_finished, result),
+            on_failed=lambda error: done(on_failed or self.on_task_failed, error),
+            on_progress=self.on_task_progress,
+            on_cancelled=lambda: done(self.on_task_cancelled),
+            pass_context=pass_context,
+            **kwargs
+        )
+        self._set_busy(True)
+        return task
+    
+    def _set_busy(self, busy: bool) -> None:
+        """Show or hide the task controls."""
+        self.calculate_button.setEnabled(not busy)
+        self.progress_bar.setVisible(busy)
+        self.cancel_button.setVisible(busy)
+        if not busy:
+            self.progress_bar.setRange(0, 0)
+    
+    def on_task_progress(self, percent: int, message: str) -> None:
+        """
+        Show the progress of a background task.
+        
+        Args:
+            percent: Percentage done
+            message: Optional status message
+        """
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{message} %p%" if message else "%p%")
+    
+    def on_task_failed(self, error: Exception) -> None:
+        """
+        Handle a failed background task.
+        
+        Args:
+            error: The exception raised by the task
+        """
+        QMessageBox.critical(self, "Error", str(error))
+    
+    def on_task_cancelled(self) -> None:
+        """Handle a cancelled background task."""
+        # To be implemented by subclasses
+        pass
+    
     def on_calculate(self) -> None:
         """Handle the Calculate button click."""
         # To be implemented by subclasses
@@ -166,15 +260,29 @@ class FormView(QWidget):
             elif isinstance(widget, QCheckBox):
                 widget.setChecked(False)
 
-class TableView(QTableWidget):
-    """Enhanced table widget with additional features."""
+class TableView(QTableView):
+    """
+    Table backed by column arrays (see ArrayTableModel).
+    
+    Cells are formatted on demand, so NumPy arrays and DataFrames with
+    millions of rows can be shown directly. Clicking a header sorts by that
+    column and Ctrl+C copies the selected cells as tab-separated text.
+    """
     
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         """Initialize the table view."""
         super().__init__(parent)
+        self.table_model = ArrayTableModel(parent=self)
+        self.setModel(self.table_model)
         self.setAlternatingRowColors(True)
         self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.verticalHeader().setVisible(False)
+        
+        # Fixed row heights avoid measuring every row of large tables
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.setSortingEnabled(True)
     
     def set_headers(self, headers: List[str]) -> None:
         """
@@ -183,8 +291,38 @@ class TableView(QTableWidget):
         Args:
             headers: List of header strings
         """
-        self.setColumnCount(len(headers))
-        self.setHorizontalHeaderLabels(headers)
+        self.table_model.set_headers(headers)
+    
+    def set_array(self, array: np.ndarray, headers: Optional[List[str]] = None) -> None:
+        """
+        Show the columns of a 2D array.
+        
+        Args:
+            array: 2D array (rows x columns)
+            headers: Optional headers (defaults to the current ones)
+        """
+        self._reset_sort_indicator()
+        self.table_model.set_array(array, headers)
+    
+    def set_dataframe(self, frame: pd.DataFrame) -> None:
+        """
+        Show a DataFrame.
+        
+        Args:
+            frame: DataFrame
+        """
+        self._reset_sort_indicator()
+        self.table_model.set_dataframe(frame)
+    
+    def set_columns(self, columns: Dict[str, Any]) -> None:
+        """
+        Show named columns.
+        
+        Args:
+            columns: Dictionary mapping headers to equal-length 1D sequences
+        """
+        self._reset_sort_indicator()
+        self.table_model.set_columns(columns)
     
     def add_row(self, row_data: List[Any]) -> None:
         """
@@ -193,15 +331,49 @@ class TableView(QTableWidget):
         Args:
             row_data: List of data for the row
         """
-        row = self.rowCount()
-        self.insertRow(row)
-        for col, data in enumerate(row_data):
-            item = QTableWidgetItem(str(data))
-            self.setItem(row, col, item)
+        self.table_model.append_row(row_data)
     
     def clear_rows(self) -> None:
         """Clear all rows in the table."""
-        self.setRowCount(0)
+        self._reset_sort_indicator()
+        self.table_model.clear()
+    
+    def set_filter(self, text: str, column: Optional[int] = None) -> None:
+        """
+        Show only rows containing some text (case-insensitive).
+        
+        Args:
+            text: Text to look for (empty shows all rows)
+            column: Optional column to search (all columns if None)
+        """
+        self.table_model.set_filter(text, column)
+    
+    def rowCount(self) -> int:
+        """
+        Get the number of visible rows.
+        
+        Returns:
+            Number of rows
+        """
+        return self.table_model.rowCount()
+    
+    def columnCount(self) -> int:
+        """
+        Get the number of columns.
+        
+        Returns:
+            Number of columns
+        """
+        return self.table_model.columnCount()
+    
+    def get_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Get the visible rows as typed columns, e.g. for export.
+        
+        Returns:
+            Dictionary mapping headers to arrays, in the displayed order
+        """
+        return self.table_model.get_columns()
     
     def get_data(self) -> List[List[str]]:
         """
@@ -210,20 +382,55 @@ class TableView(QTableWidget):
         Returns:
             List of rows, each a list of cell values as strings
         """
-        data = []
-        for row in range(self.rowCount()):
-            row_data = []
-            for col in range(self.columnCount()):
-                item = self.item(row, col)
-                row_data.append(item.text() if item else "")
-            data.append(row_data)
-        return data
+        return self.table_model.format_rows(self.table_model.source_rows())
+    
+    def copy_selection(self) -> str:
+        """
+        Copy the selected cells to the clipboard as tab-separated text.
+        
+        Returns:
+            The copied text
+        """
+        indexes = self.selectionModel().selectedIndexes()
+        if not indexes:
+            return ""
+        view_rows = sorted({index.row() for index in indexes})
+        columns = sorted({index.column() for index in indexes})
+        rows = self.table_model.source_rows()[view_rows]
+        text = "\n".join("\t".join(row) for row in self.table_model.format_rows(rows, columns))
+        QApplication.clipboard().setText(text)
+        return text
+    
+    def keyPressEvent(self, event) -> None:
+        """Copy the selection on Ctrl+C."""
+        if event.matches(QKeySequence.Copy):
+            self.copy_selection()
+        else:
+            super().keyPressEvent(event)
+    
+    def _reset_sort_indicator(self) -> None:
+        """Show new data unsorted."""
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
 
 class ChartView(QWidget):
-    """Widget for displaying charts and plots."""
+    """
+    Widget for displaying charts and plots.
     
-    def __init__(self, parent: Optional[QWidget] = None) -> None:
-        """Initialize the chart view."""
+    Repeated plot calls with the same kind of chart update the existing
+    artists instead of rebuilding the axes, and redraws are coalesced so the
+    canvas is drawn at most max_fps times per second. Line updates that stay
+    within the current axis limits are blitted. Lines with more points than
+    the axes are wide are reduced with decimate_minmax() for display.
+    """
+    
+    def __init__(self, parent: Optional[QWidget] = None, max_fps: float = 30.0) -> None:
+        """
+        Initialize the chart view.
+        
+        Args:
+            parent: Optional parent widget
+            max_fps: Maximum number of redraws per second
+        """
         super().__init__(parent)
         self.setLayout(QVBoxLayout())
         
@@ -234,11 +441,34 @@ class ChartView(QWidget):
         
         # Initialize with a subplot
         self.ax = self.figure.add_subplot(111)
+        
+        # Current chart and its artists
+        self._kind: Optional[str] = None
+        self._labels: tuple = ()
+        self._categories: List[str] = []
+        self._bars = None
+        self._pie_artists: Optional[tuple] = None  # (wedges, labels, percentages)
+        self._line = None
+        self._line_data: Optional[tuple] = None
+        self._background = None
+        
+        # Redraw throttling
+        self.min_interval = 1.0 / max_fps
+        self._last_draw = 0.0
+        self._layout_pending = False
+        self._full_draw_pending = False
+        self._draw_pending = False
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.timeout.connect(self._on_redraw_timer)
+        
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("resize_event", self._on_resize)
     
     def plot_bar_chart(self, categories: List[str], values: List[float], 
                       title: str = "", xlabel: str = "", ylabel: str = "") -> None:
         """
-        Create a bar chart.
+        Create or update a bar chart.
         
         Args:
             categories: List of category labels
@@ -247,37 +477,54 @@ class ChartView(QWidget):
             xlabel: X-axis label
             ylabel: Y-axis label
         """
-        self.ax.clear()
-        self.ax.bar(categories, values)
-        self.ax.set_title(title)
-        self.ax.set_xlabel(xlabel)
-        self.ax.set_ylabel(ylabel)
+        categories = list(categories)
+        if self._kind == "bar" and categories == self._categories:
+            # Same bars: only the heights change
+            for bar, value in zip(self._bars, values):
+                bar.set_height(value)
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self._set_labels(title, xlabel, ylabel)
+            self._request_draw()
+            return
+        
+        self._reset("bar")
+        self._categories = categories
+        self._bars = self.ax.bar(categories, values)
         self.ax.set_xticks(range(len(categories)))
         self.ax.set_xticklabels(categories, rotation=45, ha="right")
-        self.figure.tight_layout()
-        self.canvas.draw()
+        self._set_labels(title, xlabel, ylabel)
+        self._request_draw(layout=True)
     
     def plot_pie_chart(self, categories: List[str], values: List[float], 
                       title: str = "") -> None:
         """
-        Create a pie chart.
+        Create or update a pie chart.
         
         Args:
             categories: List of category labels
             values: List of values for each category
             title: Chart title
         """
-        self.ax.clear()
-        self.ax.pie(values, labels=categories, autopct='%1.1f%%')
-        self.ax.set_title(title)
+        categories = list(categories)
+        if self._kind == "pie" and categories == self._categories:
+            # Same slices: only the wedge angles and their texts change
+            self._update_pie(values)
+            self._set_labels(title)
+            self._request_draw()
+            return
+        
+        self._reset("pie")
+        self._categories = categories
         self.ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-        self.figure.tight_layout()
-        self.canvas.draw()
+        self._pie_artists = self.ax.pie(values, labels=categories, autopct='%1.1f%%')
+        self._set_labels(title)
+        self._request_draw(layout=True)
     
     def plot_line_chart(self, x_data: List[Any], y_data: List[float], 
                        title: str = "", xlabel: str = "", ylabel: str = "") -> None:
         """
-        Create a line chart.
+        Create or update a line chart.
         
         Args:
             x_data: List of x-axis values
@@ -286,10 +533,183 @@ class ChartView(QWidget):
             xlabel: X-axis label
             ylabel: Y-axis label
         """
+        x_values = np.asarray(x_data)
+        y_values = np.asarray(y_data)
+        self._line_data = (x_values, y_values)
+        x_shown, y_shown = self._decimated(x_values, y_values)
+        
+        if self._kind == "line":
+            self._line.set_data(x_shown, y_shown)
+            labels_changed = self._set_labels(title, xlabel, ylabel)
+            if labels_changed or not self._within_limits(x_shown, y_shown):
+                self.ax.relim()
+                self.ax.autoscale_view()
+                self._request_draw(layout=labels_changed)
+            else:
+                self._request_draw(full=False)
+            return
+        
+        self._reset("line")
+        self._line, = self.ax.plot(x_shown, y_shown, animated=True)
+        self._set_labels(title, xlabel, ylabel)
+        self._request_draw(layout=True)
+    
+    def flush(self) -> None:
+        """Draw any pending changes now."""
+        self._redraw_timer.stop()
+        self._draw(idle=False)
+    
+    def _reset(self, kind: str) -> None:
+        """Clear the axes for a new kind of chart."""
         self.ax.clear()
-        self.ax.plot(x_data, y_data)
+        self._kind = kind
+        self._labels = ()
+        self._categories = []
+        self._bars = None
+        self._pie_artists = None
+        self._line = None
+        self._background = None
+        if kind != "line":
+            self._line_data = None
+    
+    def _update_pie(self, values: List[float]) -> None:
+        """Move the pie wedges, labels and percentages to new values, laid out as Axes.pie does."""
+        values = np.asarray(values, dtype=np.float64)
+        if np.any(values < 0):
+            raise ValueError("Wedge sizes must be non negative values")
+        fractions = values / values.sum()
+        ends = np.cumsum(fractions)
+        starts = ends - fractions
+        
+        wedges, texts, autotexts = self._pie_artists
+        for wedge, text, autotext, start, end, fraction in zip(wedges, texts, autotexts,
+                                                               starts, ends, fractions):
+            wedge.set_theta1(360.0 * start)
+            wedge.set_theta2(360.0 * end)
+            angle = np.pi * (start + end)
+            x, y = np.cos(angle), np.sin(angle)
+            text.set_position((1.1 * x, 1.1 * y))
+            text.set_horizontalalignment("left" if x > 0 else "right")
+            autotext.set_position((0.6 * x, 0.6 * y))
+            autotext.set_text(f"{100.0 * fraction:.1f}%")
+    
+    def _set_labels(self, title: str, xlabel: str = "", ylabel: str = "") -> bool:
+        """Set the title and axis labels, returning whether they changed."""
+        labels = (title, xlabel, ylabel)
+        if labels == self._labels:
+            return False
+        self._labels = labels
         self.ax.set_title(title)
-        self.ax.set_xlabel(xlabel)
-        self.ax.set_ylabel(ylabel)
-        self.figure.tight_layout()
-        self.canvas.draw()
\ No newline at end of file
+        if self._kind != "pie":
+            self.ax.set_xlabel(xlabel)
+            self.ax.set_ylabel(ylabel)
+        self._layout_pending = True
+        return True
+    
+    def _decimated(self, x_values: np.ndarray, y_values: np.ndarray) -> tuple:
+        """Reduce a line to about two points per horizontal pixel of the axes."""
+        if x_values.dtype.kind not in "iuf":
+            return x_values, y_values
+        n_buckets = max(int(self.ax.bbox.width), 100)
+        return decimate_minmax(x_values, y_values, n_buckets)
+    
+    def _within_limits(self, x_values: np.ndarray, y_values: np.ndarray) -> bool:
+        """Whether a line fits in the current axis limits."""
+        if x_values.size == 0:
+            return True
+        if x_values.dtype.kind not in "iuf" or y_values.dtype.kind not in "iuf":
+            return False
+        x_low, x_high = sorted(self.ax.get_xlim())
+        y_low, y_high = sorted(self.ax.get_ylim())
+        return (x_low <= np.nanmin(x_values) and np.nanmax(x_values) <= x_high and
+                y_low <= np.nanmin(y_values) and np.nanmax(y_values) <= y_high)
+    
+    def _request_draw(self, full: bool = True, layout: bool = False) -> None:
+        """Schedule a redraw, at most once per min_interval."""
+        self._draw_pending = True
+        self._full_draw_pending = self._full_draw_pending or full
+        self._layout_pending = self._layout_pending or layout
+        if not self._redraw_timer.isActive():
+            wait = self.min_interval - (time.monotonic() - self._last_draw)
+            self._redraw_timer.start(max(0, int(wait * 1000)))
+    
+    def _on_redraw_timer(self) -> None:
+        """Draw the changes collected since the last redraw."""
+        self._draw(idle=True)
+    
+    def _draw(self, idle: bool) -> None:
+        """Redraw the canvas, blitting the line if nothing else changed."""
+        if not self._draw_pending:
+            return
+        self._draw_pending = False
+        self._last_draw = time.monotonic()
+        
+        if not self._full_draw_pending and self._background is not None and self._line is not None:
+            self.canvas.restore_region(self._background)
+            self.ax.draw_artist(self._line)
+            self.canvas.blit(self.ax.bbox)
+            return
+        
+        self._full_draw_pending = False
+        if self._layout_pending:
+            self._layout_pending = False
+            self.figure.tight_layout()
+        if idle:
+            self.canvas.draw_idle()
+        else:
+            self.canvas.draw()
+    
+    def _on_draw(self, event) -> None:
+        """Save the background for blitting and draw the animated line."""
+        if self._line is None:
+            self._background = None
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self._line)
+    
+    def _on_resize(self, event) -> None:
+        """Re-decimate the line for the new width."""
+        if self._line is not None and self._line_data is not None:
+            self._line.set_data(*self._decimated(*self._line_data))
+            self._request_draw()
+
+def decimate_minmax(x_data: np.ndarray, y_data: np.ndarray, n_buckets: int) -> tuple:
+    """
+    Downsample a line for display, keeping its visual envelope.
+    
+    The points are split into n_buckets consecutive buckets and only the
+    minimum and maximum of each bucket are kept (in their original order),
+    so spikes survive that plain striding would drop. Lines with at most
+    2 * n_buckets points are returned unchanged.
+    
+    Args:
+        x_data: X values (assumed ordered)
+        y_data: Y values
+        n_buckets: Number of buckets, usually the plot width in pixels
+        
+    Returns:
+        Tuple of (x, y) arrays with at most 2 * n_buckets + 1 points
+    """
+    x_data = np.asarray(x_data)
+    y_data = np.asarray(y_data)
+    n_points = y_data.shape[0]
+    if n_buckets < 1 or n_points <= 2 * n_buckets:
+        return x_data, y_data
+    
+    bucket_size = n_points // n_buckets
+    buckets = y_data[:bucket_size * n_buckets].reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    indices = np.concatenate([
+        offsets + np.argmin(buckets, axis=1),
+        offsets + np.argmax(buckets, axis=1),
+        [n_points - 1]
+    ])
+    
+    # Points left over after the last full bucket
+    tail = y_data[bucket_size * n_buckets:]
+    if tail.size:
+        start = bucket_size * n_buckets
+        indices = np.concatenate([indices, [start + np.argmin(tail), start + np.argmax(tail)]])
+    
+    indices = np.unique(indices)
+    return x_data[indices], y_data[indices]
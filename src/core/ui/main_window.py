@@ -1,7 +1,7 @@
 """
 Main application window with tabbed interface.
 """
-from typing import Optional, List
+from typing import Optional, List, Callable
 
 from PyQt5.QtWidgets import (
     QMainWindow, QTabWidget, QMenuBar, QStatusBar, 
@@ -62,11 +62,8 @@ class MainWindow(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
         
-        # Modules menu
-        modules_menu = menu_bar.addMenu("&Modules")
-        
-        # Add actions for each module
-        # These will be populated dynamically based on available modules
+        # Modules menu (populated by the plugin loader with add_module_action)
+        self.modules_menu = menu_bar.addMenu("&Modules")
         
         # Help menu
         help_menu = menu_bar.addMenu("&Help")
@@ -95,6 +92,27 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(view, title)
         self.tabs.setCurrentWidget(view)
     
+    def add_module_action(self, title: str, callback: Callable[[], None],
+                          description: str = "") -> QAction:
+        """
+        Add an entry to the Modules menu.
+        
+        Args:
+            title: The menu entry text
+            callback: Function called when the entry is triggered
+            description: Optional tooltip and status bar tip
+            
+        Returns:
+            The created action
+        """
+        action = QAction(title, self)
+        if description:
+            action.setToolTip(description)
+            action.setStatusTip(description)
+        action.triggered.connect(callback)
+        self.modules_menu.addAction(action)
+        return action
+    
     def close_tab(self, index: int) -> None:
         """
         Close a tab.
@@ -0,0 +1,320 @@
+"""
+Table model over column arrays.
+
+Data is kept as one NumPy array per column and cells are formatted only
+when the view asks for them, so a table costs a few arrays regardless of
+its size. Sorting and filtering compute a row order array with vectorized
+operations instead of moving items around.
+"""
+from typing import Optional, List, Dict, Any, Sequence
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+
+class ArrayTableModel(QAbstractTableModel):
+    """Read-only table model over NumPy arrays, DataFrames or appended rows."""
+
+    def __init__(self, headers: Optional[List[str]] = None, float_format: str = "{:.6g}",
+                 parent=None) -> None:
+        """
+        Initialize the model.
+
+        Args:
+            headers: Optional column headers
+            float_format: Format applied to floating point cells
+            parent: Optional parent object
+        """
+        super().__init__(parent)
+        self.float_format = float_format
+        self._headers: List[str] = list(headers or [])
+        self._columns: List[np.ndarray] = [np.empty(0, dtype=object) for _ in self._headers]
+        self._pending: List[Sequence[Any]] = []
+        self._order: Optional[np.ndarray] = None  # Visible row -> source row (None: all, in order)
+        self._mask: Optional[np.ndarray] = None
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    # Data
+
+    @property
+    def headers(self) -> List[str]:
+        """Column headers."""
+        return list(self._headers)
+
+    def set_headers(self, headers: List[str]) -> None:
+        """
+        Set the column headers, clearing the data if the column count changes.
+
+        Args:
+            headers: Column headers
+        """
+        if len(headers) != len(self._headers):
+            self.set_columns({header: np.empty(0, dtype=object) for header in headers})
+        else:
+            self._headers = list(headers)
+            self.headerDataChanged.emit(Qt.Horizontal, 0, len(headers) - 1)
+
+    def set_columns(self, columns: Dict[str, Sequence[Any]]) -> None:
+        """
+        Replace the data with named columns.
+
+        Args:
+            columns: Dictionary mapping headers to equal-length 1D sequences
+
+        Raises:
+            ValueError: If the columns differ in length
+        """
+        arrays = [np.asarray(values) for values in columns.values()]
+        if len({array.shape[0] for array in arrays}) > 1:
+            raise ValueError("All columns must have the same length")
+
+        self.beginResetModel()
+        self._headers = [str(header) for header in columns]
+        self._columns = arrays
+        self._pending = []
+        self._order = None
+        self._mask = None
+        self._sort_column = -1
+        self.endResetModel()
+
+    def set_array(self, array: np.ndarray, headers: Optional[List[str]] = None) -> None:
+        """
+        Replace the data with the columns of a 2D array.
+
+        Args:
+            array: 2D array (rows x columns); columns are views, not copies
+            headers: Optional headers (defaults to the current ones, or column numbers)
+        """
+        array = np.asarray(array)
+        if array.ndim != 2:
+            raise ValueError(f"Expected a 2D array, got {array.ndim}D")
+        if headers is None:
+            headers = self._headers if len(self._headers) == array.shape[1] else \
+                [str(i + 1) for i in range(array.shape[1])]
+        self.set_columns({header: array[:, i] for i, header in enumerate(headers)})
+
+    def set_dataframe(self, frame: pd.DataFrame) -> None:
+        """
+        Replace the data with the columns of a DataFrame.
+
+        Args:
+            frame: DataFrame
+        """
+        self.set_columns({str(name): frame[name].to_numpy() for name in frame.columns})
+
+    def append_row(self, row: Sequence[Any]) -> None:
+        """
+        Append a row.
+
+        Rows are buffered and merged into the column arrays when the data is
+        next read, so appending many rows doesn't copy the arrays each time.
+
+        Args:
+            row: Cell values, one per column
+        """
+        position = self.rowCount()
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._pending.append(list(row))
+        if self._mask is not None:
+            self._mask = np.append(self._mask, True)
+        if self._order is not None:
+            self._order = np.append(self._order, self._source_count() - 1)
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        """Remove all rows, keeping the headers."""
+        self.set_columns({header: np.empty(0, dtype=object) for header in self._headers})
+
+    def _source_count(self) -> int:
+        """Number of rows in the data, including buffered ones."""
+        stored = self._columns[0].shape[0] if self._columns else 0
+        return stored + len(self._pending)
+
+    def _materialize(self) -> None:
+        """Merge buffered rows into the column arrays."""
+        if not self._pending:
+            return
+        n_columns = len(self._headers)
+        rows = [list(row) + [""] * (n_columns - len(row)) for row in self._pending]
+        self._pending = []
+        for i in range(n_columns):
+            new_values = np.empty(len(rows), dtype=object)
+            new_values[:] = [row[i] for row in rows]
+            new_values = _tighten(new_values)
+            column = self._columns[i]
+            if column.shape[0] == 0:
+                self._columns[i] = new_values
+            elif column.dtype.kind in "iuf" and new_values.dtype.kind in "iuf":
+                self._columns[i] = np.concatenate([column, new_values])
+            else:
+                self._columns[i] = np.concatenate([column.astype(object), new_values.astype(object)])
+
+    def source_rows(self) -> np.ndarray:
+        """
+        Get the data row index of every visible row, in view order.
+
+        Returns:
+            Integer array
+        """
+        self._materialize()
+        if self._order is None:
+            return np.arange(self._source_count())
+        return self._order
+
+    def get_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Get the visible rows as typed columns (sorted and filtered as shown).
+
+        Returns:
+            Dictionary mapping headers to arrays
+        """
+        self._materialize()
+        if self._order is None:
+            return dict(zip(self._headers, self._columns))
+        return {header: column[self._order] for header, column in zip(self._headers, self._columns)}
+
+    # Formatting
+
+    def format_value(self, value: Any) -> str:
+        """
+        Format a cell value for display.
+
+        Args:
+            value: Cell value
+
+        Returns:
+            Display text
+        """
+        if isinstance(value, (float, np.floating)):
+            return self.float_format.format(value)
+        if value is None:
+            return ""
+        return str(value)
+
+    def format_rows(self, rows: np.ndarray, columns: Optional[Sequence[int]] = None) -> List[List[str]]:
+        """
+        Format selected data rows for display.
+
+        Args:
+            rows: Data row indices
+            columns: Optional column positions (all columns if None)
+
+        Returns:
+            List of rows of display strings
+        """
+        self._materialize()
+        positions = range(len(self._headers)) if columns is None else columns
+        values = [self._columns[position][rows].tolist() for position in positions]
+        return [[self.format_value(value) for value in row] for row in zip(*values)]
+
+    # Sorting and filtering
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        """
+        Sort the visible rows by a column (-1 restores the data order).
+
+        Args:
+            column: Column position
+            order: Sort order
+        """
+        self._materialize()
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        self._update_order()
+        self.layoutChanged.emit()
+
+    def set_filter(self, text: str, column: Optional[int] = None) -> None:
+        """
+        Show only rows whose text contains a string (case-insensitive).
+
+        Args:
+            text: Text to look for (empty shows all rows)
+            column: Optional column position to search (all columns if None)
+        """
+        self._materialize()
+        if not text:
+            self.set_row_mask(None)
+            return
+        needle = text.lower()
+        positions = range(len(self._headers)) if column is None else [column]
+        mask = np.zeros(self._source_count(), dtype=bool)
+        for position in positions:
+            haystack = np.char.lower(self._columns[position].astype(str))
+            mask |= np.char.find(haystack, needle) >= 0
+        self.set_row_mask(mask)
+
+    def set_row_mask(self, mask: Optional[np.ndarray]) -> None:
+        """
+        Show only the rows selected by a boolean mask over the data rows.
+
+        Args:
+            mask: Boolean array with one entry per data row (None shows all rows)
+        """
+        self._materialize()
+        self.beginResetModel()
+        self._mask = None if mask is None else np.asarray(mask, dtype=bool)
+        self._update_order()
+        self.endResetModel()
+
+    def _update_order(self) -> None:
+        """Recompute the visible row order from the filter and sort settings."""
+        rows = np.arange(self._source_count()) if self._mask is None else np.flatnonzero(self._mask)
+        if 0 <= self._sort_column < len(self._columns):
+            keys = self._columns[self._sort_column][rows]
+            if keys.dtype == object:
+                keys = _sort_keys(keys)
+            rows = rows[np.argsort(keys, kind="stable")]
+            if self._sort_order == Qt.DescendingOrder:
+                rows = rows[::-1]
+        self._order = None if self._mask is None and self._sort_column < 0 else rows
+
+    # QAbstractTableModel interface
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of visible rows."""
+        if parent.isValid():
+            return 0
+        if self._order is None:
+            return self._source_count()
+        return self._order.shape[0]
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of columns."""
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """Get a cell's display text or alignment."""
+        if not index.isValid():
+            return QVariant()
+        if role == Qt.DisplayRole:
+            self._materialize()
+            row = index.row() if self._order is None else self._order[index.row()]
+            return self.format_value(self._columns[index.column()][row])
+        if role == Qt.TextAlignmentRole:
+            if self._columns[index.column()].dtype.kind in "iuf":
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+        return QVariant()
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        """Get a column header or row number."""
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else QVariant()
+        return str(section + 1)
+
+def _tighten(values: np.ndarray) -> np.ndarray:
+    """Convert an object array to a numeric array if all values are numbers."""
+    if all(isinstance(value, (int, float, np.number)) and not isinstance(value, bool) for value in values):
+        return values.astype(np.float64 if any(isinstance(value, (float, np.floating)) for value in values)
+                             else np.int64)
+    return values
+
+def _sort_keys(values: np.ndarray) -> np.ndarray:
+    """Sort keys for an object column: numeric if every value is a number, else case-insensitive text."""
+    numeric = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy()
+    if not np.isnan(numeric).any():
+        return numeric
+    return np.char.lower(values.astype(str))
@@ -0,0 +1,226 @@
+"""
+Background execution of long-running calls for the UI.
+
+Tasks run on a QThreadPool; their results, errors, progress and
+cancellation are delivered back to the GUI thread through Qt signals, so
+callbacks can safely update widgets.
+"""
+import time
+from typing import Optional, Dict, Any, Callable, Set
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QCoreApplication, QEventLoop, pyqtSignal
+
+from core.utils.logger import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+class TaskCancelled(Exception):
+    """Raised inside a task when it has been cancelled."""
+
+class TaskContext:
+    """
+    Progress reporting and cancellation for code running in a task.
+
+    Passed as the "context" keyword argument to functions submitted with
+    pass_context=True. Its report() method can also be handed to controller
+    functions as a plain progress callback.
+    """
+
+    def __init__(self, signals: "TaskSignals") -> None:
+        """Initialize the context."""
+        self._signals = signals
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._cancelled = True
+
+    def check(self) -> None:
+        """
+        Stop the task if cancellation has been requested.
+
+        Raises:
+            TaskCancelled: If the task has been cancelled
+        """
+        if self._cancelled:
+            raise TaskCancelled()
+
+    def report(self, done: float, total: float = 100.0, message: str = "") -> None:
+        """
+        Report progress and stop the task if it has been cancelled.
+
+        Args:
+            done: Amount of work done
+            total: Total amount of work
+            message: Optional status message
+
+        Raises:
+            TaskCancelled: If the task has been cancelled
+        """
+        self.check()
+        percent = int(100 * done / total) if total > 0 else 0
+        self._signals.progress.emit(max(0, min(percent, 100)), message)
+
+class TaskSignals(QObject):
+    """Signals emitted by a task (received on the GUI thread)."""
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    cancelled = pyqtSignal()
+
+class TaskHandle(QRunnable):
+    """A function call running on the thread pool."""
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: Dict[str, Any], pass_context: bool) -> None:
+        """
+        Initialize the task.
+
+        Args:
+            fn: Function to call
+            args: Positional arguments
+            kwargs: Keyword arguments
+            pass_context: Whether to pass the TaskContext as "context"
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = TaskSignals()
+        self.context = TaskContext(self.signals)
+        self.fn = fn
+        self.args = args
+        self.kwargs = dict(kwargs, context=self.context) if pass_context else kwargs
+        self.done = False
+
+    def cancel(self) -> None:
+        """
+        Cancel the task.
+
+        Tasks that use their context stop at their next progress report or
+        check; the result of any other task is discarded when it finishes.
+        """
+        self.context.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self.context.cancelled
+
+    def run(self) -> None:
+        """Call the function and emit its outcome (runs on a worker thread)."""
+        try:
+            if self.context.cancelled:
+                raise TaskCancelled()
+            result = self.fn(*self.args, **self.kwargs)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            if self.context.cancelled:
+                self.signals.cancelled.emit()
+            else:
+                logger.error(f"Task {getattr(self.fn, '__name__', self.fn)} failed: {e}")
+                self.signals.failed.emit(e)
+        else:
+            if self.context.cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
+class TaskRunner(QObject):
+    """
+    Runs functions off the GUI thread.
+
+    Example:
+        runner = TaskRunner(self)
+        runner.submit(calculate_impact, stages,
+                      on_finished=self.display_results,
+                      on_failed=self.show_error)
+    """
+
+    def __init__(self, parent: Optional[QObject] = None, pool: Optional[QThreadPool] = None) -> None:
+        """
+        Initialize the runner.
+
+        Args:
+            parent: Optional parent object
+            pool: Thread pool to use (defaults to the global pool)
+        """
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._active: Set[TaskHandle] = set()
+
+    @property
+    def active_count(self) -> int:
+        """Number of tasks that haven't finished yet."""
+        return len(self._active)
+
+    def submit(self, fn: Callable, *args,
+               on_finished: Optional[Callable[[Any], None]] = None,
+               on_failed: Optional[Callable[[Exception], None]] = None,
+               on_progress: Optional[Callable[[int, str], None]] = None,
+               on_cancelled: Optional[Callable[[], None]] = None,
+               pass_context: bool = False, **kwargs) -> TaskHandle:
+        """
+        Run a function on the thread pool.
+
+        Callbacks are called on the GUI thread.
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments for fn
+            on_finished: Called with the return value
+            on_failed: Called with the exception if fn raises
+            on_progress: Called with a percentage and message on progress reports
+            on_cancelled: Called if the task was cancelled
+            pass_context: Whether to pass the TaskContext to fn as "context"
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Handle for cancelling the task
+        """
+        task = TaskHandle(fn, args, kwargs, pass_context)
+
+        def complete(callback: Optional[Callable], *values) -> None:
+            task.done = True
+            self._active.discard(task)
+            if callback is not None:
+                callback(*values)
+
+        task.signals.finished.connect(lambda result: complete(on_finished, result))
+        task.signals.failed.connect(lambda error: complete(on_failed, error))
+        task.signals.cancelled.connect(lambda: complete(on_cancelled))
+        if on_progress is not None:
+            task.signals.progress.connect(on_progress)
+
+        self._active.add(task)
+        self.pool.start(task)
+        return task
+
+    def cancel_all(self) -> None:
+        """Cancel all active tasks."""
+        for task in list(self._active):
+            task.cancel()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for active tasks to finish and their callbacks to run.
+
+        Processes Qt events while waiting, so it can be called on the GUI thread.
+
+        Args:
+            timeout: Optional maximum seconds to wait
+
+        Returns:
+            True if all tasks finished, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._active:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            QCoreApplication.processEvents(QEventLoop.AllEvents, 10)
+            time.sleep(0.001)
+        return True
@@ -1,17 +1,197 @@
 """
 Logging functionality for the application.
+
+Loggers don't write to files or the console themselves: they put records on
+a queue, and one listener thread per log file formats and writes them to a
+rotating file and the console. Repeated warnings are counted rather than
+logged again (see DuplicateFilter).
 """
 import os
+import sys
+import queue
+import atexit
 import logging
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Tuple, Any
+
+from config.settings import (
+    LOG_LEVEL, LOG_FILE, LOG_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_DEDUP_INTERVAL
+)
 
-from config.settings import LOG_LEVEL, LOG_FILE, LOG_FORMAT
+class DuplicateFilter(logging.Filter):
+    """
+    Suppress repeats of a warning within a time window.
+    
+    The first occurrence of a message is logged; repeats within interval
+    seconds are counted, and the next occurrence after the window (or
+    shutdown) is logged with the number of suppressed repeats. Records are
+    keyed by their message, or by a "dedup_key" passed with extra={...}
+    when the message contains changing details.
+    """
+    
+    def __init__(self, interval: float = LOG_DEDUP_INTERVAL, level: int = logging.WARNING,
+                 max_keys: int = 10000) -> None:
+        """
+        Initialize the filter.
+        
+        Args:
+            interval: Seconds during which repeats are suppressed
+            level: Minimum level of records to deduplicate
+            max_keys: Number of distinct messages tracked before old ones are dropped
+        """
+        super().__init__()
+        self.interval = interval
+        self.level = level
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._seen: Dict[Tuple[str, int, Any], list] = {}  # key -> [first logged at, suppressed, last record]
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether a record should be logged."""
+        if record.levelno < self.level or self.interval <= 0:
+            return True
+        key = (record.name, record.levelno, getattr(record, "dedup_key", None) or record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.interval:
+                entry[1] += 1
+                entry[2] = record
+                return False
+            
+            suppressed = entry[1] if entry is not None else 0
+            if entry is None and len(self._seen) >= self.max_keys:
+                self._prune(now)
+            self._seen[key] = [now, 0, None]
+        
+        if suppressed:
+            record.msg = f"{record.getMessage()} (repeated {suppressed} more times in the last {self.interval:g}s)"
+            record.args = ()
+        return True
+    
+    def drain(self) -> list:
+        """
+        Get summary records for repeats suppressed since their message was last logged.
+        
+        Returns:
+            List of log records
+        """
+        records = []
+        with self._lock:
+            for entry in self._seen.values():
+                if entry[1]:
+                    record = logging.makeLogRecord(entry[2].__dict__)
+                    record.msg = f"{record.getMessage()} (repeated {entry[1]} more times)"
+                    record.args = ()
+                    records.append(record)
+                    entry[1] = 0
+        return records
+    
+    def _prune(self, now: float) -> None:
+        """Forget messages whose window has passed (or the oldest half if none has)."""
+        expired = [key for key, entry in self._seen.items() if now - entry[0] >= self.interval and not entry[1]]
+        if not expired:
+            expired = sorted(self._seen, key=lambda key: self._seen[key][0])[:len(self._seen) // 2]
+        for key in expired:
+            del self._seen[key]
 
-def setup_logger(name: str, log_file: Optional[Path] = None, 
+class ConsoleHandler(logging.StreamHandler):
+    """
+    Stream handler writing to the current sys.stderr.
+    
+    The stream is looked up for every record, so replacing sys.stderr (as
+    test runners do) is followed, and records are dropped rather than
+    raising when it has already been closed at exit.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize the handler."""
+        super().__init__(sys.stderr)
+    
+    @property
+    def stream(self):
+        """The current sys.stderr."""
+        return sys.stderr
+    
+    @stream.setter
+    def stream(self, value) -> None:
+        """Ignore assignments; the stream is always sys.stderr."""
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record unless the stream is missing or closed."""
+        stream = self.stream
+        if stream is None or getattr(stream, "closed", False):
+            return
+        super().emit(record)
+
+# Shared queue pipeline per log file: (queue handler, listener)
+_pipelines: Dict[Path, Tuple[QueueHandler, QueueListener]] = {}
+_pipelines_lock = threading.Lock()
+
+def _get_queue_handler(log_file: Path) -> QueueHandler:
+    """Get the queue handler for a log file, starting its listener thread on first use."""
+    log_file = Path(log_file)
+    with _pipelines_lock:
+        if log_file in _pipelines:
+            return _pipelines[log_file][0]
+        
+        # Create logs directory if it doesn't exist
+        os.makedirs(log_file.parent, exist_ok=True)
+        
+        # Handlers run on the listener thread; levels are set on the loggers
+        formatter = logging.Formatter(LOG_FORMAT)
+        file_handler = RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES,
+                                           backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+        console_handler = ConsoleHandler()
+        file_handler.setFormatter(formatter)
+        console_handler.setFormatter(formatter)
+        
+        queue_handler = QueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(DuplicateFilter())
+        listener = QueueListener(queue_handler.queue, file_handler, console_handler,
+                                 respect_handler_level=True)
+        listener.start()
+        
+        if not _pipelines:
+            atexit.register(shutdown_logging)
+        _pipelines[log_file] = (queue_handler, listener)
+        return queue_handler
+
+def shutdown_logging() -> None:
+    """
+    Write suppressed-repeat summaries and queued records, then stop the listener threads.
+    
+    Registered to run at exit. The queue handlers are removed from their
+    loggers, so loggers set up afterwards start a new pipeline instead of
+    writing to a stopped one.
+    """
+    with _pipelines_lock:
+        pipelines = list(_pipelines.values())
+        _pipelines.clear()
+    
+    queue_handlers = {queue_handler for queue_handler, _ in pipelines}
+    loggers = [logging.getLogger()] + [logger for logger in logging.Logger.manager.loggerDict.values()
+                                       if isinstance(logger, logging.Logger)]
+    for logger in loggers:
+        for handler in [handler for handler in logger.handlers if handler in queue_handlers]:
+            logger.removeHandler(handler)
+    
+    for queue_handler, listener in pipelines:
+        for handler_filter in queue_handler.filters:
+            if isinstance(handler_filter, DuplicateFilter):
+                for record in handler_filter.drain():
+                    queue_handler.queue.put_nowait(record)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+def setup_logger(name: str, log_file: Optional[Path] = None,
                 level: Optional[str] = None) -> logging.Logger:
     """
-    Set up a logger with file and console handlers.
+    Set up a logger that writes to a log file and the console.
     
     Args:
         name: Logger name (usually __name__)
@@ -46,26 +226,7 @@ def setup_logger(name: str, log_file: Optional[Path] = None,
     
     # Prevent adding handlers multiple times
     if not logger.handlers:
-        # Create logs directory if it doesn't exist
-        log_dir = os.path.dirname(log_file)
-        os.makedirs(log_dir, exist_ok=True)
-        
-        # Create file handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
-        
-        # Create console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(log_level)
-        
-        # Create formatter and add to handlers
-        formatter = logging.Formatter(LOG_FORMAT)
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Add handlers to logger
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        logger.addHandler(_get_queue_handler(log_file))
     
     return logger
 
@@ -89,4 +250,4 @@ def get_logger(name: str) -> logging.Logger:
     if not logger.handlers:
         logger = setup_logger(name)
     
-    return logger
\ No newline at end of file
+    return logger
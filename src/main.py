@@ -3,89 +3,75 @@ Entry point for the entire application.
 """
 import sys
 import os
-import importlib
 from pathlib import Path
 
 from PyQt5.QtWidgets import QApplication
 
 from core.ui.main_window import MainWindow
 from core.data.database import init_db
+from core.data.audit import enable_auditing
+from core.plugins import PluginLoader, ModuleRegistry
 from core.utils.logger import get_logger
-from config.settings import ENABLED_MODULES, SRC_DIR, MODULES_DIR
+from config.settings import ENABLED_MODULES, SRC_DIR, MODULES_DIR, AUDIT
 
 # Set up logger
 logger = get_logger(__name__)
 
-def import_module(module_name: str):
+def create_main_window() -> MainWindow:
     """
-    Dynamically import a module.
-    
-    Args:
-        module_name: Name of the module to import
-        
-    Returns:
-        The imported module or None if import fails
-    """
-    try:
-        module_path = f"modules.{module_name}.src.main"
-        module = importlib.import_module(module_path)
-        logger.info(f"Successfully imported {module_path}")
-        return module
-    except ImportError as e:
-        logger.error(f"Failed to import {module_path}: {e}")
-        return None
-
-def run_module(module, window: MainWindow):
-    """
-    Run a module's main function.
-    
-    Args:
-        module: The module to run
-        window: The main window to add the module to
-        
+    Initialize the database and create the main window.
+
+    Enabled modules are discovered from the module index and listed in the
+    Modules menu; their background initialization starts on a thread pool,
+    and each module is imported when it is first opened.
+
     Returns:
-        True if the module was run successfully, False otherwise
+        The main window
     """
-    try:
-        if hasattr(module, 'run_module'):
-            module.run_module(window)
-            return True
-        else:
-            logger.error(f"Module {module.__name__} does not have a run_module function")
-            return False
-    except Exception as e:
-        logger.error(f"Error running module {module.__name__}: {e}")
-        return False
+    # Initialize the database
+    init_db()
+    if AUDIT["enabled"]:
+        enable_auditing()
+
+    # Create the main window
+    window = MainWindow()
+
+    # Register the enabled modules that are installed
+    window.module_registry = ModuleRegistry(MODULES_DIR)
+    window.plugin_loader = PluginLoader(window, window.module_registry)
+    manifests = window.module_registry.enabled(ENABLED_MODULES)
+    for manifest in manifests:
+        window.plugin_loader.register(manifest)
+
+    # Run non-UI initialization in the background while the window opens
+    window.module_registry.initialize(manifests)
+
+    logger.info(f"Registered {len(manifests)} modules")
+
+    if not manifests:
+        logger.warning("No modules were registered")
+
+    return window
 
 def main():
     """Main entry point for the application."""
-    # Initialize the database
-    init_db()
-    
     # Create the QApplication instance
     app = QApplication(sys.argv)
-    
+
     # Create the main window
-    window = MainWindow()
-    
-    # Load enabled modules
-    loaded_modules = 0
-    for module_name in ENABLED_MODULES:
-        module = import_module(module_name)
-        if module:
-            if run_module(module, window):
-                loaded_modules += 1
-    
-    logger.info(f"Loaded {loaded_modules} modules")
-    
-    if loaded_modules == 0:
-        logger.warning("No modules were loaded")
-    
+    window = create_main_window()
+
+    # Report module load timings on exit
+    def on_quit() -> None:
+        window.module_registry.shutdown()
+        logger.info(f"Module load timings:\n{window.module_registry.report()}")
+    app.aboutToQuit.connect(on_quit)
+
     # Show the main window
     window.run()
-    
+
     # Start the event loop
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
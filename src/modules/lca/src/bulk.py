@@ -0,0 +1,210 @@
+"""
+Bulk ingestion of life cycle stages.
+
+Stages and their activities are written with SQLAlchemy Core executemany
+inserts in batches, all inside one transaction, instead of one ORM
+add/commit per stage.
+"""
+import json
+import time
+from typing import Dict, Any, List, Optional, Sequence
+
+from sqlalchemy import delete, false, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from core.utils.logger import get_logger
+from models import LifeCycleStage, StageActivity
+from migrations import get_factor_ids
+
+# Set up logger
+logger = get_logger(__name__)
+
+class BulkStageWriter:
+    """
+    Context manager that writes stages and activities in batched inserts.
+
+    The whole import runs in a single transaction: it is committed when the
+    context exits normally and rolled back if an exception is raised. The
+    transaction takes the write lock when the context is entered, so stage
+    IDs allocated up front can't be claimed by concurrent writers.
+
+    Example:
+        with BulkStageWriter(db, batch_size=5000) as writer:
+            for stage in stages:
+                writer.add_stage(stage)
+        print(writer.stats["rows_per_second"])
+    """
+
+    def __init__(self, db: Session, project_id: Optional[int] = None,
+                 batch_size: int = 1000) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            db: Database session
+            project_id: Optional project ID assigned to every stage
+            batch_size: Number of rows per executemany batch
+
+        Raises:
+            ValueError: If batch_size is not positive
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        self.db = db
+        self.project_id = project_id
+        self.batch_size = batch_size
+        self.factor_ids: Dict[str, int] = {}
+        self.stage_count = 0
+        self.activity_count = 0
+        self._next_stage_id = 1
+        self._stage_rows: List[Dict[str, Any]] = []
+        self._activity_rows: List[Dict[str, Any]] = []
+        self._start_time = 0.0
+        self._elapsed = 0.0
+
+    def __enter__(self) -> "BulkStageWriter":
+        """Start the import transaction."""
+        self._start_time = time.perf_counter()
+        self.factor_ids = get_factor_ids(self.db)
+
+        # Stage IDs are allocated up front so activity rows can reference
+        # them without reading back generated keys
+        self._lock_stages()
+        max_id = self.db.execute(select(func.max(LifeCycleStage.id))).scalar()
+        self._next_stage_id = (max_id or 0) + 1
+        return self
+
+    def _lock_stages(self) -> None:
+        """Block concurrent stage inserts until the import transaction ends."""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            # A write statement takes the database's RESERVED lock, like BEGIN
+            # IMMEDIATE, even though the transaction may already have started
+            self.db.execute(delete(LifeCycleStage.__table__).where(false()))
+        elif dialect == "postgresql":
+            self.db.execute(text(f"LOCK TABLE {LifeCycleStage.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+        else:
+            # Locks the highest ID and the gap above it (InnoDB next-key lock)
+            self.db.execute(select(LifeCycleStage.id).order_by(LifeCycleStage.id.desc())
+                            .limit(1).with_for_update())
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """Commit the import, or roll it back if an exception was raised."""
+        if exc_type is None:
+            try:
+                self.flush()
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Bulk stage import failed, rolled back: {e}")
+                raise
+        else:
+            self.db.rollback()
+            logger.error(f"Bulk stage import failed, rolled back: {exc_value}")
+
+        self._elapsed = time.perf_counter() - self._start_time
+        if exc_type is None:
+            stats = self.stats
+            logger.info(f"Imported {stats['stages']} stages and {stats['activities']} activities "
+                        f"in {stats['seconds']:.2f}s ({stats['rows_per_second']:.0f} rows/s)")
+        return False
+
+    def add_stage(self, stage: Dict[str, Any]) -> int:
+        """
+        Queue a stage and its activities for insertion.
+
+        Activities are stored as lca_stage_activities rows when they all have
+        impact factors; otherwise the stage keeps them in its JSON column.
+
+        Args:
+            stage: Stage data as a dictionary with keys 'name' and 'activities'
+
+        Returns:
+            The ID allocated to the stage
+        """
+        stage_id = self._next_stage_id
+        self._next_stage_id += 1
+
+        activities = stage.get("activities", [])
+        normalized = all(activity_data.get("activity") in self.factor_ids
+                         for activity_data in activities)
+
+        self._stage_rows.append({
+            "id": stage_id,
+            "name": stage["name"],
+            "project_id": stage.get("project_id", self.project_id),
+            "activities": None if normalized else json.dumps(activities)
+        })
+        self.stage_count += 1
+
+        if normalized:
+            self.add_activities(stage_id, activities)
+
+        if len(self._stage_rows) >= self.batch_size:
+            self._flush_stages()
+        return stage_id
+
+    def add_activities(self, stage_id: int, activities: List[Dict[str, Any]]) -> None:
+        """
+        Queue normalized activity rows for a stage.
+
+        Args:
+            stage_id: ID of a stage added through this writer
+            activities: List of dictionaries with keys 'activity' and 'quantity';
+                every activity must have an impact factor
+
+        Raises:
+            KeyError: If an activity has no impact factor
+        """
+        self.add_activities_by_id(
+            [stage_id] * len(activities),
+            [self.factor_ids[activity_data["activity"]] for activity_data in activities],
+            [float(activity_data.get("quantity", 1.0)) for activity_data in activities]
+        )
+
+    def add_activities_by_id(self, stage_ids: Sequence[int], activity_ids: Sequence[int],
+                             quantities: Sequence[float]) -> None:
+        """
+        Queue normalized activity rows given as parallel sequences of IDs.
+
+        Args:
+            stage_ids: ID of the stage of each row (stages added through this writer)
+            activity_ids: ImpactFactor ID of each row
+            quantities: Quantity of each row
+        """
+        self._activity_rows.extend(
+            {"stage_id": int(stage_id), "activity_id": int(activity_id), "quantity": float(quantity)}
+            for stage_id, activity_id, quantity in zip(stage_ids, activity_ids, quantities)
+        )
+        self.activity_count += len(quantities)
+
+        if len(self._activity_rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert all queued rows (stages before the activities referencing them)."""
+        self._flush_stages()
+        for start in range(0, len(self._activity_rows), self.batch_size):
+            self.db.execute(insert(StageActivity.__table__),
+                            self._activity_rows[start:start + self.batch_size])
+        self._activity_rows = []
+
+    def _flush_stages(self) -> None:
+        """Insert the queued stage rows."""
+        for start in range(0, len(self._stage_rows), self.batch_size):
+            self.db.execute(insert(LifeCycleStage.__table__),
+                            self._stage_rows[start:start + self.batch_size])
+        self._stage_rows = []
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of rows written and the throughput."""
+        seconds = self._elapsed or (time.perf_counter() - self._start_time)
+        rows = self.stage_count + self.activity_count
+        return {
+            "stages": self.stage_count,
+            "activities": self.activity_count,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds > 0 else 0.0
+        }
@@ -0,0 +1,205 @@
+"""
+Contribution (hotspot) analysis for the LCA module.
+
+Impacts are kept per activity and per stage as arrays. Hotspots are found
+with partial selection (np.argpartition), which is linear in the number of
+activities; only the selected top-k rows are sorted. Contributions are
+ranked by magnitude so credits (negative impacts, e.g. energy recovery)
+count as hotspots too, and shares are relative to the sum of magnitudes.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from engine import FactorMatrix, EncodedInventory, activity_contributions
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Get the positions of the k largest magnitudes, largest first.
+
+    Args:
+        values: 1D array
+        k: Number of positions
+
+    Returns:
+        Integer array of at most k positions
+    """
+    magnitudes = np.abs(values)
+    k = min(k, magnitudes.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < magnitudes.shape[0]:
+        candidates = np.argpartition(-magnitudes, k - 1)[:k]
+    else:
+        candidates = np.arange(magnitudes.shape[0])
+    return candidates[np.argsort(-magnitudes[candidates], kind="stable")]
+
+class ContributionAnalysis:
+    """Per-activity and per-stage contributions of an encoded inventory."""
+
+    def __init__(self, inventory: EncodedInventory, factors: FactorMatrix) -> None:
+        """
+        Compute the contributions.
+
+        Entries of the same activity are summed, so each activity appears once.
+
+        Args:
+            inventory: Encoded inventory
+            factors: Factor matrix the inventory was encoded against
+        """
+        self.categories = factors.categories
+        contributions = activity_contributions(inventory, factors)
+
+        # Activities used by the inventory, and their summed contributions
+        self.activity_rows, positions = np.unique(inventory.activity_index, return_inverse=True)
+        self._factors = factors
+        n_activities = self.activity_rows.shape[0]
+        self.activity_impacts = np.empty((n_activities, len(self.categories)), dtype=np.float64)
+        self.stage_names = inventory.stage_names
+        self.stage_impacts = np.empty((inventory.n_stages, len(self.categories)), dtype=np.float64)
+        for column in range(len(self.categories)):
+            self.activity_impacts[:, column] = np.bincount(positions, weights=contributions[:, column],
+                                                           minlength=n_activities)
+            self.stage_impacts[:, column] = np.bincount(inventory.stage_index, weights=contributions[:, column],
+                                                        minlength=inventory.n_stages)
+        self.totals = self.activity_impacts.sum(axis=0)
+        self._magnitude_totals = np.abs(self.activity_impacts).sum(axis=0)
+
+    def _column(self, category: str) -> int:
+        """Get the column of an impact category."""
+        try:
+            return self.categories.index(category)
+        except ValueError:
+            raise ValueError(f"Unknown impact category: {category}") from None
+
+    def activity_name(self, position: int) -> str:
+        """
+        Get the name of an analysed activity.
+
+        Args:
+            position: Position in activity_impacts
+
+        Returns:
+            Activity name
+        """
+        return self._factors.activities[self.activity_rows[position]]
+
+    def top_activities(self, category: str, k: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get the k activities with the largest contributions to a category.
+
+        Args:
+            category: Impact category (e.g. 'co2')
+            k: Number of activities
+
+        Returns:
+            List of dictionaries with keys 'activity', 'value', 'share' and
+            'cumulative_share', largest contribution first
+        """
+        values = self.activity_impacts[:, self._column(category)]
+        return self._rank(values, k, category, lambda position: {"activity": self.activity_name(position)})
+
+    def top_stages(self, category: str, k: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get the k stages with the largest contributions to a category.
+
+        Args:
+            category: Impact category
+            k: Number of stages
+
+        Returns:
+            List of dictionaries with keys 'stage', 'value', 'share' and
+            'cumulative_share', largest contribution first
+        """
+        values = self.stage_impacts[:, self._column(category)]
+        return self._rank(values, k, category, lambda position: {"stage": self.stage_names[position]})
+
+    def _rank(self, values: np.ndarray, k: int, category: str, label) -> List[Dict[str, Any]]:
+        """Build ranked rows for the top-k values of a category."""
+        positions = top_k_indices(values, k)
+        total = self._magnitude_totals[self._column(category)]
+        shares = np.abs(values[positions]) / total if total > 0 else np.zeros(positions.shape[0])
+        cumulative = np.cumsum(shares)
+        rows = []
+        for i, position in enumerate(positions):
+            row = label(int(position))
+            row.update({"value": float(values[position]), "share": float(shares[i]),
+                        "cumulative_share": float(cumulative[i])})
+            rows.append(row)
+        return rows
+
+    def count_for_share(self, category: str, share: float = 0.8) -> int:
+        """
+        Get the smallest number of activities that together make up a share of a category.
+
+        Grows a partial selection geometrically instead of sorting all activities.
+
+        Args:
+            category: Impact category
+            share: Target share of the summed contribution magnitudes (0-1)
+
+        Returns:
+            Number of activities (0 if the category has no impacts)
+        """
+        magnitudes = np.abs(self.activity_impacts[:, self._column(category)])
+        total = magnitudes.sum()
+        if total <= 0:
+            return 0
+        target = share * total
+        n = magnitudes.shape[0]
+        k = min(64, n)
+        while True:
+            positions = top_k_indices(magnitudes, k)
+            cumulative = np.cumsum(magnitudes[positions])
+            reached = np.searchsorted(cumulative, target * (1 - 1e-12))
+            if reached < k or k == n:
+                return int(min(reached + 1, n))
+            k = min(k * 8, n)
+
+    def pareto_curve(self, category: str, max_points: Optional[int] = 1000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the cumulative Pareto curve of activity contributions.
+
+        Args:
+            category: Impact category
+            max_points: Optional maximum number of points returned (the full
+                curve is sorted, then sampled at evenly spaced ranks)
+
+        Returns:
+            Tuple of (rank, cumulative_share) arrays, where rank starts at 1
+        """
+        magnitudes = np.abs(self.activity_impacts[:, self._column(category)])
+        total = magnitudes.sum()
+        cumulative = np.cumsum(np.sort(magnitudes)[::-1])
+        cumulative = cumulative / total if total > 0 else np.zeros_like(cumulative)
+        ranks = np.arange(1, cumulative.shape[0] + 1)
+        if max_points is not None and cumulative.shape[0] > max_points:
+            keep = np.unique(np.linspace(0, cumulative.shape[0] - 1, max_points).astype(np.int64))
+            return ranks[keep], cumulative[keep]
+        return ranks, cumulative
+
+    def summary(self, k: int = 20, share: float = 0.8, max_points: Optional[int] = 1000) -> Dict[str, Any]:
+        """
+        Summarize the hotspots of every impact category.
+
+        Args:
+            k: Number of top activities and stages per category
+            share: Share used for count_for_share
+            max_points: Maximum points per Pareto curve
+
+        Returns:
+            Dictionary mapping each category to a dictionary with keys 'total',
+            'top_activities', 'top_stages', 'activities_for_share' and 'pareto'
+            (a dictionary of 'rank' and 'cumulative_share' lists)
+        """
+        result = {}
+        for column, category in enumerate(self.categories):
+            ranks, cumulative = self.pareto_curve(category, max_points)
+            result[category] = {
+                "total": float(self.totals[column]),
+                "top_activities": self.top_activities(category, k),
+                "top_stages": self.top_stages(category, k),
+                "activities_for_share": self.count_for_share(category, share),
+                "pareto": {"rank": ranks.tolist(), "cumulative_share": cumulative.tolist()}
+            }
+        return result
@@ -1,18 +1,36 @@
 """
 Business logic for the LCA module.
 """
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Callable, Hashable, Iterable
 import json
 import os
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
 
 from core.data.database import get_db
 from core.utils.logger import get_logger
-from models import LifeCycleStage, ImpactFactor
-from config.module_config.lca_config import DEFAULT_IMPACT_FACTORS
+from models import LifeCycleStage, ImpactFactor, ProcessExchange
+from engine import (
+    FactorMatrix, EncodedInventory, encode_stages, stage_impacts, to_impact_dict,
+    evaluate_scenarios, get_stage_activities, UncertaintySpec, UNCERTAINTY_NONE
+)
+from factor_cache import factor_cache, database_key, get_factor_table
+from technosphere import Technosphere
+from contributions import ContributionAnalysis
+from incremental import IncrementalLCA
+from stage_cache import get_stage_cache, cached_stage_impacts
+from factor_store import get_external_store, StoreFactorMatrix
+from monte_carlo import run_monte_carlo
+from sensitivity import SensitivityProblem, run_sobol, local_sensitivities
+from migrations import get_factor_ids
+from queries import impact_rollup
+from bulk import BulkStageWriter
+from importers import import_inventory
+from exporters import write_results, ResultData
+from config.module_config.lca_config import DEFAULT_SETTINGS, UNCERTAINTY, SENSITIVITY
 
 # Set up logger
 logger = get_logger(__name__)
@@ -21,108 +39,483 @@ def get_impact_factors(db: Optional[Session] = None) -> Dict[str, Dict[str, floa
     """
     Get all impact factors from the database or defaults.
     
+    Factor tables are cached process-wide and reloaded only after
+    ImpactFactor rows change (see factor_cache). Without a session, the
+    external factor store is used if one is enabled in lca_config.DATABASE.
+    
     Args:
         db: Optional database session
         
     Returns:
-        Dictionary mapping activity names to impact dictionaries
+        Dictionary mapping activity names to impact dictionaries (a copy,
+        so callers may modify it without affecting the cache)
     """
-    # If db is None, use default factors
     if db is None:
-        return {
-            activity: {
-                "co2": factors[0],
-                "water": factors[1],
-                "energy": factors[2]
-            }
-            for activity, factors in DEFAULT_IMPACT_FACTORS.items()
-        }
-    
-    # Otherwise, get factors from database
-    try:
-        impact_factors = db.query(ImpactFactor).all()
-        return {
-            factor.activity: {
-                "co2": factor.co2,
-                "water": factor.water,
-                "energy": factor.energy
-            }
-            for factor in impact_factors
-        }
-    except Exception as e:
-        logger.error(f"Error getting impact factors from database: {e}")
-        # Fall back to defaults
-        return {
-            activity: {
-                "co2": factors[0],
-                "water": factors[1],
-                "energy": factors[2]
-            }
-            for activity, factors in DEFAULT_IMPACT_FACTORS.items()
-        }
+        store = get_external_store()
+        if store is not None:
+            return {activity: dict(values) for activity, values in store.as_factor_dict().items()}
+    return {activity: dict(values) for activity, values in get_factor_table(db)[0].items()}
+
+def get_factor_matrix(db: Optional[Session] = None) -> FactorMatrix:
+    """
+    Get the impact factors as a dense factor matrix.
+    
+    Without a session, the memory-mapped external factor store is used if
+    one is enabled in lca_config.DATABASE.
+    
+    Args:
+        db: Optional database session
+        
+    Returns:
+        FactorMatrix with one row per activity
+    """
+    if db is None:
+        store = get_external_store()
+        if store is not None:
+            return store.matrix
+    return get_factor_table(db)[1]
+
+def get_activity_names(db: Optional[Session] = None) -> List[str]:
+    """
+    Get the names of all activities with impact factors, sorted.
+    
+    Args:
+        db: Optional database session
+        
+    Returns:
+        List of activity names
+    """
+    factors = get_factor_matrix(db)
+    if isinstance(factors, StoreFactorMatrix):
+        # Store rows are already sorted by name
+        return factors.activities
+    return sorted(factors.activities)
+
+def get_factor_cache_stats() -> Dict[str, Any]:
+    """
+    Get the factor cache version and hit/miss counters.
+    
+    Returns:
+        Dictionary of cache statistics
+    """
+    return factor_cache.stats
+
+def _load_technosphere(db: Session) -> Technosphere:
+    """Build the technosphere from the ImpactFactor and ProcessExchange tables."""
+    factors = get_factor_matrix(db)
+    factor_rows = {factor_id: factors.index_of(activity)
+                   for activity, factor_id in db.query(ImpactFactor.activity, ImpactFactor.id)}
+    exchanges = np.array(
+        db.query(ProcessExchange.process_id, ProcessExchange.input_id, ProcessExchange.amount).all(),
+        dtype=np.float64
+    ).reshape(-1, 3)
+    
+    process_index = np.array([factor_rows.get(int(i), -1) for i in exchanges[:, 0]], dtype=np.int64)
+    input_index = np.array([factor_rows.get(int(i), -1) for i in exchanges[:, 1]], dtype=np.int64)
+    known = (process_index >= 0) & (input_index >= 0)
+    
+    technosphere = Technosphere.from_exchanges(factors, process_index[known], input_index[known],
+                                               exchanges[known, 2])
+    technosphere.factorize()
+    logger.info(f"Factorized technosphere with {technosphere.n_activities} processes "
+                f"and {technosphere.n_exchanges} exchanges")
+    return technosphere
+
+def get_technosphere(db: Session) -> Technosphere:
+    """
+    Get the factorized technosphere of a database.
+    
+    The technosphere and its factorization are cached with the factor tables
+    and rebuilt only after ImpactFactor or ProcessExchange rows change.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Technosphere over the database's activities
+    """
+    return factor_cache.get_derived(f"technosphere:{database_key(db)}", lambda: _load_technosphere(db))
+
+def _log_missing_activities(missing: Dict[str, int]) -> None:
+    """Log a warning for each activity without impact factors."""
+    for activity_name, count in missing.items():
+        logger.warning(f"Impact factors not found for activity: {activity_name} ({count} entries)",
+                       extra={"dedup_key": f"missing-factors:{activity_name}"})
+
+def _count_missing_activities(stages: List[Union[LifeCycleStage, Dict[str, Any]]],
+                              factors: FactorMatrix) -> Dict[str, int]:
+    """Count the entries of activities without impact factors, as encode_stages would."""
+    counts: Dict[str, int] = {}
+    for stage in stages:
+        _, activities = get_stage_activities(stage)
+        for activity_data in activities:
+            activity_name = activity_data.get("activity")
+            counts[activity_name] = counts.get(activity_name, 0) + 1
+    rows = factors.encode(list(counts))
+    return {activity_name: count for (activity_name, count), row in zip(counts.items(), rows) if row < 0}
+
+def _calculate_stage_impacts(stages: List[Union[LifeCycleStage, Dict[str, Any]]],
+                             factors: FactorMatrix) -> np.ndarray:
+    """Calculate per-stage impacts, reusing memoized results of identical stages."""
+    cache = get_stage_cache()
+    if cache is None:
+        inventory = encode_stages(stages, factors)
+        _log_missing_activities(inventory.missing)
+        return stage_impacts(inventory, factors)
+    
+    # Counted for every stage, since cached stages aren't encoded
+    _log_missing_activities(_count_missing_activities(stages, factors))
+    return cached_stage_impacts(stages, factors, cache,
+                                lambda pending: stage_impacts(encode_stages(pending, factors), factors))
+
+def get_stage_cache_stats() -> Dict[str, Any]:
+    """
+    Get the stage result cache size and hit/miss counters.
+    
+    Returns:
+        Dictionary of cache statistics (empty if stage memoization is disabled)
+    """
+    cache = get_stage_cache()
+    return cache.stats if cache is not None else {}
+
+def calculate_impact_breakdown(stages: List[Union[LifeCycleStage, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Calculate environmental impact totals and per-stage breakdowns.
+    
+    Stage results are memoized (see stage_cache.py), so only stages that
+    changed since they were last calculated are computed.
+    
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        
+    Returns:
+        Dictionary with keys 'totals' (impact dictionary) and 'stages'
+        (list of impact dictionaries, one per stage, including the stage name)
+    """
+    per_stage = _calculate_stage_impacts(stages, get_factor_matrix())
+    stage_results = []
+    for stage, values in zip(stages, per_stage):
+        stage_name, _ = get_stage_activities(stage)
+        stage_result = {"name": stage_name}
+        stage_result.update(to_impact_dict(values))
+        stage_results.append(stage_result)
+    
+    return {
+        "totals": to_impact_dict(per_stage.sum(axis=0)),
+        "stages": stage_results
+    }
 
 def calculate_impact(stages: List[Union[LifeCycleStage, Dict[str, Any]]]) -> Dict[str, float]:
     """
     Calculate environmental impact from life cycle stages.
     
+    Stage results are memoized, so repeated stages are computed once.
+    
     Args:
         stages: List of LifeCycleStage objects or dictionaries
         
     Returns:
         Dictionary of total impacts (co2, water, energy)
     """
-    # Get impact factors
-    impact_factors = get_impact_factors()
+    return to_impact_dict(_calculate_stage_impacts(stages, get_factor_matrix()).sum(axis=0))
+
+def create_incremental_session(stages: List[Union[LifeCycleStage, Dict[str, Any]]],
+                               entry_ids: Optional[Iterable[Hashable]] = None) -> IncrementalLCA:
+    """
+    Calculate impacts into a session that updates them as the stages are edited.
     
-    # Initialize results
-    results = {"co2": 0.0, "water": 0.0, "energy": 0.0}
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        entry_ids: Optional IDs for the activities, in stage then activity order
+        
+    Returns:
+        IncrementalLCA with the current totals and per-stage results
+    """
+    session = IncrementalLCA.from_stages(stages, get_factor_matrix(), entry_ids,
+                                         recompute_interval=DEFAULT_SETTINGS["recompute_interval"])
+    for activity_name, count in session.missing.items():
+        logger.warning(f"Impact factors not found for activity: {activity_name} ({count} entries)",
+                       extra={"dedup_key": f"missing-factors:{activity_name}"})
+    return session
+
+def calculate_impact_linked(stages: List[Union[LifeCycleStage, Dict[str, Any]]],
+                            db: Optional[Session] = None) -> Dict[str, float]:
+    """
+    Calculate cradle-to-gate impact from life cycle stages over the linked process network.
     
-    # Calculate impact for each stage
-    for stage in stages:
-        # Get activities from stage
-        if isinstance(stage, LifeCycleStage):
-            activities = stage.activities_list
-        else:
-            activities = stage.get("activities", [])
+    Unlike calculate_impact, each activity also carries the impacts of the
+    activities it consumes (ProcessExchange rows), solved with the cached
+    sparse factorization of the technosphere matrix.
+    
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        db: Optional database session (a new session is used if None)
         
-        # Calculate impact for each activity
-        for activity_data in activities:
-            activity_name = activity_data.get("activity")
-            quantity = float(activity_data.get("quantity", 1.0))
-            
-            # Look up impact factors
-            if activity_name in impact_factors:
-                factors = impact_factors[activity_name]
-                results["co2"] += factors["co2"] * quantity
-                results["water"] += factors["water"] * quantity
-                results["energy"] += factors["energy"] * quantity
-            else:
-                logger.warning(f"Impact factors not found for activity: {activity_name}")
+    Returns:
+        Dictionary of total impacts (co2, water, energy)
+    """
+    session = db if db is not None else get_db()
+    try:
+        technosphere = get_technosphere(session)
+    finally:
+        if db is None:
+            session.close()
+    
+    inventory = encode_stages(stages, technosphere.factors)
+    _log_missing_activities(inventory.missing)
+    
+    demand = np.bincount(inventory.activity_index, weights=inventory.quantity,
+                         minlength=technosphere.n_activities)
+    return to_impact_dict(technosphere.impacts(demand))
+
+def analyze_contributions(stages: List[Union[LifeCycleStage, Dict[str, Any]]], top_k: int = 20,
+                          share: float = 0.8, max_points: Optional[int] = 1000) -> Dict[str, Any]:
+    """
+    Find the activities and stages that drive each impact category.
+    
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        top_k: Number of top activities and stages per category
+        share: Share of a category for which the number of activities
+            needed is reported (e.g. 0.8 for "how many activities make up 80%")
+        max_points: Maximum number of points per Pareto curve
+        
+    Returns:
+        Dictionary mapping each impact category to its 'total', 'top_activities',
+        'top_stages', 'activities_for_share' and 'pareto' curve
+        (see ContributionAnalysis.summary)
+    """
+    factors = get_factor_matrix()
+    inventory = encode_stages(stages, factors)
+    _log_missing_activities(inventory.missing)
+    
+    return ContributionAnalysis(inventory, factors).summary(top_k, share, max_points)
+
+def get_uncertainty_spec(factors: FactorMatrix) -> UncertaintySpec:
+    """
+    Get the uncertainty distribution of every factor matrix row.
     
+    Factors without a stored distribution use UNCERTAINTY["default_distribution"].
+    
+    Args:
+        factors: Factor matrix
+        
+    Returns:
+        UncertaintySpec with one entry per factor matrix row
+    """
+    spec = UncertaintySpec.uniform(
+        factors.n_activities,
+        UNCERTAINTY["default_distribution"],
+        sigma=UNCERTAINTY["default_sigma"],
+        low=UNCERTAINTY["default_min"],
+        high=UNCERTAINTY["default_max"]
+    )
+    
+    # Stored distributions take precedence over the default
+    if factors.uncertainty is not None:
+        stored = factors.uncertainty.kind != UNCERTAINTY_NONE
+        spec.kind[stored] = factors.uncertainty.kind[stored]
+        spec.sigma[stored] = factors.uncertainty.sigma[stored]
+        spec.low[stored] = factors.uncertainty.low[stored]
+        spec.high[stored] = factors.uncertainty.high[stored]
+    
+    return spec
+
+def calculate_impact_uncertainty(stages: List[Union[LifeCycleStage, Dict[str, Any]]],
+                                 n_samples: Optional[int] = None, seed: Optional[int] = None,
+                                 max_workers: Optional[int] = None,
+                                 progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Propagate impact factor uncertainty through life cycle stages with Monte Carlo sampling.
+    
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        n_samples: Maximum number of samples (defaults to UNCERTAINTY["max_samples"])
+        seed: Optional seed for reproducible results (defaults to UNCERTAINTY["seed"])
+        max_workers: Optional number of worker processes (defaults to UNCERTAINTY["max_workers"])
+        progress: Optional callback called with the samples drawn and the
+            maximum after every block (e.g. TaskContext.report)
+        
+    Returns:
+        Dictionary with keys 'samples', 'converged' and 'uncertain_factors' (the
+        number of factors used by the stages that have a distribution), and per
+        impact category a dictionary of 'mean', 'std', 'p5', 'p50' and 'p95'
+    """
+    factors = get_factor_matrix()
+    inventory = encode_stages(stages, factors)
+    _log_missing_activities(inventory.missing)
+    
+    result = run_monte_carlo(
+        inventory,
+        factors,
+        get_uncertainty_spec(factors),
+        max_samples=n_samples or UNCERTAINTY["max_samples"],
+        block_size=UNCERTAINTY["block_size"],
+        min_samples=UNCERTAINTY["min_samples"],
+        tolerance=UNCERTAINTY["tolerance"],
+        confidence=UNCERTAINTY["confidence"],
+        seed=seed if seed is not None else UNCERTAINTY["seed"],
+        max_workers=max_workers if max_workers is not None else UNCERTAINTY["max_workers"],
+        progress=progress
+    )
+    return result.as_dict
+
+def calculate_impact_with_uncertainty(stages: List[Union[LifeCycleStage, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Calculate impacts, adding Monte Carlo uncertainty if enabled in the LCA settings.
+    
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        
+    Returns:
+        Dictionary with keys 'totals' (impact dictionary) and 'uncertainty'
+        (see calculate_impact_uncertainty, or None if
+        DEFAULT_SETTINGS["include_uncertainty"] is False)
+    """
+    results = {"totals": calculate_impact(stages), "uncertainty": None}
+    if DEFAULT_SETTINGS["include_uncertainty"]:
+        results["uncertainty"] = calculate_impact_uncertainty(stages)
     return results
 
-def export_results(data: List[List[str]], format: str, file_path: str) -> None:
+def calculate_sensitivity(stages: List[Union[LifeCycleStage, Dict[str, Any]]],
+                          n_samples: Optional[int] = None, seed: Optional[int] = None,
+                          max_workers: Optional[int] = None,
+                          progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Rank the quantities and impact factors of life cycle stages by their influence on the impacts.
+    
+    Sobol indices cover quantities varying by SENSITIVITY["quantity_range"] and
+    factors with an uncertainty distribution (see get_uncertainty_spec).
+    
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        n_samples: Maximum number of Sobol points (defaults to SENSITIVITY["max_samples"])
+        seed: Optional seed for reproducible results (defaults to SENSITIVITY["seed"])
+        max_workers: Optional number of worker processes (defaults to SENSITIVITY["max_workers"])
+        progress: Optional callback called with the points drawn and the
+            maximum after every round (e.g. TaskContext.report)
+        
+    Returns:
+        Dictionary with keys 'samples', 'evaluations', 'converged', 'history',
+        'parameters' and, per impact category, the 'first_order' and 'total'
+        indices with their confidence intervals (see SensitivityResult.as_dict),
+        plus 'local' with the one-at-a-time sensitivities of every activity
+    """
+    factors = get_factor_matrix()
+    inventory = encode_stages(stages, factors)
+    _log_missing_activities(inventory.missing)
+    
+    max_samples = n_samples or SENSITIVITY["max_samples"]
+    problem = SensitivityProblem(inventory, factors, get_uncertainty_spec(factors),
+                                 quantity_range=SENSITIVITY["quantity_range"])
+    result = run_sobol(
+        problem,
+        base_samples=min(SENSITIVITY["base_samples"], max_samples),
+        max_samples=max_samples,
+        n_bootstrap=SENSITIVITY["n_bootstrap"],
+        confidence=SENSITIVITY["confidence"],
+        tolerance=SENSITIVITY["tolerance"],
+        chunk_size=SENSITIVITY["chunk_size"],
+        seed=seed if seed is not None else SENSITIVITY["seed"],
+        max_workers=max_workers if max_workers is not None else SENSITIVITY["max_workers"],
+        progress=progress
+    )
+    
+    results = result.as_dict
+    results["local"] = local_sensitivities(inventory, factors)
+    return results
+
+def calculate_impact_batch(stages: List[Union[LifeCycleStage, Dict[str, Any]]],
+                           scenarios: np.ndarray, chunk_size: Optional[int] = None,
+                           max_workers: Optional[int] = None) -> np.ndarray:
+    """
+    Calculate environmental impact for many quantity scenarios at once.
+    
+    The stages define the activity structure; each scenario row replaces the
+    stage quantities. Columns follow the activity entries of the stages in
+    order (see get_scenario_columns).
+    
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        scenarios: Quantity matrix of shape (n_scenarios, n_activities);
+            may be an np.memmap for matrices that don't fit in memory
+        chunk_size: Optional number of scenarios evaluated per chunk
+        max_workers: Optional number of processes used to evaluate chunks
+        
+    Returns:
+        Result matrix of shape (n_scenarios, n_categories), with columns
+        in IMPACT_CATEGORIES order (co2, water, energy)
+        
+    Raises:
+        ValueError: If the scenario matrix doesn't match the stages
+    """
+    factors = get_factor_matrix()
+    inventory = encode_stages(stages, factors)
+    _log_missing_activities(inventory.missing)
+    
+    return evaluate_scenarios(inventory, factors, scenarios, chunk_size, max_workers)
+
+def get_scenario_columns(stages: List[Union[LifeCycleStage, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Describe the scenario matrix columns for a stage structure.
+    
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        
+    Returns:
+        List of dictionaries with keys 'stage', 'activity' and 'quantity'
+        (the base quantity), one per scenario matrix column
+    """
+    columns = []
+    for stage in stages:
+        stage_name, activities = get_stage_activities(stage)
+        for activity_data in activities:
+            columns.append({
+                "stage": stage_name,
+                "activity": activity_data.get("activity"),
+                "quantity": float(activity_data.get("quantity", 1.0))
+            })
+    return columns
+
+def export_results(data: ResultData, format: str, file_path: str,
+                   headers: Optional[List[str]] = None, chunk_size: int = 100000) -> None:
     """
     Export results to a file.
     
     Args:
-        data: Table data as a list of rows (each row is a list of cell values)
-        format: Export format ('csv' or 'xlsx')
+        data: Table data as a list of rows (each row is a list of cell values),
+            a numeric 2D array, a DataFrame or a dictionary of columns
+        format: Export format ('csv', 'xlsx', 'parquet' or 'feather')
         file_path: Path to save the file
+        headers: Optional column names (defaults to the results table headers)
+        chunk_size: Number of rows written per CSV chunk or Parquet row group
+        
+    Raises:
+        ValueError: If the format is unsupported
+        ImportError: If Parquet/Feather export is requested without pyarrow
     """
-    # Create a DataFrame from the data
-    headers = ["Stage", "CO2 (kg)", "Water (L)", "Energy (kWh)"]
-    df = pd.DataFrame(data, columns=headers)
+    n_rows = write_results(data, format, file_path, headers=headers, chunk_size=chunk_size)
     
-    # Export based on format
-    if format.lower() == "csv":
-        df.to_csv(file_path, index=False)
-    elif format.lower() == "xlsx":
-        df.to_excel(file_path, index=False)
-    else:
-        raise ValueError(f"Unsupported export format: {format}")
+    logger.info(f"Exported {n_rows} rows to {file_path}")
+
+def get_project_impacts(project_ids: Optional[List[int]] = None, by_stage: bool = False,
+                        as_frame: bool = False) -> Union[Dict[str, np.ndarray], pd.DataFrame]:
+    """
+    Get project-level impact rollups computed in the database.
     
-    logger.info(f"Exported results to {file_path}")
+    Args:
+        project_ids: Optional list of project IDs (defaults to all projects)
+        by_stage: Whether to break the rollup down per stage
+        as_frame: Whether to return a DataFrame instead of a dictionary of arrays
+        
+    Returns:
+        Columnar rollup (see queries.impact_rollup)
+    """
+    db = get_db()
+    try:
+        return impact_rollup(db, project_ids, by_stage=by_stage, as_frame=as_frame)
+    finally:
+        db.close()
 
 def save_stage(stage: Dict[str, Any], project_id: Optional[int] = None) -> LifeCycleStage:
     """
@@ -146,6 +539,9 @@ def save_stage(stage: Dict[str, Any], project_id: Optional[int] = None) -> LifeC
         )
         new_stage.activities_list = stage["activities"]
         
+        # Store activities as lca_stage_activities rows when they all have impact factors
+        new_stage.normalize_activities(get_factor_ids(db))
+        
         # Add to database
         db.add(new_stage)
         db.commit()
@@ -156,5 +552,64 @@ def save_stage(stage: Dict[str, Any], project_id: Optional[int] = None) -> LifeC
         db.rollback()
         logger.error(f"Error saving stage: {e}")
         raise
+    finally:
+        db.close()
+
+def save_stages_bulk(stages: List[Dict[str, Any]], project_id: Optional[int] = None,
+                     batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Save many stages to the database in a single transaction.
+    
+    Rows are inserted with batched executemany statements; if any batch
+    fails the whole import is rolled back.
+    
+    Args:
+        stages: List of stage dictionaries
+        project_id: Optional project ID to associate with the stages
+        batch_size: Number of rows per insert batch
+        
+    Returns:
+        Dictionary with the number of 'stages' and 'activities' written,
+        the elapsed 'seconds' and 'rows_per_second'
+    """
+    db = get_db()
+    
+    try:
+        with BulkStageWriter(db, project_id=project_id, batch_size=batch_size) as writer:
+            for stage in stages:
+                writer.add_stage(stage)
+        return writer.stats
+    finally:
+        db.close()
+
+def import_inventory_file(file_path: str, to_database: bool = False, project_id: Optional[int] = None,
+                          chunk_size: int = 50000, batch_size: int = 5000) -> Dict[str, Any]:
+    """
+    Import an inventory file (CSV or Excel) with bounded memory.
+    
+    The file must have 'stage', 'activity' and 'quantity' columns. Rows are
+    read in chunks, validated and aggregated into per-stage impacts, and
+    optionally written to the database in a single transaction.
+    
+    Args:
+        file_path: Path to the inventory file
+        to_database: Whether to store the stages and activities in the database
+        project_id: Optional project ID for the imported stages
+        chunk_size: Number of file rows processed per chunk
+        batch_size: Number of rows per database insert batch
+        
+    Returns:
+        Import report (see importers.import_inventory)
+    """
+    if not to_database:
+        return import_inventory(file_path, get_factor_matrix(), chunk_size=chunk_size)
+    
+    db = get_db()
+    try:
+        with BulkStageWriter(db, project_id=project_id, batch_size=batch_size) as writer:
+            # Load factors after the writer has seeded missing defaults so both agree
+            factors = get_factor_matrix(db)
+            report = import_inventory(file_path, factors, writer=writer, chunk_size=chunk_size)
+        return report
     finally:
         db.close()
\ No newline at end of file
@@ -0,0 +1,463 @@
+"""
+Vectorized impact calculation engine for the LCA module.
+
+Activities are encoded as an (activity index, quantity) array pair and
+multiplied against a dense factor matrix of shape
+(n_activities, n_impact_categories), so the per-activity work happens in
+NumPy rather than in a Python loop.
+"""
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
+import concurrent.futures
+from collections import deque
+
+import numpy as np
+
+from models import LifeCycleStage
+from config.module_config.lca_config import DEFAULT_IMPACT_FACTORS
+
+# Impact categories, in factor matrix column order
+IMPACT_CATEGORIES = ("co2", "water", "energy")
+
+# Uncertainty distribution codes used in UncertaintySpec.kind
+UNCERTAINTY_NONE = 0
+UNCERTAINTY_LOGNORMAL = 1
+UNCERTAINTY_TRIANGULAR = 2
+UNCERTAINTY_TYPES = {
+    "lognormal": UNCERTAINTY_LOGNORMAL,
+    "triangular": UNCERTAINTY_TRIANGULAR
+}
+
+class UncertaintySpec:
+    """Per-activity uncertainty distributions of a factor matrix, as parallel arrays."""
+
+    def __init__(self, kind: np.ndarray, sigma: np.ndarray,
+                 low: np.ndarray, high: np.ndarray) -> None:
+        """
+        Initialize the uncertainty specification.
+
+        Args:
+            kind: Distribution code per activity (UNCERTAINTY_* constants)
+            sigma: Lognormal standard deviation of ln(value) per activity
+            low: Triangular lower bound per activity, as a multiple of the value
+            high: Triangular upper bound per activity, as a multiple of the value
+        """
+        self.kind = kind
+        self.sigma = sigma
+        self.low = low
+        self.high = high
+
+    @classmethod
+    def from_factor_dict(cls, factors: Dict[str, Dict[str, Any]],
+                         activities: Sequence[str]) -> Optional["UncertaintySpec"]:
+        """
+        Build the specification from the optional uncertainty keys of a factor dictionary.
+
+        Args:
+            factors: Dictionary mapping activity names to impact dictionaries
+            activities: Activity names in factor matrix row order
+
+        Returns:
+            A new UncertaintySpec, or None if no factor has a distribution
+
+        Raises:
+            ValueError: If a factor has an unknown distribution type, a negative
+                sigma or triangular bounds that don't enclose 1
+        """
+        n_activities = len(activities)
+        kind = np.zeros(n_activities, dtype=np.int8)
+        sigma = np.zeros(n_activities, dtype=np.float64)
+        low = np.ones(n_activities, dtype=np.float64)
+        high = np.ones(n_activities, dtype=np.float64)
+
+        for row, activity in enumerate(activities):
+            uncertainty_type = factors[activity].get("uncertainty_type")
+            if not uncertainty_type:
+                continue
+            if uncertainty_type not in UNCERTAINTY_TYPES:
+                raise ValueError(f"Unknown uncertainty type for {activity}: {uncertainty_type}")
+            kind[row] = UNCERTAINTY_TYPES[uncertainty_type]
+            sigma[row] = factors[activity].get("uncertainty_sigma") or 0.0
+            if factors[activity].get("uncertainty_min") is not None:
+                low[row] = factors[activity]["uncertainty_min"]
+            if factors[activity].get("uncertainty_max") is not None:
+                high[row] = factors[activity]["uncertainty_max"]
+            if sigma[row] < 0:
+                raise ValueError(f"Negative uncertainty sigma for {activity}: {sigma[row]}")
+            if kind[row] == UNCERTAINTY_TRIANGULAR and not low[row] <= 1.0 <= high[row]:
+                raise ValueError(
+                    f"Triangular bounds for {activity} must satisfy min <= 1 <= max, "
+                    f"got [{low[row]}, {high[row]}]"
+                )
+
+        if not kind.any():
+            return None
+        return cls(kind, sigma, low, high)
+
+    @classmethod
+    def uniform(cls, n_activities: int, distribution: Optional[str], sigma: float = 0.0,
+                low: float = 1.0, high: float = 1.0) -> "UncertaintySpec":
+        """
+        Build a specification that gives every activity the same distribution.
+
+        Args:
+            n_activities: Number of activities
+            distribution: Distribution type, or None for no uncertainty
+            sigma: Lognormal standard deviation of ln(value)
+            low: Triangular lower bound as a multiple of the value
+            high: Triangular upper bound as a multiple of the value
+
+        Returns:
+            A new UncertaintySpec
+        """
+        code = UNCERTAINTY_TYPES[distribution] if distribution else UNCERTAINTY_NONE
+        return cls(np.full(n_activities, code, dtype=np.int8),
+                   np.full(n_activities, sigma, dtype=np.float64),
+                   np.full(n_activities, low, dtype=np.float64),
+                   np.full(n_activities, high, dtype=np.float64))
+
+    @property
+    def uncertain(self) -> np.ndarray:
+        """Boolean mask of the activities whose distribution has a non-zero spread."""
+        mask = (self.kind == UNCERTAINTY_LOGNORMAL) & (self.sigma > 0)
+        mask |= (self.kind == UNCERTAINTY_TRIANGULAR) & (self.high > self.low)
+        return mask
+
+    def take(self, rows: np.ndarray) -> "UncertaintySpec":
+        """
+        Select the distributions of a subset of activities.
+
+        Args:
+            rows: Factor matrix rows to select
+
+        Returns:
+            A new UncertaintySpec for the selected rows
+        """
+        return UncertaintySpec(self.kind[rows], self.sigma[rows], self.low[rows], self.high[rows])
+
+class FactorMatrix:
+    """Dense impact factor matrix with an activity-name index."""
+
+    def __init__(self, activities: Sequence[str], values: np.ndarray,
+                 uncertainty: Optional[UncertaintySpec] = None) -> None:
+        """
+        Initialize the factor matrix.
+
+        Args:
+            activities: Activity names, one per matrix row
+            values: Array of shape (n_activities, n_impact_categories)
+            uncertainty: Optional per-activity uncertainty distributions
+
+        Raises:
+            ValueError: If the number of activities and rows don't match
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 2 or values.shape != (len(activities), len(IMPACT_CATEGORIES)):
+            raise ValueError(
+                f"Factor matrix must have shape ({len(activities)}, {len(IMPACT_CATEGORIES)}), "
+                f"got {values.shape}"
+            )
+
+        self.activities = list(activities)
+        self.values = values
+        self.categories = IMPACT_CATEGORIES
+        self.uncertainty = uncertainty
+        self.index = {activity: i for i, activity in enumerate(self.activities)}
+
+    @classmethod
+    def from_factor_dict(cls, factors: Dict[str, Dict[str, Any]]) -> "FactorMatrix":
+        """
+        Build a factor matrix from the nested dictionary format used by get_impact_factors.
+
+        Args:
+            factors: Dictionary mapping activity names to impact dictionaries
+
+        Returns:
+            A new FactorMatrix
+        """
+        activities = list(factors.keys())
+        values = np.array(
+            [[factors[activity][category] for category in IMPACT_CATEGORIES]
+             for activity in activities],
+            dtype=np.float64
+        ).reshape(len(activities), len(IMPACT_CATEGORIES))
+        return cls(activities, values, UncertaintySpec.from_factor_dict(factors, activities))
+
+    @classmethod
+    def from_defaults(cls) -> "FactorMatrix":
+        """
+        Build a factor matrix from DEFAULT_IMPACT_FACTORS.
+
+        Returns:
+            A new FactorMatrix
+        """
+        activities = list(DEFAULT_IMPACT_FACTORS.keys())
+        values = np.array([DEFAULT_IMPACT_FACTORS[activity] for activity in activities],
+                          dtype=np.float64).reshape(len(activities), len(IMPACT_CATEGORIES))
+        return cls(activities, values)
+
+    @property
+    def n_activities(self) -> int:
+        """Number of activities (matrix rows)."""
+        return self.values.shape[0]
+
+    @property
+    def n_categories(self) -> int:
+        """Number of impact categories (matrix columns)."""
+        return self.values.shape[1]
+
+    def index_of(self, activity: str) -> int:
+        """
+        Get the matrix row of an activity.
+
+        Args:
+            activity: Activity name
+
+        Returns:
+            Row index, or -1 if the activity is unknown
+        """
+        return self.index.get(activity, -1)
+
+    def encode(self, activities: Iterable[str]) -> np.ndarray:
+        """
+        Map activity names to matrix rows.
+
+        Args:
+            activities: Activity names
+
+        Returns:
+            Integer array of row indices (-1 for unknown activities)
+        """
+        index = self.index
+        return np.fromiter((index.get(activity, -1) for activity in activities), dtype=np.int64)
+
+class EncodedInventory:
+    """Activities of a list of stages encoded as flat NumPy arrays."""
+
+    def __init__(self, activity_index: np.ndarray, quantity: np.ndarray,
+                 stage_index: np.ndarray, stage_names: List[str],
+                 missing: Optional[Dict[str, int]] = None,
+                 known: Optional[np.ndarray] = None) -> None:
+        """
+        Initialize the encoded inventory.
+
+        Args:
+            activity_index: Factor matrix row of each activity entry
+            quantity: Quantity of each activity entry
+            stage_index: Stage position of each activity entry
+            stage_names: Stage names, one per stage position
+            missing: Unknown activity names mapped to their number of entries
+            known: Boolean mask over all original entries marking the ones kept,
+                or None if every entry was kept
+        """
+        self.activity_index = activity_index
+        self.quantity = quantity
+        self.stage_index = stage_index
+        self.stage_names = stage_names
+        self.missing = missing or {}
+        self.known = known
+
+    @property
+    def n_entries(self) -> int:
+        """Number of (known) activity entries."""
+        return self.activity_index.shape[0]
+
+    @property
+    def n_stages(self) -> int:
+        """Number of stages."""
+        return len(self.stage_names)
+
+def get_stage_activities(stage: Union[LifeCycleStage, Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Get the name and activities of a stage object or dictionary.
+
+    Args:
+        stage: LifeCycleStage object or dictionary
+
+    Returns:
+        Tuple of (stage name, list of activity dictionaries)
+    """
+    if isinstance(stage, LifeCycleStage):
+        return stage.name, stage.activities_list
+    return stage.get("name", ""), stage.get("activities", [])
+
+def encode_stages(stages: List[Union[LifeCycleStage, Dict[str, Any]]],
+                  factors: FactorMatrix) -> EncodedInventory:
+    """
+    Encode the activities of life cycle stages as index/quantity arrays.
+
+    Activities without impact factors are dropped from the arrays and
+    counted in the returned inventory's ``missing`` dictionary.
+
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        factors: Factor matrix used to resolve activity names
+
+    Returns:
+        The encoded inventory
+    """
+    names: List[str] = []
+    quantities: List[float] = []
+    stage_counts: List[int] = []
+    stage_names: List[str] = []
+
+    for stage in stages:
+        stage_name, activities = get_stage_activities(stage)
+        stage_names.append(stage_name)
+        stage_counts.append(len(activities))
+        names.extend(activity_data.get("activity") for activity_data in activities)
+        quantities.extend(float(activity_data.get("quantity", 1.0)) for activity_data in activities)
+
+    activity_index = factors.encode(names)
+    quantity = np.array(quantities, dtype=np.float64)
+    stage_index = np.repeat(np.arange(len(stage_names), dtype=np.int64), stage_counts)
+
+    # Drop unknown activities, remembering how often each one occurred
+    known = activity_index >= 0
+    missing: Dict[str, int] = {}
+    all_known = known.all()
+    if not all_known:
+        for position in np.flatnonzero(~known):
+            missing[names[position]] = missing.get(names[position], 0) + 1
+        activity_index = activity_index[known]
+        quantity = quantity[known]
+        stage_index = stage_index[known]
+
+    return EncodedInventory(activity_index, quantity, stage_index, stage_names, missing,
+                            None if all_known else known)
+
+def activity_contributions(inventory: EncodedInventory, factors: FactorMatrix) -> np.ndarray:
+    """
+    Calculate the impact contribution of every activity entry.
+
+    Args:
+        inventory: Encoded inventory
+        factors: Factor matrix the inventory was encoded against
+
+    Returns:
+        Array of shape (n_entries, n_impact_categories)
+    """
+    return factors.values[inventory.activity_index] * inventory.quantity[:, np.newaxis]
+
+def stage_impacts(inventory: EncodedInventory, factors: FactorMatrix) -> np.ndarray:
+    """
+    Calculate the impacts of every stage.
+
+    Args:
+        inventory: Encoded inventory
+        factors: Factor matrix the inventory was encoded against
+
+    Returns:
+        Array of shape (n_stages, n_impact_categories)
+    """
+    contributions = activity_contributions(inventory, factors)
+    result = np.empty((inventory.n_stages, factors.n_categories), dtype=np.float64)
+    for column in range(factors.n_categories):
+        result[:, column] = np.bincount(inventory.stage_index, weights=contributions[:, column],
+                                        minlength=inventory.n_stages)
+    return result
+
+def total_impacts(inventory: EncodedInventory, factors: FactorMatrix) -> np.ndarray:
+    """
+    Calculate the total impacts of an inventory.
+
+    Quantities are first summed per activity, so the totals are a single
+    (n_activities,) x (n_activities, n_impact_categories) product.
+
+    Args:
+        inventory: Encoded inventory
+        factors: Factor matrix the inventory was encoded against
+
+    Returns:
+        Array of shape (n_impact_categories,)
+    """
+    activity_quantities = np.bincount(inventory.activity_index, weights=inventory.quantity,
+                                      minlength=factors.n_activities)
+    return activity_quantities @ factors.values
+
+def _multiply_chunk(quantities: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Multiply a chunk of scenario quantities by the entry weight matrix."""
+    return quantities @ weights
+
+def _iter_chunks(scenarios: np.ndarray, columns: Optional[np.ndarray],
+                 chunk_size: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield (start row, quantity chunk) pairs, selecting the known columns."""
+    for start in range(0, scenarios.shape[0], chunk_size):
+        chunk = np.asarray(scenarios[start:start + chunk_size], dtype=np.float64)
+        if columns is not None:
+            chunk = chunk[:, columns]
+        yield start, chunk
+
+def evaluate_scenarios(inventory: EncodedInventory, factors: FactorMatrix,
+                       scenarios: np.ndarray, chunk_size: Optional[int] = None,
+                       max_workers: Optional[int] = None) -> np.ndarray:
+    """
+    Calculate total impacts for many quantity vectors over the same stage structure.
+
+    Each scenario row holds one quantity per original activity entry of the
+    inventory (in stage order, including entries without impact factors,
+    which are ignored). The result is a single
+    (n_scenarios, n_entries) x (n_entries, n_impact_categories) product.
+
+    Args:
+        inventory: Encoded inventory defining the stage structure
+        factors: Factor matrix the inventory was encoded against
+        scenarios: Array (or np.memmap) of shape (n_scenarios, n_activity_entries)
+        chunk_size: Optional number of scenario rows per chunk; chunks are
+            read and multiplied one at a time to bound memory use
+        max_workers: Optional number of worker processes for chunked evaluation
+
+    Returns:
+        Array of shape (n_scenarios, n_impact_categories)
+
+    Raises:
+        ValueError: If the scenario matrix doesn't match the stage structure
+    """
+    n_columns = inventory.n_entries if inventory.known is None else inventory.known.shape[0]
+    if scenarios.ndim != 2 or scenarios.shape[1] != n_columns:
+        raise ValueError(
+            f"Scenario matrix must have shape (n_scenarios, {n_columns}), got {scenarios.shape}"
+        )
+
+    weights = factors.values[inventory.activity_index]
+    columns = None if inventory.known is None else np.flatnonzero(inventory.known)
+
+    n_scenarios = scenarios.shape[0]
+    if chunk_size is None or chunk_size >= n_scenarios:
+        quantities = np.asarray(scenarios, dtype=np.float64)
+        if columns is not None:
+            quantities = quantities[:, columns]
+        return _multiply_chunk(quantities, weights)
+
+    result = np.empty((n_scenarios, factors.n_categories), dtype=np.float64)
+
+    if not max_workers or max_workers <= 1:
+        for start, chunk in _iter_chunks(scenarios, columns, chunk_size):
+            result[start:start + chunk.shape[0]] = _multiply_chunk(chunk, weights)
+        return result
+
+    # Keep at most two chunks per worker in flight so memory stays bounded
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for start, chunk in _iter_chunks(scenarios, columns, chunk_size):
+            pending.append((start, executor.submit(_multiply_chunk, chunk, weights)))
+            if len(pending) >= 2 * max_workers:
+                done_start, future = pending.popleft()
+                chunk_result = future.result()
+                result[done_start:done_start + chunk_result.shape[0]] = chunk_result
+        for done_start, future in pending:
+            chunk_result = future.result()
+            result[done_start:done_start + chunk_result.shape[0]] = chunk_result
+
+    return result
+
+def to_impact_dict(values: np.ndarray) -> Dict[str, float]:
+    """
+    Convert a row of category values to an impact dictionary.
+
+    Args:
+        values: Array of shape (n_impact_categories,)
+
+    Returns:
+        Dictionary mapping impact categories to values
+    """
+    return {category: float(value) for category, value in zip(IMPACT_CATEGORIES, values)}
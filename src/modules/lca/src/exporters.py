@@ -0,0 +1,129 @@
+"""
+Result export for the LCA module.
+
+Results are handled as typed columns (NumPy arrays) rather than formatted
+strings. CSV is written in chunks, and Parquet/Feather are written through
+Apache Arrow, which can wrap the NumPy columns without copying them.
+"""
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Headers of the results table (stage label followed by the impact categories)
+RESULT_HEADERS = ["Stage", "CO2 (kg)", "Water (L)", "Energy (kWh)"]
+CATEGORY_HEADERS = RESULT_HEADERS[1:]
+
+# Largest number of data rows an Excel worksheet can hold
+EXCEL_MAX_ROWS = 1048575
+
+ResultData = Union[List[List[Any]], np.ndarray, pd.DataFrame, Dict[str, Sequence[Any]]]
+
+def to_columns(data: ResultData, headers: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Convert result data to named columns.
+
+    Args:
+        data: List of rows, 2D array, DataFrame or dictionary of columns
+        headers: Optional column names; defaults to RESULT_HEADERS for four
+            columns and CATEGORY_HEADERS for three
+
+    Returns:
+        Dictionary mapping column names to 1D arrays
+
+    Raises:
+        ValueError: If the column names can't be determined or don't match the data
+    """
+    if isinstance(data, pd.DataFrame):
+        columns = {str(name): data[name].to_numpy() for name in data.columns}
+    elif isinstance(data, dict):
+        columns = {str(name): np.asarray(values) for name, values in data.items()}
+    else:
+        if isinstance(data, np.ndarray):
+            if data.ndim != 2:
+                raise ValueError(f"Result arrays must be 2D, got {data.ndim}D")
+            values = [data[:, i] for i in range(data.shape[1])]
+        else:
+            values = [np.asarray(column) for column in zip(*data)] if data else []
+
+        n_columns = len(values) if values else len(headers or RESULT_HEADERS)
+        if headers is None:
+            if n_columns == len(RESULT_HEADERS):
+                headers = RESULT_HEADERS
+            elif n_columns == len(CATEGORY_HEADERS):
+                headers = CATEGORY_HEADERS
+            else:
+                raise ValueError(f"Headers are required for {n_columns} result columns")
+        if not values:
+            values = [np.array([]) for _ in headers]
+        elif len(values) != len(headers):
+            raise ValueError(f"Expected {len(values)} headers, got {len(headers)}")
+        columns = dict(zip(headers, values))
+
+    if headers is not None and list(columns) != list(headers):
+        if len(headers) != len(columns):
+            raise ValueError(f"Expected {len(columns)} headers, got {len(headers)}")
+        columns = dict(zip(headers, columns.values()))
+    return columns
+
+def _write_csv(columns: Dict[str, np.ndarray], file_path: str, chunk_size: int) -> None:
+    """Write columns to CSV a chunk of rows at a time."""
+    n_rows = len(next(iter(columns.values()))) if columns else 0
+    with open(file_path, "w", newline="", encoding="utf-8") as file:
+        if n_rows == 0:
+            pd.DataFrame({name: [] for name in columns}).to_csv(file, index=False)
+            return
+        for start in range(0, n_rows, chunk_size):
+            chunk = pd.DataFrame({name: values[start:start + chunk_size]
+                                  for name, values in columns.items()})
+            chunk.to_csv(file, index=False, header=start == 0)
+
+def _arrow_table(columns: Dict[str, np.ndarray]):
+    """Wrap columns in an Arrow table."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Parquet and Feather export require the 'pyarrow' package") from e
+    return pa.table({name: pa.array(values) for name, values in columns.items()})
+
+def write_results(data: ResultData, format: str, file_path: str,
+                  headers: Optional[List[str]] = None, chunk_size: int = 100000) -> int:
+    """
+    Write result data to a file.
+
+    Args:
+        data: List of rows, 2D array, DataFrame or dictionary of columns
+        format: Export format ('csv', 'xlsx', 'parquet' or 'feather')
+        file_path: Path to save the file
+        headers: Optional column names
+        chunk_size: Rows per CSV chunk or Parquet row group
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ValueError: If the format is unsupported or the data doesn't fit it
+        ImportError: If Parquet/Feather export is requested without pyarrow
+    """
+    format = format.lower()
+    columns = to_columns(data, headers)
+    n_rows = len(next(iter(columns.values()))) if columns else 0
+
+    if format == "csv":
+        _write_csv(columns, file_path, chunk_size)
+    elif format == "xlsx":
+        if n_rows > EXCEL_MAX_ROWS:
+            raise ValueError(f"Too many rows for an Excel worksheet: {n_rows}")
+        pd.DataFrame(columns).to_excel(file_path, index=False)
+    elif format == "parquet":
+        table = _arrow_table(columns)
+        import pyarrow.parquet as pq
+        pq.write_table(table, file_path, row_group_size=chunk_size)
+    elif format == "feather":
+        table = _arrow_table(columns)
+        import pyarrow.feather as feather
+        feather.write_feather(table, file_path)
+    else:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    return n_rows
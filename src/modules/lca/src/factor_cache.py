@@ -0,0 +1,250 @@
+"""
+Process-wide cache of impact factor tables.
+
+Factor tables are loaded once per source (the default factors or a database)
+and reused until the cache version changes. The version is bumped whenever
+ImpactFactor or ProcessExchange rows are inserted, updated or deleted
+through a SQLAlchemy session, so cached tables never outlive the rows they
+were built from. Objects derived from the tables (such as factorized
+technosphere matrices) are cached alongside them with get_derived().
+"""
+import itertools
+import threading
+import weakref
+from typing import Dict, Callable, Tuple, Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.utils.logger import get_logger
+from models import ImpactFactor, ProcessExchange
+from engine import FactorMatrix
+from config.module_config.lca_config import DEFAULT_IMPACT_FACTORS
+
+# Set up logger
+logger = get_logger(__name__)
+
+# Cache key used for DEFAULT_IMPACT_FACTORS
+DEFAULTS_KEY = "defaults"
+
+class FactorCache:
+    """Versioned cache of factor tables with hit/miss counters."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Tuple[int, Dict[str, Dict[str, float]], FactorMatrix]] = {}
+        self._derived: Dict[str, Tuple[int, Any]] = {}
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str,
+            loader: Callable[[], Dict[str, Dict[str, float]]]) -> Tuple[Dict[str, Dict[str, float]], FactorMatrix]:
+        """
+        Get a factor table, loading it if it is missing or stale.
+
+        Args:
+            key: Cache key identifying the factor source
+            loader: Function returning the factors as a nested dictionary
+
+        Returns:
+            Tuple of (factor dictionary, factor matrix)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self.version:
+                self.hits += 1
+                return entry[1], entry[2]
+
+            self.misses += 1
+            version = self.version
+
+        # Load outside the lock so slow queries don't block other readers
+        factors = loader()
+        matrix = FactorMatrix.from_factor_dict(factors)
+
+        with self._lock:
+            # Only store the table if nothing changed while it was loading
+            if version == self.version:
+                self._entries[key] = (version, factors, matrix)
+
+        logger.debug(f"Loaded {len(factors)} impact factors for {key} (version {version})")
+        return factors, matrix
+
+    def get_derived(self, key: str, builder: Callable[[], Any]) -> Any:
+        """
+        Get an object derived from the factor tables, building it if it is missing or stale.
+
+        Args:
+            key: Cache key identifying the object
+            builder: Function building the object
+
+        Returns:
+            The cached or newly built object
+        """
+        with self._lock:
+            entry = self._derived.get(key)
+            if entry is not None and entry[0] == self.version:
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            version = self.version
+
+        value = builder()
+
+        with self._lock:
+            if version == self.version:
+                self._derived[key] = (version, value)
+        return value
+
+    def discard(self, key: str) -> None:
+        """
+        Drop a source's factor table and the objects derived from it.
+
+        Args:
+            key: Cache key identifying the factor source
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            for derived_key in [k for k in self._derived if k.endswith(f":{key}")]:
+                del self._derived[derived_key]
+
+    def invalidate(self) -> None:
+        """Invalidate all cached factor tables by bumping the version."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._derived.clear()
+        logger.debug(f"Impact factor cache invalidated (version {self.version})")
+
+    def reset_stats(self) -> None:
+        """Reset the hit/miss counters."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache version and hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries) + len(self._derived),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+# Process-wide cache instance
+factor_cache = FactorCache()
+
+# Cache key per engine (or connection) bound to a session. Keys are never
+# reused, so engines with the same URL (e.g. two sqlite:///:memory:
+# databases) don't share tables, and a dropped engine's tables are discarded.
+_bind_keys: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+_bind_ids = itertools.count(1)
+_bind_keys_lock = threading.Lock()
+
+def database_key(db: Session) -> str:
+    """
+    Get the cache key for a database session.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Cache key identifying the engine the session is bound to
+    """
+    bind = db.get_bind()
+    with _bind_keys_lock:
+        key = _bind_keys.get(bind)
+        if key is None:
+            key = f"db{next(_bind_ids)}:{bind.url}"
+            _bind_keys[bind] = key
+            weakref.finalize(bind, factor_cache.discard, key)
+        return key
+
+def default_factor_dict() -> Dict[str, Dict[str, float]]:
+    """Build the nested factor dictionary from DEFAULT_IMPACT_FACTORS."""
+    return {
+        activity: {
+            "co2": factors[0],
+            "water": factors[1],
+            "energy": factors[2]
+        }
+        for activity, factors in DEFAULT_IMPACT_FACTORS.items()
+    }
+
+def database_factor_dict(db: Session) -> Dict[str, Dict[str, float]]:
+    """Build the nested factor dictionary from the ImpactFactor table."""
+    factors = {}
+    for factor in db.query(ImpactFactor).all():
+        factors[factor.activity] = {
+            "co2": factor.co2,
+            "water": factor.water,
+            "energy": factor.energy
+        }
+        # Uncertainty keys are only present for factors that have a distribution
+        if factor.uncertainty is not None:
+            factors[factor.activity].update(factor.uncertainty)
+    return factors
+
+def get_factor_table(db: Optional[Session] = None) -> Tuple[Dict[str, Dict[str, float]], FactorMatrix]:
+    """
+    Get the cached factor dictionary and matrix for the defaults or a database.
+
+    The dictionary is shared by all callers and must not be modified.
+
+    Args:
+        db: Optional database session (the defaults are used if None or if
+            the factors can't be read)
+
+    Returns:
+        Tuple of (factor dictionary, factor matrix)
+    """
+    if db is None:
+        return factor_cache.get(DEFAULTS_KEY, default_factor_dict)
+    try:
+        return factor_cache.get(database_key(db), lambda: database_factor_dict(db))
+    except Exception as e:
+        logger.error(f"Error getting impact factors from database: {e}")
+        return factor_cache.get(DEFAULTS_KEY, default_factor_dict)
+
+def _has_impact_factors(objects) -> bool:
+    """Check whether any of the objects is an ImpactFactor or ProcessExchange."""
+    return any(isinstance(obj, (ImpactFactor, ProcessExchange)) for obj in objects)
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_flush(session: Session, flush_context) -> None:
+    """Invalidate the cache when ImpactFactor or ProcessExchange rows are flushed."""
+    if (_has_impact_factors(session.new) or _has_impact_factors(session.dirty)
+            or _has_impact_factors(session.deleted)):
+        session.info["lca_factors_flushed"] = True
+        factor_cache.invalidate()
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    """Invalidate tables that other sessions loaded from the old rows between flush and commit."""
+    if session.info.pop("lca_factors_flushed", False):
+        factor_cache.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _invalidate_on_rollback(session: Session) -> None:
+    """Invalidate tables that may have been loaded from rolled-back ImpactFactor changes."""
+    if session.info.pop("lca_factors_flushed", False):
+        factor_cache.invalidate()
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_statement(orm_execute_state) -> None:
+    """Invalidate the cache on bulk INSERT/UPDATE/DELETE statements against the factor tables."""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update
+            or orm_execute_state.is_delete):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (ImpactFactor, ProcessExchange):
+        orm_execute_state.session.info["lca_factors_flushed"] = True
+        factor_cache.invalidate()
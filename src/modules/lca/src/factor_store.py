@@ -0,0 +1,458 @@
+"""
+Memory-mapped impact factor store for large external LCA databases.
+
+External factor datasets (CSV or XML dumps, e.g. exported from ecoinvent)
+are parsed once into a store directory:
+
+    names.npy   Activity names as UTF-8 bytes, sorted (the name index)
+    values.npy  Float64 factors, shape (n_activities, n_impact_categories),
+                rows in name order
+    meta.json   Format version, categories and the source file's size and
+                modification time
+
+Opening a store memory-maps both arrays, so it takes milliseconds regardless
+of the dataset size; names are looked up by binary search and factor rows
+are only read from disk when used. The store is rebuilt when the source
+file changes.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.utils.logger import get_logger
+from engine import FactorMatrix, IMPACT_CATEGORIES
+from config.module_config.lca_config import DATABASE
+
+# Set up logger
+logger = get_logger(__name__)
+
+STORE_FORMAT_VERSION = 1
+NAMES_FILE = "names.npy"
+VALUES_FILE = "values.npy"
+META_FILE = "meta.json"
+
+# Activity name column (CSV) or attribute/child element (XML)
+NAME_FIELD = "activity"
+
+FactorChunk = Tuple[np.ndarray, np.ndarray]
+
+class StoreFactorMatrix(FactorMatrix):
+    """
+    Factor matrix backed by a factor store.
+
+    Lookups use binary search on the memory-mapped sorted names instead of a
+    dictionary, so nothing is built per activity when the store is opened.
+    """
+
+    def __init__(self, names: np.ndarray, values: np.ndarray) -> None:
+        """
+        Initialize the matrix.
+
+        Args:
+            names: Sorted activity names as UTF-8 bytes
+            values: Factor values in name order
+        """
+        self.names = names
+        self.values = values
+        self.categories = IMPACT_CATEGORIES
+        self.uncertainty = None
+        self._activities: Optional[List[str]] = None
+        self._index: Optional[Dict[str, int]] = None
+
+    @property
+    def activities(self) -> List[str]:
+        """Activity names, in matrix row order (decoded on first use)."""
+        if self._activities is None:
+            self._activities = np.char.decode(np.asarray(self.names), "utf-8").tolist()
+        return self._activities
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """Dictionary mapping activity names to rows (built on first use)."""
+        if self._index is None:
+            self._index = {activity: i for i, activity in enumerate(self.activities)}
+        return self._index
+
+    def index_of(self, activity: str) -> int:
+        """
+        Get the matrix row of an activity.
+
+        Args:
+            activity: Activity name
+
+        Returns:
+            Row index, or -1 if the activity is unknown
+        """
+        return int(self.encode([activity])[0])
+
+    def encode(self, activities: Iterable[str]) -> np.ndarray:
+        """
+        Map activity names to matrix rows.
+
+        Args:
+            activities: Activity names
+
+        Returns:
+            Integer array of row indices (-1 for unknown activities)
+        """
+        keys = np.array([str(activity).encode("utf-8") for activity in activities], dtype=bytes)
+        if keys.size == 0 or self.names.shape[0] == 0:
+            return np.full(keys.shape[0], -1, dtype=np.int64)
+        rows = np.searchsorted(self.names, keys)
+        clipped = np.minimum(rows, self.names.shape[0] - 1)
+        return np.where(self.names[clipped] == keys, clipped, -1).astype(np.int64)
+
+class FactorStore:
+    """A memory-mapped factor store directory."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open a factor store.
+
+        Args:
+            path: Store directory
+
+        Raises:
+            FileNotFoundError: If the store doesn't exist
+            ValueError: If the store has an unsupported format
+        """
+        self.path = Path(path)
+        with open(self.path / META_FILE, "r", encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        if self.meta.get("version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported factor store version: {self.meta.get('version')}")
+        if tuple(self.meta.get("categories", ())) != IMPACT_CATEGORIES:
+            raise ValueError(f"Factor store categories don't match {IMPACT_CATEGORIES}")
+
+        # Empty arrays can't be memory-mapped on every platform
+        mmap_mode = "r" if self.meta.get("count") else None
+        self.names = np.load(self.path / NAMES_FILE, mmap_mode=mmap_mode)
+        self.values = np.load(self.path / VALUES_FILE, mmap_mode=mmap_mode)
+        self.matrix = StoreFactorMatrix(self.names, self.values)
+        self._factor_dict: Optional[Dict[str, Dict[str, float]]] = None
+
+    def __len__(self) -> int:
+        """Number of activities."""
+        return self.names.shape[0]
+
+    def is_current(self, source_path: Path) -> bool:
+        """
+        Check whether the store was built from the current version of a source file.
+
+        Args:
+            source_path: Source file
+
+        Returns:
+            True if the source's size and modification time match the store's
+        """
+        source = self.meta.get("source") or {}
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return False
+        return (source.get("path") == str(Path(source_path).resolve())
+                and source.get("size") == stat.st_size
+                and source.get("mtime_ns") == stat.st_mtime_ns)
+
+    def as_factor_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the factors in the nested dictionary format used by get_impact_factors.
+
+        Built on first use; this reads the whole store. The dictionary is
+        cached on the store and must not be modified.
+
+        Returns:
+            Dictionary mapping activity names to impact dictionaries
+        """
+        if self._factor_dict is None:
+            values = np.asarray(self.values).tolist()
+            self._factor_dict = {
+                activity: dict(zip(IMPACT_CATEGORIES, row))
+                for activity, row in zip(self.matrix.activities, values)
+            }
+        return self._factor_dict
+
+def write_factor_store(path: Path, chunks: Iterable[FactorChunk],
+                       source_path: Optional[Path] = None) -> FactorStore:
+    """
+    Write a factor store from chunks of names and values.
+
+    Names are sorted; if an activity appears more than once, its last row wins.
+    The store is written to a temporary directory and moved into place, so
+    readers never see a partial store.
+
+    Args:
+        path: Store directory
+        chunks: Iterable of (names, values) array pairs
+        source_path: Optional source file recorded for change detection
+
+    Returns:
+        The opened store
+    """
+    path = Path(path)
+    name_chunks, value_chunks = [], []
+    for names, values in chunks:
+        name_chunks.append(np.char.encode(np.asarray(names, dtype=str), "utf-8"))
+        value_chunks.append(np.asarray(values, dtype=np.float64).reshape(-1, len(IMPACT_CATEGORIES)))
+    names = np.concatenate(name_chunks) if name_chunks else np.empty(0, dtype="S1")
+    values = np.concatenate(value_chunks) if value_chunks else np.empty((0, len(IMPACT_CATEGORIES)))
+
+    # Sort by name, keeping the last row of each duplicated name
+    order = np.argsort(names, kind="stable")
+    names = names[order]
+    keep = np.append(names[1:] != names[:-1], True) if names.size else np.empty(0, dtype=bool)
+    names = names[keep]
+    values = values[order[keep]]
+
+    meta = {
+        "version": STORE_FORMAT_VERSION,
+        "categories": list(IMPACT_CATEGORIES),
+        "count": int(names.shape[0]),
+        "created": time.time(),
+        "source": None
+    }
+    if source_path is not None:
+        stat = os.stat(source_path)
+        meta["source"] = {"path": str(Path(source_path).resolve()), "size": stat.st_size,
+                          "mtime_ns": stat.st_mtime_ns}
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{path.name}.", dir=path.parent))
+    try:
+        np.save(staging / NAMES_FILE, names)
+        np.save(staging / VALUES_FILE, values)
+        with open(staging / META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        if path.exists():
+            shutil.rmtree(path)
+        os.replace(staging, path)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    logger.info(f"Wrote factor store with {meta['count']} activities to {path}")
+    return FactorStore(path)
+
+def iter_csv_factors(file_path: Path, chunk_size: int = 100000) -> Iterator[FactorChunk]:
+    """
+    Read factors from a CSV file in chunks.
+
+    The file must have an "activity" column and one column per impact
+    category (co2, water, energy); other columns are ignored. Rows with a
+    missing name or non-numeric factor are skipped.
+
+    Args:
+        file_path: CSV file
+        chunk_size: Rows per chunk
+
+    Yields:
+        Tuples of (names, values) arrays
+    """
+    columns = [NAME_FIELD, *IMPACT_CATEGORIES]
+    skipped = 0
+    for chunk in pd.read_csv(file_path, usecols=columns, chunksize=chunk_size):
+        values = chunk[list(IMPACT_CATEGORIES)].apply(pd.to_numeric, errors="coerce").to_numpy(np.float64)
+        valid = chunk[NAME_FIELD].notna().to_numpy() & ~np.isnan(values).any(axis=1)
+        skipped += int((~valid).sum())
+        yield chunk[NAME_FIELD].to_numpy()[valid].astype(str), values[valid]
+    if skipped:
+        logger.warning(f"Skipped {skipped} invalid rows in {file_path}")
+
+def _local_name(tag: str) -> str:
+    """Strip the namespace from an XML tag."""
+    return tag.rsplit("}", 1)[-1]
+
+def iter_xml_factors(file_path: Path, chunk_size: int = 100000,
+                     tag: str = "activity") -> Iterator[FactorChunk]:
+    """
+    Stream factors from an XML file in chunks.
+
+    Every element named tag (ignoring namespaces) is one activity. Its name
+    and factors are read from attributes or child elements named "name" (or
+    "activity"), "co2", "water" and "energy":
+
+        <activity name="steel_kg" co2="2.0" water="50" energy="25"/>
+        <activity><name>steel_kg</name><co2>2.0</co2>...</activity>
+
+    Elements are discarded as soon as they are read, so memory use doesn't
+    grow with the file size. Activities with missing values are skipped.
+
+    Args:
+        file_path: XML file
+        chunk_size: Activities per chunk
+        tag: Activity element name
+
+    Yields:
+        Tuples of (names, values) arrays
+    """
+    names: List[str] = []
+    rows: List[List[float]] = []
+    skipped = 0
+    root = None
+    for event, element in ElementTree.iterparse(str(file_path), events=("start", "end")):
+        if root is None:
+            root = element
+        if event != "end" or _local_name(element.tag) != tag:
+            continue
+
+        fields = {_local_name(key): value for key, value in element.attrib.items()}
+        for child in element:
+            if child.text is not None:
+                fields.setdefault(_local_name(child.tag), child.text.strip())
+        name = fields.get("name") or fields.get(NAME_FIELD)
+        try:
+            row = [float(fields[category]) for category in IMPACT_CATEGORIES]
+        except (KeyError, ValueError):
+            row = None
+        if name and row is not None:
+            names.append(name)
+            rows.append(row)
+        else:
+            skipped += 1
+
+        # Free the parsed element and its references from the root
+        element.clear()
+        if len(names) >= chunk_size:
+            root.clear()
+            yield np.array(names, dtype=str), np.array(rows, dtype=np.float64)
+            names, rows = [], []
+
+    if names:
+        yield np.array(names, dtype=str), np.array(rows, dtype=np.float64)
+    if skipped:
+        logger.warning(f"Skipped {skipped} incomplete activities in {file_path}")
+
+def build_factor_store(source_path: Path, store_path: Path, chunk_size: int = 100000) -> FactorStore:
+    """
+    Import a CSV or XML factor dump into a factor store.
+
+    Args:
+        source_path: Source file (.csv or .xml)
+        store_path: Store directory to write
+        chunk_size: Rows read per chunk
+
+    Returns:
+        The opened store
+
+    Raises:
+        ValueError: If the file type is unsupported
+    """
+    source_path = Path(source_path)
+    suffix = source_path.suffix.lower()
+    if suffix == ".csv":
+        chunks = iter_csv_factors(source_path, chunk_size)
+    elif suffix == ".xml":
+        chunks = iter_xml_factors(source_path, chunk_size)
+    else:
+        raise ValueError(f"Unsupported factor file type: {suffix}")
+
+    start = time.perf_counter()
+    store = write_factor_store(store_path, chunks, source_path)
+    logger.info(f"Imported {len(store)} activities from {source_path} in {time.perf_counter() - start:.1f}s")
+    return store
+
+def default_store_path(source_path: Path) -> Path:
+    """
+    Get the store directory used for a source file when none is configured.
+
+    Args:
+        source_path: Source file
+
+    Returns:
+        Store directory next to the source file
+    """
+    source_path = Path(source_path)
+    return source_path.with_name(f"{source_path.name}.store")
+
+def open_factor_store(source_path: Path, store_path: Optional[Path] = None,
+                      cache: bool = True) -> FactorStore:
+    """
+    Open the factor store for an external database, importing it if needed.
+
+    Args:
+        source_path: Store directory, or a CSV/XML source file
+        store_path: Store directory for an imported source (defaults to
+            default_store_path(source_path))
+        cache: Whether to keep the imported store for later runs; if False
+            the source is imported into a temporary directory that is
+            removed when the store is garbage collected or at exit
+
+    Returns:
+        The opened store
+    """
+    source_path = Path(source_path)
+    if (source_path / META_FILE).is_file():
+        return FactorStore(source_path)
+
+    if not cache:
+        temp_dir = tempfile.mkdtemp(prefix="lca_factors_")
+        try:
+            store = build_factor_store(source_path, Path(temp_dir) / "store")
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        weakref.finalize(store, shutil.rmtree, temp_dir, ignore_errors=True)
+        return store
+
+    store_path = Path(store_path) if store_path else default_store_path(source_path)
+    if (store_path / META_FILE).is_file():
+        try:
+            store = FactorStore(store_path)
+            if store.is_current(source_path):
+                return store
+            logger.info(f"Factor store {store_path} is out of date, re-importing {source_path}")
+        except ValueError as e:
+            logger.info(f"Rebuilding factor store {store_path}: {e}")
+    return build_factor_store(source_path, store_path)
+
+# Store opened from lca_config.DATABASE, shared by the process
+_external_store: Optional[FactorStore] = None
+_external_store_error: Optional[str] = None
+_external_store_lock = threading.Lock()
+
+def get_external_store() -> Optional[FactorStore]:
+    """
+    Get the external factor store configured in lca_config.DATABASE.
+
+    The first call imports the database if it has no current store, which
+    can take minutes for a large dump; the module's startup initialization
+    makes that call in the background. A database that can't be opened is
+    logged once and not retried until reset_external_store() is called.
+
+    Returns:
+        The store, or None if no external database is enabled or it can't be opened
+    """
+    global _external_store, _external_store_error
+    if not DATABASE.get("use_external_db") or not DATABASE.get("external_db_path"):
+        return None
+
+    with _external_store_lock:
+        if _external_store is None and _external_store_error is None:
+            try:
+                _external_store = open_factor_store(
+                    DATABASE["external_db_path"],
+                    DATABASE.get("store_path") or None,
+                    cache=DATABASE.get("cache_external_data", True)
+                )
+            except Exception as e:
+                _external_store_error = str(e)
+                logger.error(f"Error opening external LCA database {DATABASE['external_db_path']}, "
+                             f"using the built-in factors: {e}")
+        return _external_store
+
+def reset_external_store() -> None:
+    """Forget the opened external store or failure (e.g. after changing lca_config.DATABASE)."""
+    global _external_store, _external_store_error
+    with _external_store_lock:
+        _external_store = None
+        _external_store_error = None
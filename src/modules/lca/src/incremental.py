@@ -0,0 +1,319 @@
+"""
+Incremental impact calculation for the LCA module.
+
+An IncrementalLCA session keeps the total and per-stage impacts of an
+inventory and updates them by the delta of every edit: changing an entry's
+quantity or activity, adding or removing an entry, or changing an
+activity's factors costs O(n_categories) (a factor change costs that per
+stage using the activity) instead of a full pass over the inventory.
+Repeated additions and subtractions accumulate rounding error, so the
+session recomputes everything from its entries after every
+recompute_interval edits.
+"""
+from typing import Dict, Any, List, Optional, Hashable, Iterable, Union
+
+import numpy as np
+
+from core.utils.logger import get_logger
+from models import LifeCycleStage
+from engine import FactorMatrix, get_stage_activities, to_impact_dict
+
+# Set up logger
+logger = get_logger(__name__)
+
+class IncrementalLCA:
+    """Live totals of an editable inventory, keyed by entry ID."""
+
+    def __init__(self, factors: FactorMatrix, recompute_interval: int = 1000) -> None:
+        """
+        Initialize an empty session.
+
+        Args:
+            factors: Factor matrix used to resolve activity names (not modified)
+            recompute_interval: Edits after which the results are recomputed
+                from scratch to discard accumulated rounding error (0 never)
+        """
+        self.factors = factors
+        self.recompute_interval = recompute_interval
+        self.stage_names: List[str] = []
+        self._stage_totals: List[np.ndarray] = []
+        self._totals = np.zeros(factors.n_categories, dtype=np.float64)
+
+        self._entries: Dict[Hashable, list] = {}  # entry ID -> [stage, activity, quantity]
+        self._usage: Dict[str, Dict[int, float]] = {}  # activity -> stage -> summed quantity
+        self._overrides: Dict[str, np.ndarray] = {}  # activity -> factors set with set_factor
+        self._next_id = 0
+        self._edits = 0
+        self.missing: Dict[str, int] = {}  # activity without factors -> number of entries
+
+    @classmethod
+    def from_stages(cls, stages: List[Union[LifeCycleStage, Dict[str, Any]]], factors: FactorMatrix,
+                    entry_ids: Optional[Iterable[Hashable]] = None,
+                    recompute_interval: int = 1000) -> "IncrementalLCA":
+        """
+        Create a session from life cycle stages.
+
+        Args:
+            stages: List of LifeCycleStage objects or dictionaries
+            factors: Factor matrix used to resolve activity names
+            entry_ids: Optional IDs for the activities, in stage then activity
+                order (defaults to consecutive integers)
+            recompute_interval: Edits between full recomputations
+
+        Returns:
+            A new IncrementalLCA
+        """
+        session = cls(factors, recompute_interval)
+        ids = iter(entry_ids) if entry_ids is not None else None
+        for stage in stages:
+            stage_name, activities = get_stage_activities(stage)
+            position = session.add_stage(stage_name)
+            for activity_data in activities:
+                entry_id = next(ids) if ids is not None else session._new_id()
+                session._entries[entry_id] = [position, activity_data.get("activity"),
+                                              float(activity_data.get("quantity", 1.0))]
+        session.recompute()
+        return session
+
+    @property
+    def n_entries(self) -> int:
+        """Number of entries."""
+        return len(self._entries)
+
+    @property
+    def entry_ids(self) -> List[Hashable]:
+        """IDs of all entries."""
+        return list(self._entries)
+
+    def __contains__(self, entry_id: Hashable) -> bool:
+        """Return whether an entry exists."""
+        return entry_id in self._entries
+
+    @property
+    def totals(self) -> Dict[str, float]:
+        """Total impacts as an impact dictionary."""
+        return to_impact_dict(self._totals)
+
+    @property
+    def stage_totals(self) -> List[Dict[str, Any]]:
+        """Impact dictionaries per stage, including the stage name."""
+        results = []
+        for stage_name, values in zip(self.stage_names, self._stage_totals):
+            stage_result = {"name": stage_name}
+            stage_result.update(to_impact_dict(values))
+            results.append(stage_result)
+        return results
+
+    def factor(self, activity: str) -> Optional[np.ndarray]:
+        """
+        Get the factors of an activity.
+
+        Args:
+            activity: Activity name
+
+        Returns:
+            Factor row, or None if the activity has no factors
+        """
+        override = self._overrides.get(activity)
+        if override is not None:
+            return override
+        row = self.factors.index_of(activity)
+        return self.factors.values[row] if row >= 0 else None
+
+    def add_stage(self, name: str) -> int:
+        """
+        Add an empty stage.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            Stage position (used by add_entry)
+        """
+        self.stage_names.append(name)
+        self._stage_totals.append(np.zeros(self.factors.n_categories, dtype=np.float64))
+        return len(self.stage_names) - 1
+
+    def add_entry(self, stage: int, activity: str, quantity: float,
+                  entry_id: Optional[Hashable] = None) -> Hashable:
+        """
+        Add an activity entry to a stage.
+
+        Args:
+            stage: Stage position
+            activity: Activity name
+            quantity: Activity quantity
+            entry_id: Optional ID (defaults to the next unused integer)
+
+        Returns:
+            The entry ID
+
+        Raises:
+            KeyError: If the stage doesn't exist or the entry ID is taken
+        """
+        if not 0 <= stage < len(self.stage_names):
+            raise KeyError(f"Unknown stage: {stage}")
+        if entry_id is None:
+            entry_id = self._new_id()
+        elif entry_id in self._entries:
+            raise KeyError(f"Duplicate entry ID: {entry_id}")
+
+        self._entries[entry_id] = [stage, activity, float(quantity)]
+        self._count_missing(activity, 1)
+        self._apply(stage, activity, float(quantity))
+        self._edited()
+        return entry_id
+
+    def remove_entry(self, entry_id: Hashable) -> None:
+        """
+        Remove an entry.
+
+        Args:
+            entry_id: Entry ID
+
+        Raises:
+            KeyError: If the entry doesn't exist
+        """
+        stage, activity, quantity = self._entries.pop(entry_id)
+        self._count_missing(activity, -1)
+        self._apply(stage, activity, -quantity)
+        self._edited()
+
+    def update_entry(self, entry_id: Hashable, activity: Optional[str] = None,
+                     quantity: Optional[float] = None) -> None:
+        """
+        Change the activity and/or quantity of an entry.
+
+        Args:
+            entry_id: Entry ID
+            activity: New activity name (unchanged if None)
+            quantity: New quantity (unchanged if None)
+
+        Raises:
+            KeyError: If the entry doesn't exist
+        """
+        entry = self._entries[entry_id]
+        stage, old_activity, old_quantity = entry
+        new_activity = old_activity if activity is None else activity
+        new_quantity = old_quantity if quantity is None else float(quantity)
+        if new_activity == old_activity and new_quantity == old_quantity:
+            return
+
+        if new_activity == old_activity:
+            self._apply(stage, old_activity, new_quantity - old_quantity)
+        else:
+            self._count_missing(old_activity, -1)
+            self._count_missing(new_activity, 1)
+            self._apply(stage, old_activity, -old_quantity)
+            self._apply(stage, new_activity, new_quantity)
+        entry[1] = new_activity
+        entry[2] = new_quantity
+        self._edited()
+
+    def set_factor(self, activity: str, values: Union[Dict[str, float], Iterable[float]]) -> None:
+        """
+        Change the factors of an activity for this session.
+
+        Activities without factors can be given some, and entries using them
+        start contributing.
+
+        Args:
+            activity: Activity name
+            values: Impact dictionary or one value per impact category
+        """
+        if isinstance(values, dict):
+            new = np.array([values.get(category, 0.0) for category in self.factors.categories], dtype=np.float64)
+        else:
+            new = np.asarray(list(values), dtype=np.float64)
+        old = self.factor(activity)
+        delta = new if old is None else new - old
+
+        self._overrides[activity] = new
+        self.missing.pop(activity, None)
+        for stage, quantity in self._usage.get(activity, {}).items():
+            change = quantity * delta
+            self._stage_totals[stage] += change
+            self._totals += change
+        self._edited()
+
+    def recompute(self) -> float:
+        """
+        Recompute all results from the entries.
+
+        Returns:
+            Largest absolute change of a total (the drift the recomputation removed)
+        """
+        n_categories = self.factors.n_categories
+        usage: Dict[str, Dict[int, float]] = {}
+        counts: Dict[str, int] = {}
+        for stage, activity, quantity in self._entries.values():
+            stages = usage.setdefault(activity, {})
+            stages[stage] = stages.get(stage, 0.0) + quantity
+            counts[activity] = counts.get(activity, 0) + 1
+
+        # One row per (activity, stage) pair, summed per stage with bincount
+        stage_index = []
+        quantities = []
+        rows = []
+        missing: Dict[str, int] = {}
+        for activity, stages in usage.items():
+            factor = self.factor(activity)
+            if factor is None:
+                missing[activity] = counts[activity]
+                continue
+            for stage, quantity in stages.items():
+                stage_index.append(stage)
+                quantities.append(quantity)
+                rows.append(factor)
+        values = np.array(rows, dtype=np.float64).reshape(-1, n_categories)
+        contributions = np.array(quantities, dtype=np.float64)[:, np.newaxis] * values
+
+        n_stages = len(self.stage_names)
+        stage_totals = np.zeros((n_stages, n_categories), dtype=np.float64)
+        for column in range(n_categories):
+            stage_totals[:, column] = np.bincount(np.array(stage_index, dtype=np.int64),
+                                                  weights=contributions[:, column], minlength=n_stages)
+        totals = contributions.sum(axis=0) if contributions.shape[0] else np.zeros(n_categories)
+
+        drift = float(np.max(np.abs(totals - self._totals))) if n_categories else 0.0
+        self._stage_totals = list(stage_totals)
+        self._totals = totals
+        self._usage = usage
+        self.missing = missing
+        self._edits = 0
+        logger.debug(f"Recomputed {len(self._entries)} entries (drift {drift:g})")
+        return drift
+
+    def _new_id(self) -> int:
+        """Get the next unused integer entry ID."""
+        while self._next_id in self._entries:
+            self._next_id += 1
+        entry_id = self._next_id
+        self._next_id += 1
+        return entry_id
+
+    def _apply(self, stage: int, activity: str, quantity: float) -> None:
+        """Add a quantity of an activity to a stage's usage and results."""
+        stages = self._usage.setdefault(activity, {})
+        stages[stage] = stages.get(stage, 0.0) + quantity
+        factor = self.factor(activity)
+        if factor is not None:
+            change = quantity * factor
+            self._stage_totals[stage] += change
+            self._totals += change
+
+    def _count_missing(self, activity: str, count: int) -> None:
+        """Track entries of activities without factors."""
+        if self.factor(activity) is not None:
+            return
+        count += self.missing.get(activity, 0)
+        if count > 0:
+            self.missing[activity] = count
+        else:
+            self.missing.pop(activity, None)
+
+    def _edited(self) -> None:
+        """Count an edit, recomputing when the interval is reached."""
+        self._edits += 1
+        if self.recompute_interval and self._edits >= self.recompute_interval:
+            self.recompute()
@@ -0,0 +1,113 @@
+"""
+Schema and data migrations for the LCA module.
+"""
+from typing import Dict, Any
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from core.utils.logger import get_logger
+from models import ImpactFactor, LifeCycleStage, StageActivity, ProcessExchange
+from config.module_config.lca_config import DEFAULT_IMPACT_FACTORS
+
+# Set up logger
+logger = get_logger(__name__)
+
+def upgrade_schema(db: Session) -> None:
+    """
+    Bring an existing database up to date with the LCA models.
+
+    Creates missing LCA tables and adds columns that were introduced after
+    the tables were first created (SQLite only supports adding columns).
+
+    Args:
+        db: Database session
+    """
+    bind = db.get_bind()
+    for table in (ImpactFactor.__table__, LifeCycleStage.__table__, StageActivity.__table__,
+                  ProcessExchange.__table__):
+        table.create(bind=bind, checkfirst=True)
+
+    existing = {column["name"] for column in inspect(bind).get_columns(ImpactFactor.__tablename__)}
+    for column in ImpactFactor.__table__.columns:
+        if column.name not in existing:
+            column_type = column.type.compile(dialect=bind.dialect)
+            db.execute(text(f"ALTER TABLE {ImpactFactor.__tablename__} "
+                            f"ADD COLUMN {column.name} {column_type}"))
+            logger.info(f"Added column {ImpactFactor.__tablename__}.{column.name}")
+    db.commit()
+
+def get_factor_ids(db: Session, create_defaults: bool = True) -> Dict[str, int]:
+    """
+    Get the ImpactFactor ID of every activity.
+
+    Args:
+        db: Database session
+        create_defaults: Whether to insert DEFAULT_IMPACT_FACTORS activities
+            that have no ImpactFactor row yet
+
+    Returns:
+        Dictionary mapping activity names to ImpactFactor IDs
+    """
+    factor_ids = dict(db.query(ImpactFactor.activity, ImpactFactor.id).all())
+
+    if create_defaults:
+        missing = [activity for activity in DEFAULT_IMPACT_FACTORS if activity not in factor_ids]
+        if missing:
+            new_factors = [
+                ImpactFactor(activity=activity, co2=DEFAULT_IMPACT_FACTORS[activity][0],
+                             water=DEFAULT_IMPACT_FACTORS[activity][1],
+                             energy=DEFAULT_IMPACT_FACTORS[activity][2])
+                for activity in missing
+            ]
+            db.add_all(new_factors)
+            db.flush()
+            factor_ids.update({factor.activity: factor.id for factor in new_factors})
+
+    return factor_ids
+
+def migrate_stage_activities(db: Session, batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Move stage activities from the legacy JSON column to lca_stage_activities.
+
+    Activities without an ImpactFactor row (and not in DEFAULT_IMPACT_FACTORS)
+    stay in the JSON column; their stages are reported as skipped. The other
+    activities of those stages are still migrated.
+    The migration commits after every batch and can be re-run safely.
+
+    Args:
+        db: Database session
+        batch_size: Number of stages migrated per commit
+
+    Returns:
+        Dictionary with the number of 'migrated' and 'skipped' stages
+    """
+    upgrade_schema(db)
+    factor_ids = get_factor_ids(db)
+
+    migrated = 0
+    skipped = 0
+    last_id = 0
+    while True:
+        stages = (
+            db.query(LifeCycleStage)
+            .filter(LifeCycleStage.id > last_id)
+            .filter(LifeCycleStage.activities.isnot(None))
+            .order_by(LifeCycleStage.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not stages:
+            break
+
+        for stage in stages:
+            if stage.normalize_activities(factor_ids):
+                migrated += 1
+            else:
+                skipped += 1
+                logger.warning(f"Stage {stage.id} references unknown activities; kept them as JSON")
+        last_id = stages[-1].id
+        db.commit()
+
+    logger.info(f"Migrated {migrated} stages to lca_stage_activities ({skipped} skipped)")
+    return {"migrated": migrated, "skipped": skipped}
@@ -4,7 +4,7 @@ Data models for the LCA module.
 from typing import Dict, List, Optional, Any
 import json
 
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from core.data.database import Base
@@ -19,9 +19,28 @@ class ImpactFactor(Base):
     water = Column(Float, nullable=False)  # Water usage in L
     energy = Column(Float, nullable=False)  # Energy use in kWh
     
+    # Uncertainty of the factor values, applied to all impact categories.
+    # The stored values are the distribution medians (lognormal) or modes (triangular).
+    uncertainty_type = Column(String)  # "lognormal", "triangular" or None for no uncertainty
+    uncertainty_sigma = Column(Float)  # Lognormal: standard deviation of ln(value)
+    uncertainty_min = Column(Float)  # Triangular: lower bound as a multiple of the value
+    uncertainty_max = Column(Float)  # Triangular: upper bound as a multiple of the value
+    
     def __repr__(self) -> str:
         return f"<ImpactFactor {self.activity}>"
     
+    @property
+    def uncertainty(self) -> Optional[Dict[str, Any]]:
+        """Return the uncertainty distribution as a dictionary, or None if there is none."""
+        if not self.uncertainty_type:
+            return None
+        return {
+            "uncertainty_type": self.uncertainty_type,
+            "uncertainty_sigma": self.uncertainty_sigma,
+            "uncertainty_min": self.uncertainty_min,
+            "uncertainty_max": self.uncertainty_max
+        }
+    
     @property
     def as_dict(self) -> Dict[str, Any]:
         """Return the impact factor as a dictionary."""
@@ -39,11 +58,18 @@ class LifeCycleStage(Base):
     
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
-    activities = Column(String)  # JSON string of activities and quantities
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    activities = Column(String)  # Legacy JSON string of activities and quantities
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
     
     # Relationships
     project = relationship("Project")
+    stage_activities = relationship(
+        "StageActivity",
+        back_populates="stage",
+        order_by="StageActivity.id",
+        cascade="all, delete-orphan",
+        lazy="selectin"
+    )
     
     def __repr__(self) -> str:
         return f"<LifeCycleStage {self.name}>"
@@ -53,22 +79,68 @@ class LifeCycleStage(Base):
         """
         Get the activities as a list of dictionaries.
         
+        Normalized StageActivity rows come first, followed by any activities
+        still stored in the legacy JSON column.
+        
         Returns:
             List of dictionaries with keys 'activity' and 'quantity'
         """
+        activities = [
+            {"activity": stage_activity.impact_factor.activity, "quantity": stage_activity.quantity}
+            for stage_activity in self.stage_activities
+        ]
         if self.activities:
-            return json.loads(self.activities)
-        return []
+            activities.extend(json.loads(self.activities))
+        return activities
     
     @activities_list.setter
     def activities_list(self, activities: List[Dict[str, Any]]) -> None:
         """
         Set the activities from a list of dictionaries.
         
+        The activities are stored in the JSON column and any normalized rows
+        are removed; call normalize_activities to move them to StageActivity rows.
+        
         Args:
             activities: List of dictionaries with keys 'activity' and 'quantity'
         """
         self.activities = json.dumps(activities)
+        self.stage_activities = []
+    
+    def normalize_activities(self, factor_ids: Dict[str, int]) -> bool:
+        """
+        Move the activities from the JSON column to StageActivity rows.
+        
+        Activities without an ImpactFactor row stay in the JSON column, so
+        the known activities of a stage are still included in SQL rollups.
+        
+        Args:
+            factor_ids: Dictionary mapping activity names to ImpactFactor IDs
+            
+        Returns:
+            True if all activities were normalized, False if some activity has
+            no ImpactFactor row
+        """
+        if not self.activities:
+            return True
+        
+        known = []
+        unknown = []
+        for activity_data in json.loads(self.activities):
+            if activity_data.get("activity") in factor_ids:
+                known.append(activity_data)
+            else:
+                unknown.append(activity_data)
+        
+        self.stage_activities.extend(
+            StageActivity(
+                activity_id=factor_ids[activity_data["activity"]],
+                quantity=float(activity_data.get("quantity", 1.0))
+            )
+            for activity_data in known
+        )
+        self.activities = json.dumps(unknown) if unknown else None
+        return not unknown
     
     @property
     def as_dict(self) -> Dict[str, Any]:
@@ -78,4 +150,49 @@ class LifeCycleStage(Base):
             "name": self.name,
             "activities": self.activities_list,
             "project_id": self.project_id
-        }
\ No newline at end of file
+        }
+
+class StageActivity(Base):
+    """An activity and its quantity within a life cycle stage."""
+    __tablename__ = "lca_stage_activities"
+    __table_args__ = (
+        Index("ix_lca_stage_activities_stage_activity", "stage_id", "activity_id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    stage_id = Column(Integer, ForeignKey("lca_stages.id", ondelete="CASCADE"), nullable=False)
+    activity_id = Column(Integer, ForeignKey("lca_impact_factors.id"), nullable=False, index=True)
+    quantity = Column(Float, nullable=False, default=1.0)
+    
+    # Relationships
+    stage = relationship("LifeCycleStage", back_populates="stage_activities")
+    impact_factor = relationship("ImpactFactor", lazy="joined")
+    
+    def __repr__(self) -> str:
+        return f"<StageActivity {self.stage_id} {self.activity_id} {self.quantity}>"
+
+class ProcessExchange(Base):
+    """
+    A technosphere exchange: the amount of one activity's product consumed
+    per unit output of another activity.
+    
+    The impact factor values of an activity are its direct emissions; with
+    exchanges, activities form a linked process network (see technosphere.py).
+    """
+    __tablename__ = "lca_process_exchanges"
+    __table_args__ = (
+        Index("ix_lca_process_exchanges_process_input", "process_id", "input_id", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    process_id = Column(Integer, ForeignKey("lca_impact_factors.id", ondelete="CASCADE"), nullable=False)
+    input_id = Column(Integer, ForeignKey("lca_impact_factors.id", ondelete="CASCADE"), nullable=False,
+                      index=True)
+    amount = Column(Float, nullable=False)  # Input units per unit of process output
+    
+    # Relationships
+    process = relationship("ImpactFactor", foreign_keys=[process_id])
+    input = relationship("ImpactFactor", foreign_keys=[input_id])
+    
+    def __repr__(self) -> str:
+        return f"<ProcessExchange {self.process_id} <- {self.amount} x {self.input_id}>"
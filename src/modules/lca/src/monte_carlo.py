@@ -0,0 +1,258 @@
+"""
+Monte Carlo uncertainty propagation for the LCA module.
+
+Factor multipliers are sampled in vectorized blocks for the activities an
+inventory actually uses, and each block is reduced to total impacts with a
+single (block_size, k) x (k, n_impact_categories) product. Blocks are
+written into one preallocated sample array. Percentile estimates are checked
+whenever the sample count has doubled since the last check, and sampling
+stops early once their confidence intervals are narrow enough.
+
+Block i is always sampled from the i-th child of the run's SeedSequence and
+blocks are consumed in order, so a given seed produces the same result
+whatever the number of worker processes.
+"""
+from typing import Dict, Any, Optional, Tuple, Callable
+import concurrent.futures
+from collections import deque
+from statistics import NormalDist
+
+import numpy as np
+
+from core.utils.logger import get_logger
+from engine import (
+    FactorMatrix, EncodedInventory, UncertaintySpec, IMPACT_CATEGORIES,
+    UNCERTAINTY_LOGNORMAL, UNCERTAINTY_TRIANGULAR
+)
+
+# Set up logger
+logger = get_logger(__name__)
+
+# Percentiles reported for every impact category
+PERCENTILES = (5.0, 50.0, 95.0)
+
+def sample_multipliers(rng: np.random.Generator, spec: UncertaintySpec,
+                       n_samples: int) -> np.ndarray:
+    """
+    Sample factor multipliers for a block of Monte Carlo iterations.
+
+    Args:
+        rng: Random number generator
+        spec: Uncertainty distributions of the sampled activities
+        n_samples: Number of samples (rows) to draw
+
+    Returns:
+        Array of shape (n_samples, n_activities); activities without a
+        distribution get a multiplier of 1
+    """
+    multipliers = np.ones((n_samples, spec.kind.shape[0]), dtype=np.float64)
+
+    lognormal = np.flatnonzero(spec.kind == UNCERTAINTY_LOGNORMAL)
+    if lognormal.size:
+        # The stored factor is the median, so ln(multiplier) ~ N(0, sigma)
+        multipliers[:, lognormal] = np.exp(
+            rng.standard_normal((n_samples, lognormal.size)) * spec.sigma[lognormal]
+        )
+
+    triangular = np.flatnonzero(spec.kind == UNCERTAINTY_TRIANGULAR)
+    if triangular.size:
+        u = rng.random((n_samples, triangular.size))
+        multipliers[:, triangular] = triangular_ppf(u, spec.low[triangular], spec.high[triangular])
+
+    return multipliers
+
+def triangular_ppf(u: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """
+    Inverse CDF of triangular distributions with mode 1.
+
+    Args:
+        u: Uniform samples in [0, 1), shape (n_samples, n_activities)
+        low: Lower bound per activity
+        high: Upper bound per activity
+
+    Returns:
+        Multipliers with the same shape as u
+    """
+    width = np.where(high > low, high - low, 1.0)
+    split = (1.0 - low) / width
+    lower = low + np.sqrt(u * width * (1.0 - low))
+    upper = high - np.sqrt((1.0 - u) * width * (high - 1.0))
+    return np.where(u < split, lower, upper)
+
+def _sample_block(seed: np.random.SeedSequence, n_samples: int, quantities: np.ndarray,
+                  factor_rows: np.ndarray, spec: UncertaintySpec) -> np.ndarray:
+    """Sample one block and reduce it to total impacts per sample."""
+    rng = np.random.default_rng(seed)
+    multipliers = sample_multipliers(rng, spec, n_samples)
+    multipliers *= quantities
+    return multipliers @ factor_rows
+
+def percentile_intervals(samples: np.ndarray, confidence: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Estimate percentiles and their distribution-free confidence intervals.
+
+    The interval for percentile p uses the order statistics at ranks
+    n*p -/+ z*sqrt(n*p*(1-p)) (1-based).
+
+    Args:
+        samples: Array of shape (n_samples, n_impact_categories)
+        confidence: Confidence level of the intervals (e.g. 0.95)
+
+    Returns:
+        Tuple of (estimates, lower bounds, upper bounds), each of shape
+        (len(PERCENTILES), n_impact_categories)
+    """
+    n = samples.shape[0]
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+    fractions = np.array(PERCENTILES) / 100.0
+    spread = z * np.sqrt(n * fractions * (1.0 - fractions))
+    lower_ranks = np.clip(np.floor(n * fractions - spread) - 1, 0, n - 1).astype(np.int64)
+    upper_ranks = np.clip(np.ceil(n * fractions + spread) - 1, 0, n - 1).astype(np.int64)
+
+    ranks = np.unique(np.concatenate([lower_ranks, upper_ranks]))
+    ordered = np.partition(samples, ranks, axis=0)
+    estimates = np.percentile(samples, PERCENTILES, axis=0)
+    return estimates, ordered[lower_ranks], ordered[upper_ranks]
+
+class MonteCarloResult:
+    """Summary statistics of a Monte Carlo run."""
+
+    def __init__(self, samples: np.ndarray, converged: bool, confidence: float,
+                 uncertain_factors: int = 0) -> None:
+        """
+        Initialize the result.
+
+        Args:
+            samples: Total impacts per sample, shape (n_samples, n_impact_categories)
+            converged: Whether the percentile intervals met the tolerance
+            confidence: Confidence level used for the percentile intervals
+            uncertain_factors: Number of sampled factors with a non-zero spread
+        """
+        self.samples = samples
+        self.converged = converged
+        self.uncertain_factors = uncertain_factors
+        self.percentiles, self.lower, self.upper = percentile_intervals(samples, confidence)
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples drawn."""
+        return self.samples.shape[0]
+
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the summary as a dictionary keyed by impact category."""
+        result: Dict[str, Any] = {"samples": self.n_samples, "converged": self.converged,
+                                  "uncertain_factors": self.uncertain_factors}
+        mean = self.samples.mean(axis=0)
+        std = self.samples.std(axis=0, ddof=1) if self.n_samples > 1 else np.zeros_like(mean)
+        for column, category in enumerate(IMPACT_CATEGORIES):
+            summary = {"mean": float(mean[column]), "std": float(std[column])}
+            for row, percentile in enumerate(PERCENTILES):
+                summary[f"p{percentile:g}"] = float(self.percentiles[row, column])
+            result[category] = summary
+        return result
+
+def _relative_interval_width(samples: np.ndarray, confidence: float) -> float:
+    """Largest percentile interval half-width relative to the median."""
+    estimates, lower, upper = percentile_intervals(samples, confidence)
+    median = np.abs(estimates[PERCENTILES.index(50.0)])
+    scale = np.where(median > 0, median, 1.0)
+    return float(np.max((upper - lower) / (2.0 * scale)))
+
+def run_monte_carlo(inventory: EncodedInventory, factors: FactorMatrix, spec: UncertaintySpec,
+                    max_samples: int, block_size: int, min_samples: int = 0,
+                    tolerance: float = 0.0, confidence: float = 0.95, seed: Optional[int] = None,
+                    max_workers: Optional[int] = None,
+                    progress: Optional[Callable[[int, int], None]] = None) -> MonteCarloResult:
+    """
+    Propagate factor uncertainty through an inventory.
+
+    Args:
+        inventory: Encoded inventory
+        factors: Factor matrix the inventory was encoded against
+        spec: Uncertainty distributions for every factor matrix row
+        max_samples: Maximum number of samples
+        block_size: Number of samples drawn per block
+        min_samples: Minimum number of samples before early stopping is considered
+        tolerance: Relative percentile interval half-width at which sampling stops
+            (0 disables early stopping)
+        confidence: Confidence level of the percentile intervals
+        seed: Optional seed for reproducible results
+        max_workers: Optional number of worker processes for sampling blocks
+        progress: Optional callback called with the number of samples drawn and
+            max_samples after every block; an exception raised by it (e.g. on
+            cancellation) stops the run
+
+    Returns:
+        The Monte Carlo result
+
+    Raises:
+        ValueError: If max_samples or block_size is not positive
+    """
+    if max_samples < 1 or block_size < 1:
+        raise ValueError("max_samples and block_size must be positive")
+
+    # Only sample the factors the inventory actually uses
+    rows, positions = np.unique(inventory.activity_index, return_inverse=True)
+    quantities = np.bincount(positions, weights=inventory.quantity, minlength=rows.shape[0])
+    factor_rows = factors.values[rows]
+    block_spec = spec.take(rows)
+    uncertain_factors = int(block_spec.uncertain.sum())
+    if uncertain_factors == 0:
+        logger.warning("None of the inventory's factors has an uncertainty distribution")
+
+    root = np.random.SeedSequence(seed)
+    n_blocks = -(-max_samples // block_size)
+    block_sizes = [min(block_size, max_samples - i * block_size) for i in range(n_blocks)]
+    seeds = root.spawn(n_blocks)
+
+    samples = np.empty((max_samples, factors.n_categories), dtype=np.float64)
+    n_done = 0
+    next_check = max(min_samples, 2)
+    converged = False
+
+    def add_block(block: np.ndarray) -> bool:
+        """Store a block and check whether the percentiles have converged."""
+        nonlocal n_done, next_check
+        samples[n_done:n_done + block.shape[0]] = block
+        n_done += block.shape[0]
+        if progress is not None:
+            progress(n_done, max_samples)
+        if tolerance <= 0 or n_done < next_check:
+            return False
+        # Checking on a doubling schedule keeps the percentile passes linear in the samples drawn
+        next_check = 2 * n_done
+        return _relative_interval_width(samples[:n_done], confidence) <= tolerance
+
+    if not max_workers or max_workers <= 1:
+        for block_seed, n_samples in zip(seeds, block_sizes):
+            if add_block(_sample_block(block_seed, n_samples, quantities, factor_rows, block_spec)):
+                converged = True
+                break
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            next_block = 0
+            while next_block < n_blocks or pending:
+                # Keep two blocks per worker in flight, consuming results in block order
+                while next_block < n_blocks and len(pending) < 2 * max_workers:
+                    pending.append(executor.submit(_sample_block, seeds[next_block],
+                                                   block_sizes[next_block], quantities,
+                                                   factor_rows, block_spec))
+                    next_block += 1
+                try:
+                    block_converged = add_block(pending.popleft().result())
+                except BaseException:
+                    for future in pending:
+                        future.cancel()
+                    raise
+                if block_converged:
+                    converged = True
+                    for future in pending:
+                        future.cancel()
+                    break
+
+    samples = samples[:n_done]
+    logger.info(f"Monte Carlo finished after {samples.shape[0]} samples over {uncertain_factors} "
+                f"uncertain factors (converged: {converged})")
+    return MonteCarloResult(samples, converged, confidence, uncertain_factors)
@@ -0,0 +1,103 @@
+"""
+SQL-side impact queries for the LCA module.
+
+These queries aggregate normalized stage activities (lca_stage_activities)
+against lca_impact_factors inside the database, so impacts can be summed
+without loading stages into Python.
+"""
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import ImpactFactor, LifeCycleStage, StageActivity
+from engine import IMPACT_CATEGORIES
+
+def stage_impact_totals(db: Session, stage_ids: Optional[List[int]] = None) -> Dict[int, Dict[str, float]]:
+    """
+    Sum the impacts of stages with a single SUM(quantity * factor) GROUP BY stage query.
+
+    Only normalized activities are included; activities still stored as
+    JSON must be migrated first (see migrations). Activities without an
+    ImpactFactor row stay in JSON and have no impacts to add.
+
+    Args:
+        db: Database session
+        stage_ids: Optional list of stage IDs to restrict the query to
+
+    Returns:
+        Dictionary mapping stage IDs to impact dictionaries (co2, water, energy)
+    """
+    query = (
+        select(
+            StageActivity.stage_id,
+            func.sum(StageActivity.quantity * ImpactFactor.co2).label("co2"),
+            func.sum(StageActivity.quantity * ImpactFactor.water).label("water"),
+            func.sum(StageActivity.quantity * ImpactFactor.energy).label("energy")
+        )
+        .join(ImpactFactor, StageActivity.activity_id == ImpactFactor.id)
+        .group_by(StageActivity.stage_id)
+    )
+    if stage_ids is not None:
+        query = query.where(StageActivity.stage_id.in_(stage_ids))
+
+    return {
+        row.stage_id: {"co2": row.co2, "water": row.water, "energy": row.energy}
+        for row in db.execute(query)
+    }
+
+def impact_rollup(db: Session, project_ids: Optional[List[int]] = None, by_stage: bool = False,
+                  as_frame: bool = False) -> Union[Dict[str, np.ndarray], pd.DataFrame]:
+    """
+    Roll up impacts per project (and optionally per stage) inside the database.
+
+    The query joins lca_stages, lca_stage_activities and lca_impact_factors
+    and groups by project (and stage), so no ORM objects are created. Stages
+    without a project and activities still stored as JSON (unmigrated ones and
+    those without an ImpactFactor row) are not included.
+
+    Args:
+        db: Database session
+        project_ids: Optional list of project IDs to restrict the rollup to
+        by_stage: Whether to group by stage as well as by project
+        as_frame: Whether to return a pandas DataFrame instead of a dictionary of arrays
+
+    Returns:
+        Columnar result with 'project_id' (and 'stage_id' if by_stage) integer
+        columns and one float column per impact category (co2, water, energy),
+        ordered by project (and stage)
+    """
+    key_columns = [LifeCycleStage.project_id]
+    if by_stage:
+        key_columns.append(LifeCycleStage.id)
+
+    query = (
+        select(
+            *key_columns,
+            *[func.sum(StageActivity.quantity * getattr(ImpactFactor, category)).label(category)
+              for category in IMPACT_CATEGORIES]
+        )
+        .select_from(LifeCycleStage)
+        .join(StageActivity, StageActivity.stage_id == LifeCycleStage.id)
+        .join(ImpactFactor, StageActivity.activity_id == ImpactFactor.id)
+        .where(LifeCycleStage.project_id.isnot(None))
+        .group_by(*key_columns)
+        .order_by(*key_columns)
+    )
+    if project_ids is not None:
+        query = query.where(LifeCycleStage.project_id.in_(project_ids))
+
+    rows = [tuple(row) for row in db.execute(query)]
+    n_keys = len(key_columns)
+    key_names = ["project_id", "stage_id"][:n_keys]
+
+    values = np.array(rows, dtype=np.float64).reshape(len(rows), n_keys + len(IMPACT_CATEGORIES))
+    result = {name: values[:, i].astype(np.int64) for i, name in enumerate(key_names)}
+    for i, category in enumerate(IMPACT_CATEGORIES):
+        result[category] = values[:, n_keys + i]
+
+    if as_frame:
+        return pd.DataFrame(result)
+    return result
@@ -0,0 +1,408 @@
+"""
+Global sensitivity analysis for the LCA module.
+
+The parameters are a quantity multiplier for every activity an inventory
+uses and a factor multiplier for every activity whose factor has an
+uncertainty distribution. Saltelli sample matrices A, B and AB_i (A with
+column i taken from B) are built from a scrambled Sobol sequence and
+turned into multipliers with inverse CDFs. A and B are evaluated with one
+product against the factor rows each. Impacts are linear in every
+multiplier, so AB_i only differs from A by a rank-one term:
+
+    f(AB_i) = f(A) + (b_i - a_i) * quantity * other multiplier * factor row
+
+where the other multiplier is A's multiplier of the activity's other
+parameter (its factor for a quantity parameter and vice versa). Evaluating
+every AB_i therefore costs O(n * d * n_impact_categories) without building
+the matrices.
+
+First-order indices use the Saltelli (2010) estimator and total indices
+the Jansen estimator. Confidence intervals come from a bootstrap over the
+sample rows, computed as one product of resampling counts with the
+per-row estimator terms. Sampling doubles the Sobol points until every
+interval is narrow enough or max_samples is reached.
+
+Because impacts are linear in each multiplier, one-at-a-time sensitivities
+(the relative impact change for a relative input change) are exact in
+closed form and computed by local_sensitivities().
+"""
+from typing import Dict, Any, List, Optional, Callable, Tuple
+import concurrent.futures
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+from core.utils.logger import get_logger
+from engine import (
+    FactorMatrix, EncodedInventory, UncertaintySpec, IMPACT_CATEGORIES,
+    UNCERTAINTY_LOGNORMAL, UNCERTAINTY_TRIANGULAR
+)
+from monte_carlo import triangular_ppf
+
+# Set up logger
+logger = get_logger(__name__)
+
+# Parameter kinds
+QUANTITY = "quantity"
+FACTOR = "factor"
+
+class SensitivityProblem:
+    """The parameters of an inventory and how to evaluate samples of them."""
+
+    def __init__(self, inventory: EncodedInventory, factors: FactorMatrix, spec: UncertaintySpec,
+                 quantity_range: float = 0.1) -> None:
+        """
+        Set up the parameters.
+
+        Args:
+            inventory: Encoded inventory
+            factors: Factor matrix the inventory was encoded against
+            spec: Uncertainty distributions for every factor matrix row
+            quantity_range: Quantities vary uniformly by this relative amount
+                (0 leaves them fixed)
+        """
+        # Only the factors the inventory actually uses
+        rows, positions = np.unique(inventory.activity_index, return_inverse=True)
+        self.activities = [factors.activities[row] for row in rows]
+        self.quantities = np.bincount(positions, weights=inventory.quantity, minlength=rows.shape[0])
+        self.factor_rows = np.ascontiguousarray(factors.values[rows])
+        self.spec = spec.take(rows)
+        self.quantity_range = quantity_range
+
+        n_used = rows.shape[0]
+        quantity_positions = np.arange(n_used) if quantity_range > 0 else np.empty(0, dtype=np.int64)
+        factor_positions = np.flatnonzero(self.spec.uncertain)
+
+        # Parameter i scales activity position[i]'s quantity or factor
+        self.position = np.concatenate([quantity_positions, factor_positions]).astype(np.int64)
+        self.is_factor = np.concatenate([np.zeros(quantity_positions.shape[0], dtype=bool),
+                                         np.ones(factor_positions.shape[0], dtype=bool)])
+
+    @property
+    def n_parameters(self) -> int:
+        """Number of parameters."""
+        return self.position.shape[0]
+
+    @property
+    def parameters(self) -> List[Dict[str, str]]:
+        """Parameter descriptions, with keys 'activity' and 'parameter'."""
+        return [
+            {"activity": self.activities[position], "parameter": FACTOR if is_factor else QUANTITY}
+            for position, is_factor in zip(self.position, self.is_factor)
+        ]
+
+    def multipliers(self, u: np.ndarray) -> np.ndarray:
+        """
+        Turn uniform samples into parameter multipliers.
+
+        Args:
+            u: Uniform samples in [0, 1), shape (n_samples, n_parameters)
+
+        Returns:
+            Multipliers with the same shape
+        """
+        x = np.empty_like(u)
+        quantity = ~self.is_factor
+        x[:, quantity] = 1.0 + self.quantity_range * (2.0 * u[:, quantity] - 1.0)
+
+        factor_params = np.flatnonzero(self.is_factor)
+        positions = self.position[factor_params]
+        kind = self.spec.kind[positions]
+        lognormal = factor_params[kind == UNCERTAINTY_LOGNORMAL]
+        if lognormal.size:
+            # Keep u away from 0 so the normal quantile stays finite
+            sigma = self.spec.sigma[self.position[lognormal]]
+            x[:, lognormal] = np.exp(sigma * ndtri(np.clip(u[:, lognormal], 1e-12, 1 - 1e-12)))
+        triangular = factor_params[kind == UNCERTAINTY_TRIANGULAR]
+        if triangular.size:
+            triangular_positions = self.position[triangular]
+            x[:, triangular] = triangular_ppf(u[:, triangular], self.spec.low[triangular_positions],
+                                              self.spec.high[triangular_positions])
+        return x
+
+def _evaluate(x: np.ndarray, quantities: np.ndarray, factor_rows: np.ndarray,
+              position: np.ndarray, is_factor: np.ndarray) -> np.ndarray:
+    """
+    Evaluate stacked multiplier matrices with one matrix product.
+
+    Args:
+        x: Multipliers, shape (..., n_samples, n_parameters)
+        quantities: Base quantity per activity
+        factor_rows: Factor rows per activity
+        position: Activity position of each parameter
+        is_factor: Whether each parameter scales a factor (else a quantity)
+
+    Returns:
+        Impacts, shape (..., n_samples, n_impact_categories)
+    """
+    shape = x.shape[:-1]
+    x = x.reshape(-1, x.shape[-1])
+    weights = np.broadcast_to(quantities, (x.shape[0], quantities.shape[0])).copy()
+    # Each activity has at most one quantity and one factor parameter
+    for mask in (~is_factor, is_factor):
+        weights[:, position[mask]] *= x[:, mask]
+    return (weights @ factor_rows).reshape(*shape, factor_rows.shape[1])
+
+def _other_multipliers(x: np.ndarray, position: np.ndarray, is_factor: np.ndarray,
+                       n_activities: int) -> np.ndarray:
+    """
+    Get the multiplier of the other parameter on each parameter's activity.
+
+    Args:
+        x: Multipliers, shape (n_samples, n_parameters)
+        position: Activity position of each parameter
+        is_factor: Whether each parameter scales a factor (else a quantity)
+        n_activities: Number of activities
+
+    Returns:
+        For a quantity parameter the activity's factor multiplier and vice
+        versa (1 if the activity has no such parameter), same shape as x
+    """
+    quantity = np.ones((x.shape[0], n_activities))
+    factor = np.ones((x.shape[0], n_activities))
+    # Each activity has at most one quantity and one factor parameter
+    quantity[:, position[~is_factor]] = x[:, ~is_factor]
+    factor[:, position[is_factor]] = x[:, is_factor]
+    return np.where(is_factor, quantity[:, position], factor[:, position])
+
+def _evaluate_mixed(f_a: np.ndarray, scale: np.ndarray, factor_rows: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the AB_i matrices of a chunk of parameters (a worker task).
+
+    Args:
+        f_a: Outputs for A, shape (n_samples, n_categories)
+        scale: (b_i - a_i) * quantity * other multiplier of each parameter,
+            shape (n_samples, k)
+        factor_rows: Factor row of each parameter's activity, shape (k, n_categories)
+
+    Returns:
+        Outputs for every AB_i, shape (k, n_samples, n_categories)
+    """
+    return f_a[np.newaxis] + scale.T[:, :, np.newaxis] * factor_rows[:, np.newaxis, :]
+
+def sobol_indices(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Estimate first-order and total Sobol indices.
+
+    Args:
+        f_a: Outputs for A, shape (n_samples, n_categories)
+        f_b: Outputs for B, same shape
+        f_ab: Outputs for every AB_i, shape (n_parameters, n_samples, n_categories)
+
+    Returns:
+        Tuple of (first_order, total) arrays, shape (n_parameters, n_categories);
+        categories without variance get indices of 0
+    """
+    variance = np.var(np.concatenate([f_a, f_b]), axis=0)
+    scale = np.where(variance > 0, variance, np.inf)
+    first_order = np.mean(f_b * (f_ab - f_a), axis=1) / scale
+    total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / scale
+    return first_order, total
+
+def bootstrap_intervals(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray, n_bootstrap: int,
+                        confidence: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap confidence intervals of the Sobol indices.
+
+    Resampling is expressed as counts per sample row, so every resample's
+    estimator means are one product of the count matrix with the per-row terms.
+
+    Args:
+        f_a: Outputs for A, shape (n_samples, n_categories)
+        f_b: Outputs for B, same shape
+        f_ab: Outputs for every AB_i, shape (n_parameters, n_samples, n_categories)
+        n_bootstrap: Number of resamples
+        confidence: Confidence level
+        rng: Random number generator
+
+    Returns:
+        Tuple of (first_order, total) interval arrays, shape (2, n_parameters, n_categories)
+    """
+    n_parameters, n_samples, n_categories = f_ab.shape
+    counts = rng.multinomial(n_samples, np.full(n_samples, 1.0 / n_samples), size=n_bootstrap)
+    counts = counts.astype(np.float64) / n_samples
+
+    # Per-row terms, with rows first so they can be multiplied by the counts
+    first_terms = (f_b * (f_ab - f_a)).transpose(1, 0, 2).reshape(n_samples, -1)
+    total_terms = (0.5 * (f_a - f_ab) ** 2).transpose(1, 0, 2).reshape(n_samples, -1)
+    first = (counts @ first_terms).reshape(n_bootstrap, n_parameters, n_categories)
+    total = (counts @ total_terms).reshape(n_bootstrap, n_parameters, n_categories)
+
+    # Variance of the resampled A and B rows
+    mean = 0.5 * (counts @ f_a + counts @ f_b)
+    mean_square = 0.5 * (counts @ f_a ** 2 + counts @ f_b ** 2)
+    variance = mean_square - mean ** 2
+    scale = np.where(variance > 0, variance, np.inf)[:, np.newaxis, :]
+
+    tail = 100.0 * (1.0 - confidence) / 2.0
+    return (np.percentile(first / scale, [tail, 100.0 - tail], axis=0),
+            np.percentile(total / scale, [tail, 100.0 - tail], axis=0))
+
+class SensitivityResult:
+    """Sobol indices, their confidence intervals and convergence diagnostics."""
+
+    def __init__(self, problem: SensitivityProblem, n_samples: int, first_order: np.ndarray,
+                 total: np.ndarray, first_order_ci: np.ndarray, total_ci: np.ndarray,
+                 converged: bool, history: List[Dict[str, Any]]) -> None:
+        """
+        Initialize the result.
+
+        Args:
+            problem: The analysed problem
+            n_samples: Sobol points used (rows of A)
+            first_order: First-order indices, shape (n_parameters, n_categories)
+            total: Total indices, same shape
+            first_order_ci: First-order intervals, shape (2, n_parameters, n_categories)
+            total_ci: Total intervals, same shape
+            converged: Whether every interval met the tolerance
+            history: Per-round diagnostics (samples and largest interval half-width)
+        """
+        self.problem = problem
+        self.n_samples = n_samples
+        self.first_order = first_order
+        self.total = total
+        self.first_order_ci = first_order_ci
+        self.total_ci = total_ci
+        self.converged = converged
+        self.history = history
+
+    @property
+    def n_evaluations(self) -> int:
+        """Number of model evaluations (rows of A, B and every AB_i)."""
+        return self.n_samples * (self.problem.n_parameters + 2)
+
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the result as a dictionary keyed by impact category."""
+        result: Dict[str, Any] = {
+            "samples": self.n_samples,
+            "evaluations": self.n_evaluations,
+            "converged": self.converged,
+            "history": self.history,
+            "parameters": self.problem.parameters
+        }
+        for column, category in enumerate(IMPACT_CATEGORIES):
+            result[category] = {
+                "first_order": self.first_order[:, column].tolist(),
+                "total": self.total[:, column].tolist(),
+                "first_order_ci": self.first_order_ci[:, :, column].T.tolist(),
+                "total_ci": self.total_ci[:, :, column].T.tolist()
+            }
+        return result
+
+def run_sobol(problem: SensitivityProblem, base_samples: int = 1024, max_samples: Optional[int] = None,
+              n_bootstrap: int = 200, confidence: float = 0.95, tolerance: float = 0.0,
+              chunk_size: int = 32, seed: Optional[int] = None, max_workers: Optional[int] = None,
+              progress: Optional[Callable[[int, int], None]] = None) -> SensitivityResult:
+    """
+    Estimate Sobol indices with Saltelli sampling.
+
+    Args:
+        problem: Parameters to analyse
+        base_samples: Initial Sobol points (rounded up to a power of two)
+        max_samples: Maximum Sobol points (defaults to base_samples)
+        n_bootstrap: Bootstrap resamples for the confidence intervals
+        confidence: Confidence level of the intervals
+        tolerance: Largest acceptable interval half-width; sampling doubles
+            until every interval is within it (0 stops after base_samples)
+        chunk_size: Parameters whose AB_i matrices are evaluated per task
+        seed: Optional seed for reproducible results
+        max_workers: Optional number of worker processes for evaluating chunks
+        progress: Optional callback called with the points drawn and
+            max_samples after every round; an exception raised by it stops the run
+
+    Returns:
+        The sensitivity result
+
+    Raises:
+        ValueError: If the problem has no parameters
+    """
+    d = problem.n_parameters
+    if d == 0:
+        raise ValueError("The inventory has no uncertain parameters")
+    n = 1 << max(int(np.ceil(np.log2(max(base_samples, 2)))), 1)
+    max_samples = max(max_samples or n, n)
+
+    sampler = qmc.Sobol(d=2 * d, scramble=True, seed=np.random.default_rng(seed))
+    bootstrap_rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
+    args = (problem.quantities, problem.factor_rows, problem.position, problem.is_factor)
+    chunks = [slice(start, min(start + chunk_size, d)) for start in range(0, d, chunk_size)]
+    parameter_quantities = problem.quantities[problem.position]
+    parameter_factors = problem.factor_rows[problem.position]
+
+    f_a = np.empty((0, problem.factor_rows.shape[1]))
+    f_b = np.empty_like(f_a)
+    f_ab = np.empty((d, 0, problem.factor_rows.shape[1]))
+    history: List[Dict[str, Any]] = []
+    converged = False
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers) if max_workers and max_workers > 1 else None
+    try:
+        draw = n
+        while True:
+            u = sampler.random(draw)
+            a = problem.multipliers(u[:, :d])
+            b = problem.multipliers(u[:, d:])
+            f_a_round = _evaluate(a, *args)
+            f_a = np.concatenate([f_a, f_a_round])
+            f_b = np.concatenate([f_b, _evaluate(b, *args)])
+
+            # Workers only get the columns of their chunk
+            scale = (b - a) * parameter_quantities
+            scale *= _other_multipliers(a, problem.position, problem.is_factor, problem.quantities.shape[0])
+            tasks = [(f_a_round, scale[:, chunk], parameter_factors[chunk]) for chunk in chunks]
+            if executor is None:
+                parts = [_evaluate_mixed(*task) for task in tasks]
+            else:
+                futures = [executor.submit(_evaluate_mixed, *task) for task in tasks]
+                parts = [future.result() for future in futures]
+            f_ab = np.concatenate([f_ab, np.concatenate(parts)], axis=1)
+
+            n_done = f_a.shape[0]
+            first_order, total = sobol_indices(f_a, f_b, f_ab)
+            first_ci, total_ci = bootstrap_intervals(f_a, f_b, f_ab, n_bootstrap, confidence, bootstrap_rng)
+            width = float(max(np.max(first_ci[1] - first_ci[0]), np.max(total_ci[1] - total_ci[0]))) / 2.0
+            history.append({"samples": n_done, "max_half_width": width})
+            if progress is not None:
+                progress(n_done, max_samples)
+
+            converged = tolerance > 0 and width <= tolerance
+            if converged or tolerance <= 0 or 2 * n_done > max_samples:
+                break
+            draw = n_done
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    logger.info(f"Sobol analysis of {d} parameters finished after {f_a.shape[0]} samples "
+                f"({f_a.shape[0] * (d + 2)} evaluations, converged: {converged})")
+    return SensitivityResult(problem, f_a.shape[0], first_order, total, first_ci, total_ci,
+                             converged, history)
+
+def local_sensitivities(inventory: EncodedInventory, factors: FactorMatrix) -> Dict[str, Any]:
+    """
+    One-at-a-time sensitivities of every activity.
+
+    Impacts are linear in each activity's quantity and factor, so scaling
+    either by (1 + d) changes a category's total by d times the activity's
+    share of it; the share is therefore the exact relative sensitivity
+    (elasticity) for both.
+
+    Args:
+        inventory: Encoded inventory
+        factors: Factor matrix the inventory was encoded against
+
+    Returns:
+        Dictionary with key 'activities' (names) and, per impact category,
+        the list of elasticities in the same order
+    """
+    rows, positions = np.unique(inventory.activity_index, return_inverse=True)
+    quantities = np.bincount(positions, weights=inventory.quantity, minlength=rows.shape[0])
+    contributions = quantities[:, np.newaxis] * factors.values[rows]
+    totals = contributions.sum(axis=0)
+    elasticities = contributions / np.where(totals != 0, totals, np.inf)
+
+    result: Dict[str, Any] = {"activities": [factors.activities[row] for row in rows]}
+    for column, category in enumerate(factors.categories):
+        result[category] = elasticities[:, column].tolist()
+    return result
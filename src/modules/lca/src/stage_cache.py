@@ -0,0 +1,370 @@
+"""
+Memoization of per-stage impact results.
+
+A stage's impacts depend only on its (activity, quantity) entries and the
+factor table, so results are keyed by a SHA-256 hash of the sorted entries
+and a fingerprint of the factor table. Identical stages (the same transport
+leg in many projects) are computed once, whatever they are called, and
+results computed against an older factor table are never returned because
+its fingerprint no longer matches.
+
+Results live in an in-memory LRU bounded by entry count and estimated
+bytes. An optional SQLite file keeps them across runs; memory misses are
+looked up there in batches before anything is computed.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union, Sequence, Iterable, Tuple, Callable
+
+import numpy as np
+
+from core.utils.logger import get_logger
+from models import LifeCycleStage
+from engine import FactorMatrix, get_stage_activities
+from config.settings import DATABASE as APP_DATABASE
+from config.module_config.lca_config import STAGE_CACHE
+
+# Set up logger
+logger = get_logger(__name__)
+
+# Estimated bytes per cached entry besides the key and values
+ENTRY_OVERHEAD = 200
+
+# Keys per SQLite IN (...) query, below SQLite's default variable limit
+SQLITE_BATCH = 500
+
+_fingerprints: "weakref.WeakKeyDictionary[FactorMatrix, str]" = weakref.WeakKeyDictionary()
+_fingerprints_lock = threading.Lock()
+
+def factor_fingerprint(factors: FactorMatrix) -> str:
+    """
+    Get a content hash of a factor table (computed once per matrix object).
+
+    Args:
+        factors: Factor matrix
+
+    Returns:
+        Hex digest of the activity names and factor values
+    """
+    with _fingerprints_lock:
+        fingerprint = _fingerprints.get(factors)
+    if fingerprint is not None:
+        return fingerprint
+
+    hasher = hashlib.sha256()
+    names = getattr(factors, "names", None)
+    if names is not None:
+        # Store-backed matrices hash their memory-mapped name array directly
+        hasher.update(np.ascontiguousarray(names).data)
+    else:
+        hasher.update("\0".join(factors.activities).encode("utf-8"))
+    hasher.update(np.ascontiguousarray(factors.values, dtype=np.float64).data)
+    fingerprint = hasher.hexdigest()
+
+    with _fingerprints_lock:
+        _fingerprints[factors] = fingerprint
+    return fingerprint
+
+def stage_key(stage: Union[LifeCycleStage, Dict[str, Any]], fingerprint: str) -> str:
+    """
+    Get the cache key of a stage.
+
+    The key ignores the stage name and the order of its activities.
+
+    Args:
+        stage: LifeCycleStage object or dictionary
+        fingerprint: Factor table fingerprint (see factor_fingerprint)
+
+    Returns:
+        Hex digest identifying the stage's entries and factor table
+    """
+    _, activities = get_stage_activities(stage)
+    entries = sorted((str(activity_data.get("activity")), float(activity_data.get("quantity", 1.0)))
+                     for activity_data in activities)
+    payload = json.dumps([fingerprint, entries], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class StageCache:
+    """Size-bounded LRU of stage results with an optional SQLite tier and hit-rate counters."""
+
+    def __init__(self, max_entries: int = 100000, max_bytes: int = 64 * 1024 * 1024,
+                 path: Optional[Path] = None, max_disk_entries: int = 1000000) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum entries kept in memory
+            max_bytes: Maximum estimated bytes kept in memory
+            path: Optional SQLite file for the persistent tier
+            max_disk_entries: Maximum entries kept in the SQLite file (least
+                recently used ones are deleted)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.path = Path(path) if path else None
+        self._db: Optional[sqlite3.Connection] = None
+        # Rows in the SQLite tier, counted once on open and then kept up to
+        # date, so pruning doesn't count the table on every write
+        self._disk_entries = 0
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS stage_results ("
+                "key TEXT PRIMARY KEY, vals BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_stage_results_last_used ON stage_results (last_used)")
+            self._db.commit()
+            self._disk_entries = self._db.execute("SELECT COUNT(*) FROM stage_results").fetchone()[0]
+
+    def __len__(self) -> int:
+        """Number of entries in memory."""
+        return len(self._entries)
+
+    @staticmethod
+    def _size(key: str, values: np.ndarray) -> int:
+        """Estimate the memory used by an entry."""
+        return len(key) + values.nbytes + ENTRY_OVERHEAD
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up stage results.
+
+        Repeated keys are looked up (and counted) once.
+
+        Args:
+            keys: Stage keys (see stage_key)
+
+        Returns:
+            Dictionary of the keys that were found and their result rows
+        """
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                values = self._entries.get(key)
+                if values is None:
+                    missing.append(key)
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = values
+            self.hits += len(found)
+
+            disk: Dict[str, np.ndarray] = {}
+            if missing and self._db is not None:
+                disk = self._load(missing)
+                for key, values in disk.items():
+                    self._insert(key, values)
+                found.update(disk)
+            self.disk_hits += len(disk)
+            self.misses += len(missing) - len(disk)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        """
+        Store stage results.
+
+        Args:
+            items: (key, result row) pairs
+        """
+        items = [(key, np.array(values, dtype=np.float64)) for key, values in items]
+        with self._lock:
+            for key, values in items:
+                self._insert(key, values)
+            if self._db is not None and items:
+                now = time.time()
+                rows = [(key, values.tobytes(), now) for key, values in items]
+                inserted = self._db.executemany(
+                    "INSERT OR IGNORE INTO stage_results (key, vals, last_used) VALUES (?, ?, ?)", rows
+                ).rowcount
+                if inserted < len(rows):
+                    # Some keys were already stored; overwrite them
+                    self._db.executemany("UPDATE stage_results SET vals = ?, last_used = ? WHERE key = ?",
+                                         [(blob, used, key) for key, blob, used in rows])
+                self._disk_entries += inserted
+                self._prune_disk()
+                self._db.commit()
+
+    def _insert(self, key: str, values: np.ndarray) -> None:
+        """Add an entry to the in-memory LRU, evicting the least recently used ones."""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= self._size(key, previous)
+        self._entries[key] = values
+        self.bytes += self._size(key, values)
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            old_key, old_values = self._entries.popitem(last=False)
+            self.bytes -= self._size(old_key, old_values)
+            self.evictions += 1
+
+    def _load(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Load entries from the SQLite tier and mark them as used."""
+        found: Dict[str, np.ndarray] = {}
+        for start in range(0, len(keys), SQLITE_BATCH):
+            batch = keys[start:start + SQLITE_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._db.execute(
+                f"SELECT key, vals FROM stage_results WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float64).copy()
+        if found:
+            now = time.time()
+            self._db.executemany("UPDATE stage_results SET last_used = ? WHERE key = ?",
+                                 [(now, key) for key in found])
+            self._db.commit()
+        return found
+
+    def _prune_disk(self) -> None:
+        """Delete the least recently used SQLite entries beyond max_disk_entries."""
+        if self._disk_entries > self.max_disk_entries:
+            deleted = self._db.execute(
+                "DELETE FROM stage_results WHERE key IN "
+                "(SELECT key FROM stage_results ORDER BY last_used LIMIT ?)",
+                (self._disk_entries - self.max_disk_entries,)
+            ).rowcount
+            self._disk_entries -= deleted
+
+    def clear(self, persistent: bool = False) -> None:
+        """
+        Remove all entries from memory.
+
+        Args:
+            persistent: Also empty the SQLite tier
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            if persistent and self._db is not None:
+                self._db.execute("DELETE FROM stage_results")
+                self._db.commit()
+                self._disk_entries = 0
+
+    def close(self) -> None:
+        """Close the SQLite tier (the in-memory entries stay usable)."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def reset_stats(self) -> None:
+        """Reset the hit/miss counters."""
+        with self._lock:
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the entry counts, estimated bytes and hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / total if total else 0.0,
+                "persistent": self.path is not None,
+                "disk_entries": self._disk_entries
+            }
+
+def cached_stage_impacts(stages: List[Union[LifeCycleStage, Dict[str, Any]]], factors: FactorMatrix,
+                         cache: StageCache, compute: Callable[[list], np.ndarray]) -> np.ndarray:
+    """
+    Get per-stage impacts, computing only the stages that aren't cached.
+
+    Args:
+        stages: List of LifeCycleStage objects or dictionaries
+        factors: Factor matrix
+        cache: Stage cache
+        compute: Function returning the (n_stages, n_categories) impacts of a
+            list of stages; called once with all uncached stages (each
+            distinct stage once)
+
+    Returns:
+        Array of shape (n_stages, n_categories)
+    """
+    fingerprint = factor_fingerprint(factors)
+    keys = [stage_key(stage, fingerprint) for stage in stages]
+    found = cache.get_many(keys)
+
+    # Compute each distinct missing stage once
+    pending: Dict[str, Union[LifeCycleStage, Dict[str, Any]]] = {}
+    for key, stage in zip(keys, stages):
+        if key not in found and key not in pending:
+            pending[key] = stage
+    if pending:
+        computed = compute(list(pending.values()))
+        new = list(zip(pending.keys(), computed))
+        cache.put_many(new)
+        found.update(new)
+
+    results = np.empty((len(stages), factors.n_categories), dtype=np.float64)
+    for row, key in enumerate(keys):
+        results[row] = found[key]
+    return results
+
+# Cache configured from lca_config.STAGE_CACHE, shared by the process
+_stage_cache: Optional[StageCache] = None
+_stage_cache_lock = threading.Lock()
+
+def default_cache_path() -> Path:
+    """
+    Get the SQLite file used for the persistent tier when none is configured.
+
+    Returns:
+        Path next to the application database
+    """
+    return Path(APP_DATABASE["path"]) / "lca_stage_cache.db"
+
+def get_stage_cache() -> Optional[StageCache]:
+    """
+    Get the stage cache configured in lca_config.STAGE_CACHE.
+
+    Returns:
+        The cache, or None if stage memoization is disabled
+    """
+    global _stage_cache
+    if not STAGE_CACHE.get("enabled", True):
+        return None
+
+    with _stage_cache_lock:
+        if _stage_cache is None:
+            path = None
+            if STAGE_CACHE.get("persistent"):
+                path = Path(STAGE_CACHE.get("path") or default_cache_path())
+            try:
+                _stage_cache = StageCache(STAGE_CACHE["max_entries"], STAGE_CACHE["max_bytes"],
+                                          path, STAGE_CACHE["max_disk_entries"])
+            except sqlite3.Error as e:
+                logger.error(f"Error opening stage cache {path}, keeping results in memory only: {e}")
+                _stage_cache = StageCache(STAGE_CACHE["max_entries"], STAGE_CACHE["max_bytes"])
+        return _stage_cache
+
+def reset_stage_cache() -> None:
+    """Close and forget the stage cache (e.g. after changing lca_config.STAGE_CACHE)."""
+    global _stage_cache
+    with _stage_cache_lock:
+        if _stage_cache is not None:
+            _stage_cache.close()
+        _stage_cache = None
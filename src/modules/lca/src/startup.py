@@ -0,0 +1,35 @@
+"""
+Background initialization of the LCA module.
+
+Runs on a worker thread at application startup (see the "init" entry of
+module.json), so it must not create widgets. Only the modules needed here
+are imported; the controllers are imported when the module is opened, which
+waits (without blocking the GUI) until this has finished.
+"""
+from core.data.database import session_scope
+from core.utils.logger import get_logger
+from migrations import upgrade_schema, get_factor_ids
+from factor_cache import get_factor_table
+from config.module_config.lca_config import DATABASE
+
+# Set up logger
+logger = get_logger(__name__)
+
+def initialize() -> None:
+    """Create or upgrade the LCA tables, seed default factors and preload the factor cache and external store."""
+    with session_scope() as db:
+        upgrade_schema(db)
+        get_factor_ids(db)
+
+    # Load after the commit so the cached matrix includes the seeded factors
+    with session_scope() as db:
+        factors = get_factor_table(db)[1]
+    logger.info(f"Preloaded {factors.n_activities} LCA impact factors")
+
+    # Import the external database here rather than on the GUI thread; later
+    # runs only map the store
+    if DATABASE.get("use_external_db"):
+        from factor_store import get_external_store
+        store = get_external_store()
+        if store is not None:
+            logger.info(f"Opened external LCA factor store with {len(store)} activities")
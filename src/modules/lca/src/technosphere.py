@@ -0,0 +1,146 @@
+"""
+Linked process network (technosphere) solver for the LCA module.
+
+Each activity is a process producing one unit of its product. The
+technosphere matrix A holds, in column j, the amounts of other products
+consumed per unit output of process j; the biosphere matrix B holds the
+direct impacts per unit output (the impact factor values). For a final
+demand vector f, the supply needed from every process solves
+
+    (I - A) x = f
+
+and the impacts are B x. The sparse LU factorization of (I - A) is
+computed once and reused for every demand vector, and cumulative
+(cradle-to-gate) factors are obtained from one transposed solve per
+impact category.
+"""
+import threading
+from typing import Sequence
+
+import numpy as np
+import scipy.sparse as sparse
+from scipy.sparse.linalg import splu
+
+from engine import FactorMatrix
+
+class Technosphere:
+    """Sparse technosphere and biosphere matrices over the activities of a factor matrix."""
+
+    def __init__(self, factors: FactorMatrix, technosphere: sparse.spmatrix) -> None:
+        """
+        Initialize the technosphere.
+
+        Args:
+            factors: Factor matrix with the direct impacts of every activity
+            technosphere: Square matrix A (n_activities x n_activities), where
+                A[i, j] is the amount of activity i consumed per unit of activity j
+
+        Raises:
+            ValueError: If the matrix doesn't match the factor matrix
+        """
+        n = factors.n_activities
+        if technosphere.shape != (n, n):
+            raise ValueError(f"Technosphere matrix must have shape ({n}, {n}), got {technosphere.shape}")
+
+        self.factors = factors
+        self.matrix = sparse.csr_matrix(technosphere, dtype=np.float64)
+        self.matrix.sum_duplicates()
+        self._lu = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_exchanges(cls, factors: FactorMatrix, process_index: Sequence[int],
+                       input_index: Sequence[int], amounts: Sequence[float]) -> "Technosphere":
+        """
+        Build a technosphere from exchange triples.
+
+        Args:
+            factors: Factor matrix with the direct impacts of every activity
+            process_index: Factor matrix row of each consuming process
+            input_index: Factor matrix row of each consumed product
+            amounts: Input units per unit of process output
+
+        Returns:
+            A new Technosphere
+        """
+        n = factors.n_activities
+        matrix = sparse.coo_matrix(
+            (np.asarray(amounts, dtype=np.float64),
+             (np.asarray(input_index, dtype=np.int64), np.asarray(process_index, dtype=np.int64))),
+            shape=(n, n)
+        )
+        return cls(factors, matrix.tocsr())
+
+    @property
+    def n_activities(self) -> int:
+        """Number of activities (processes)."""
+        return self.matrix.shape[0]
+
+    @property
+    def n_exchanges(self) -> int:
+        """Number of stored inter-process exchanges."""
+        return self.matrix.nnz
+
+    @property
+    def is_factorized(self) -> bool:
+        """Whether the LU factorization has been computed."""
+        return self._lu is not None
+
+    def factorize(self) -> None:
+        """
+        Compute the sparse LU factorization of (I - A) if it isn't cached yet.
+
+        Raises:
+            ValueError: If the process network has no unique solution
+                (e.g. a loop that produces less than it consumes)
+        """
+        with self._lock:
+            if self._lu is not None:
+                return
+            system = sparse.identity(self.n_activities, format="csc") - self.matrix.tocsc()
+            try:
+                self._lu = splu(system)
+            except RuntimeError as e:
+                raise ValueError(f"Technosphere matrix is singular: {e}") from e
+
+    def supply(self, demand: np.ndarray) -> np.ndarray:
+        """
+        Solve for the total output of every process needed to meet a demand.
+
+        Args:
+            demand: Final demand per activity, shape (n_activities,) or
+                (n_activities, n_demands) for several demand vectors at once
+
+        Returns:
+            Supply array with the same shape as demand
+        """
+        self.factorize()
+        return self._lu.solve(np.asarray(demand, dtype=np.float64))
+
+    def impacts(self, demand: np.ndarray) -> np.ndarray:
+        """
+        Calculate the total impacts of a demand.
+
+        Args:
+            demand: Final demand per activity, shape (n_activities,) or
+                (n_activities, n_demands)
+
+        Returns:
+            Array of shape (n_categories,) or (n_demands, n_categories)
+        """
+        return self.supply(demand).T @ self.factors.values
+
+    def cumulative_factors(self) -> FactorMatrix:
+        """
+        Get cradle-to-gate impacts per unit of every activity.
+
+        Solves (I - A)^T M = B^T, so each activity's row includes the impacts of
+        its whole upstream supply chain. Inventories can then be evaluated with
+        the flat engine functions (encode_stages, total_impacts, ...).
+
+        Returns:
+            FactorMatrix with the cumulative factors
+        """
+        self.factorize()
+        values = self._lu.solve(self.factors.values, trans="T")
+        return FactorMatrix(self.factors.activities, values, self.factors.uncertainty)
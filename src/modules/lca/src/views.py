@@ -2,28 +2,63 @@
 UI components for the LCA module.
 """
 from typing import List, Dict, Any, Optional
+import os
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
     QTableWidget, QTableWidgetItem, QComboBox, QLineEdit,
-    QSpinBox, QDoubleSpinBox, QFileDialog, QMessageBox
+    QSpinBox, QDoubleSpinBox, QFileDialog, QMessageBox, QCompleter
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QStringListModel, pyqtSignal
 
 from core.ui.components import FormView, TableView, ChartView
-from config.module_config.lca_config import DEFAULT_IMPACT_FACTORS
+
+# Activity lists longer than this get a type-ahead dropdown
+LARGE_ACTIVITY_LIST = 1000
+
+# Activity names shared by all activity dropdowns
+_activity_model: Optional[QStringListModel] = None
+
+def get_activity_model() -> QStringListModel:
+    """
+    Get the shared model of activity names (loaded on first use).
+    
+    Returns:
+        Model listing the sorted activity names
+    """
+    global _activity_model
+    if _activity_model is None:
+        from controllers import get_activity_names
+        _activity_model = QStringListModel(get_activity_names())
+    return _activity_model
 
 class ActivityEntryWidget(QWidget):
     """Widget for entering an activity and its quantity."""
     
+    # Emitted when the activity or quantity is edited, and when the entry is removed
+    changed = pyqtSignal()
+    removed = pyqtSignal()
+    
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         """Initialize the widget."""
         super().__init__(parent)
         self.setLayout(QHBoxLayout())
+        self.entry_id: Optional[int] = None  # Set by the view that owns the entry
         
         # Activity dropdown
         self.activity_dropdown = QComboBox()
-        self.activity_dropdown.addItems(sorted(DEFAULT_IMPACT_FACTORS.keys()))
+        model = get_activity_model()
+        if model.rowCount() > LARGE_ACTIVITY_LIST:
+            # Don't measure every item, and find activities by typing a prefix
+            self.activity_dropdown.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+            self.activity_dropdown.setMinimumContentsLength(40)
+            self.activity_dropdown.setEditable(True)
+            self.activity_dropdown.setInsertPolicy(QComboBox.NoInsert)
+        self.activity_dropdown.setModel(model)
+        if self.activity_dropdown.isEditable():
+            completer = self.activity_dropdown.completer()
+            completer.setModelSorting(QCompleter.CaseSensitivelySortedModel)
+            completer.setCompletionMode(QCompleter.PopupCompletion)
         self.layout().addWidget(self.activity_dropdown)
         
         # Quantity input
@@ -33,6 +68,9 @@ class ActivityEntryWidget(QWidget):
         self.quantity_input.setDecimals(2)
         self.layout().addWidget(self.quantity_input)
         
+        self.activity_dropdown.currentTextChanged.connect(lambda text: self.changed.emit())
+        self.quantity_input.valueChanged.connect(lambda value: self.changed.emit())
+        
         # Remove button
         self.remove_button = QPushButton("Remove")
         self.remove_button.clicked.connect(self.on_remove)
@@ -40,6 +78,8 @@ class ActivityEntryWidget(QWidget):
     
     def on_remove(self) -> None:
         """Handle the Remove button click."""
+        self.removed.emit()
+        
         # Remove this widget from its parent
         if self.parent():
             layout = self.parent().layout()
@@ -75,6 +115,10 @@ class LCAView(FormView):
         self.activities_container.setLayout(self.activities_layout)
         self.form_layout.addRow("Activities", self.activities_container)
         
+        # Results of the last calculation, updated live as activities are edited
+        self.session = None
+        self._next_entry_id = 0
+        
         # Add initial activity
         self.add_activity()
         
@@ -89,29 +133,68 @@ class LCAView(FormView):
         
         self.results_table = TableView()
         self.results_table.set_headers(["Stage", "CO2 (kg)", "Water (L)", "Energy (kWh)"])
+        self.results_table.table_model.float_format = "{:.2f}"
         self.results_layout.addWidget(self.results_table)
+        
+        # Activities that contribute most to CO2
+        self.hotspot_label = QLabel("CO2 hotspots")
+        self.results_layout.addWidget(self.hotspot_label)
+        self.hotspot_table = TableView()
+        self.hotspot_table.set_headers(["Activity", "CO2 (kg)", "Share (%)", "Cumulative (%)"])
+        self.hotspot_table.table_model.float_format = "{:.2f}"
+        self.results_layout.addWidget(self.hotspot_table)
     
     def add_activity(self) -> None:
         """Add an activity entry widget."""
         activity_widget = ActivityEntryWidget()
+        activity_widget.entry_id = self._next_entry_id
+        self._next_entry_id += 1
+        activity_widget.changed.connect(lambda: self.on_activity_changed(activity_widget))
+        activity_widget.removed.connect(lambda: self.on_activity_removed(activity_widget))
         self.activities_layout.addWidget(activity_widget)
+        
+        if self.session is not None:
+            data = activity_widget.get_activity_data()
+            self.session.add_entry(0, data["activity"], data["quantity"], entry_id=activity_widget.entry_id)
+            self.update_live_results()
     
-    def get_activities(self) -> List[Dict[str, Any]]:
+    def get_activity_widgets(self) -> List[ActivityEntryWidget]:
         """
-        Get all activities and quantities.
+        Get the activity entry widgets.
         
         Returns:
-            List of dictionaries with keys 'activity' and 'quantity'
+            List of ActivityEntryWidget in display order
         """
-        activities = []
-        
-        # Get data from each activity widget
+        widgets = []
         for i in range(self.activities_layout.count()):
             widget = self.activities_layout.itemAt(i).widget()
             if isinstance(widget, ActivityEntryWidget):
-                activities.append(widget.get_activity_data())
+                widgets.append(widget)
+        return widgets
+    
+    def get_activities(self) -> List[Dict[str, Any]]:
+        """
+        Get all activities and quantities.
         
-        return activities
+        Returns:
+            List of dictionaries with keys 'activity' and 'quantity'
+        """
+        return [widget.get_activity_data() for widget in self.get_activity_widgets()]
+    
+    def on_activity_changed(self, activity_widget: ActivityEntryWidget) -> None:
+        """Update the live results after an activity or quantity edit."""
+        if self.session is None or activity_widget.entry_id not in self.session:
+            return
+        data = activity_widget.get_activity_data()
+        self.session.update_entry(activity_widget.entry_id, data["activity"], data["quantity"])
+        self.update_live_results()
+    
+    def on_activity_removed(self, activity_widget: ActivityEntryWidget) -> None:
+        """Update the live results after an activity is removed."""
+        if self.session is None or activity_widget.entry_id not in self.session:
+            return
+        self.session.remove_entry(activity_widget.entry_id)
+        self.update_live_results()
     
     def on_calculate(self) -> None:
         """Handle the Calculate button click."""
@@ -133,15 +216,41 @@ class LCAView(FormView):
             "activities": activities
         }
         
-        # Calculate impacts
-        try:
-            from controllers import calculate_impact
-            results = calculate_impact([stage])
-            
-            # Display results
-            self.display_results(results, [stage])
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error calculating impacts: {e}")
+        # Calculate impacts off the GUI thread and display them when done
+        from controllers import create_incremental_session
+        entry_ids = [widget.entry_id for widget in self.get_activity_widgets()]
+        self.run_async(
+            create_incremental_session, [stage], entry_ids,
+            on_finished=lambda session: self.on_session_ready(session, stage),
+            on_failed=lambda e: QMessageBox.critical(self, "Error", f"Error calculating impacts: {e}")
+        )
+    
+    def on_session_ready(self, session, stage: Dict[str, Any]) -> None:
+        """
+        Keep a finished calculation for live updates and display its results.
+        
+        Edits made while the calculation was running are applied to the
+        session, and the hotspots are found for the current activities.
+        
+        Args:
+            session: IncrementalLCA returned by controllers.create_incremental_session
+            stage: The calculated stage dictionary
+        """
+        # Apply edits made while the calculation was running
+        widgets = self.get_activity_widgets()
+        current = {widget.entry_id for widget in widgets}
+        for entry_id in [entry_id for entry_id in session.entry_ids if entry_id not in current]:
+            session.remove_entry(entry_id)
+        for widget in widgets:
+            data = widget.get_activity_data()
+            if widget.entry_id in session:
+                session.update_entry(widget.entry_id, data["activity"], data["quantity"])
+            else:
+                session.add_entry(0, data["activity"], data["quantity"], entry_id=widget.entry_id)
+        
+        self.session = session
+        current_stage = {"name": stage["name"], "activities": self.get_activities()}
+        self.display_results(session.totals, [current_stage])
     
     def display_results(self, results: Dict[str, float], stages: List[Dict[str, Any]]) -> None:
         """
@@ -154,14 +263,25 @@ class LCAView(FormView):
         # Switch to results tab
         self.tabs.setCurrentIndex(1)
         
+        self.show_totals(results)
+        
+        # Find the hotspots in the background
+        from controllers import analyze_contributions
+        self.hotspot_table.clear_rows()
+        self.run_async(analyze_contributions, stages, on_finished=self.display_hotspots)
+    
+    def show_totals(self, results: Dict[str, float]) -> None:
+        """
+        Show total impacts in the results table and chart.
+        
+        Args:
+            results: Dictionary with total impacts
+        """
         # Clear previous results
         self.results_table.clear_rows()
         
         # Add totals to table
-        self.results_table.add_row(["Total", 
-                                    f"{results['co2']:.2f}", 
-                                    f"{results['water']:.2f}", 
-                                    f"{results['energy']:.2f}"])
+        self.results_table.add_row(["Total", results["co2"], results["water"], results["energy"]])
         
         # Create chart
         self.chart_view.plot_pie_chart(
@@ -170,6 +290,28 @@ class LCAView(FormView):
             "Environmental Impact Distribution"
         )
     
+    def update_live_results(self) -> None:
+        """Show the session's current totals (hotspots are refreshed on the next Calculate)."""
+        self.show_totals(self.session.totals)
+    
+    def display_hotspots(self, contributions: Dict[str, Any]) -> None:
+        """
+        Display the top CO2 contributors in the results tab.
+        
+        Args:
+            contributions: Contribution analysis (see controllers.analyze_contributions)
+        """
+        co2 = contributions["co2"]
+        self.hotspot_label.setText(
+            f"CO2 hotspots ({co2['activities_for_share']} activities make up 80% of CO2)"
+        )
+        self.hotspot_table.set_columns({
+            "Activity": [row["activity"] for row in co2["top_activities"]],
+            "CO2 (kg)": [row["value"] for row in co2["top_activities"]],
+            "Share (%)": [100 * row["share"] for row in co2["top_activities"]],
+            "Cumulative (%)": [100 * row["cumulative_share"] for row in co2["top_activities"]]
+        })
+    
     def on_export(self) -> None:
         """Handle the Export button click."""
         # Check if there are results to export
@@ -180,15 +322,17 @@ class LCAView(FormView):
         # Ask for file location
         file_dialog = QFileDialog(self)
         file_dialog.setAcceptMode(QFileDialog.AcceptSave)
-        file_dialog.setNameFilter("CSV Files (*.csv);;Excel Files (*.xlsx)")
+        file_dialog.setNameFilter("CSV Files (*.csv);;Excel Files (*.xlsx);;"
+                                  "Parquet Files (*.parquet);;Feather Files (*.feather)")
         if file_dialog.exec_():
             file_path = file_dialog.selectedFiles()[0]
-            file_format = "csv" if file_path.endswith(".csv") else "xlsx"
+            extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+            file_format = extension if extension in ("csv", "parquet", "feather") else "xlsx"
             
             try:
                 from controllers import export_results
-                # Get data from table
-                data = self.results_table.get_data()
+                # Get the table's typed columns (as displayed)
+                data = self.results_table.get_columns()
                 export_results(data, file_format, file_path)
                 QMessageBox.information(self, "Success", f"Results exported to {file_path}")
             except Exception as e:
@@ -198,6 +342,7 @@ class LCAView(FormView):
         """Handle the Clear button click."""
         # Clear stage name
         self.stage_name_input.clear()
+        self.session = None
         
         # Clear activities
         for i in reversed(range(self.activities_layout.count())):
@@ -0,0 +1,100 @@
+"""
+Tests for the LCA module bulk stage import.
+"""
+import os
+import sys
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from models import LifeCycleStage, StageActivity
+from bulk import BulkStageWriter
+from migrations import get_factor_ids
+from queries import stage_impact_totals
+from core.data.database import Base
+
+@pytest.fixture
+def db_session():
+    """Create an in-memory database session for testing."""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+def make_stages(n):
+    """Create n test stages."""
+    return [
+        {
+            "name": f"Stage {i}",
+            "activities": [
+                {"activity": "material_steel_kg", "quantity": 1.0},
+                {"activity": "transportation_truck_km", "quantity": float(i)}
+            ]
+        }
+        for i in range(n)
+    ]
+
+def test_bulk_stage_writer(db_session):
+    """Test writing stages in batches within one transaction."""
+    stages = make_stages(25)
+    stages.append({"name": "Legacy", "activities": [{"activity": "unknown_activity", "quantity": 1}]})
+    
+    with BulkStageWriter(db_session, project_id=None, batch_size=10) as writer:
+        ids = [writer.add_stage(stage) for stage in stages]
+    
+    assert writer.stats["stages"] == 26
+    assert writer.stats["activities"] == 50
+    assert writer.stats["rows_per_second"] > 0
+    
+    assert db_session.query(LifeCycleStage).count() == 26
+    assert db_session.query(StageActivity).count() == 50
+    
+    # Stages with unknown activities keep them as JSON
+    legacy = db_session.query(LifeCycleStage).get(ids[-1])
+    assert legacy.activities_list == [{"activity": "unknown_activity", "quantity": 1}]
+    
+    totals = stage_impact_totals(db_session, [ids[3]])
+    assert totals[ids[3]]["co2"] == pytest.approx(2.0 + 3 * 0.1)
+
+def test_bulk_stage_writer_rolls_back(db_session):
+    """Test that a failing batch rolls back the whole import."""
+    stages = make_stages(15)
+    stages.append({"name": None, "activities": []})
+    
+    with pytest.raises(IntegrityError):
+        with BulkStageWriter(db_session, batch_size=10) as writer:
+            for stage in stages:
+                writer.add_stage(stage)
+    
+    assert db_session.query(LifeCycleStage).count() == 0
+    assert db_session.query(StageActivity).count() == 0
+
+def test_bulk_stage_writer_locks_stage_ids(tmp_path):
+    """Test that concurrent writers can't insert stages while IDs are allocated."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}", connect_args={"timeout": 0.1})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db, other = Session(), Session()
+    # Seed the factors first, so entering the writer doesn't write them
+    get_factor_ids(db)
+    db.commit()
+    
+    with BulkStageWriter(db) as writer:
+        stage_id = writer.add_stage(make_stages(1)[0])
+        other.add(LifeCycleStage(name="Concurrent"))
+        with pytest.raises(OperationalError):
+            other.commit()
+        other.rollback()
+    
+    assert db.query(LifeCycleStage).get(stage_id).name == "Stage 0"
+    db.close()
+    other.close()
+    engine.dispose()
@@ -0,0 +1,90 @@
+"""
+Tests for the LCA module contribution analysis.
+"""
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from engine import FactorMatrix, encode_stages
+from contributions import ContributionAnalysis, top_k_indices
+from controllers import analyze_contributions
+
+def test_top_k_indices():
+    """Test partial selection by magnitude."""
+    values = np.array([1.0, -5.0, 3.0, 0.5, 4.0])
+    assert top_k_indices(values, 3).tolist() == [1, 4, 2]
+    assert top_k_indices(values, 10).tolist() == [1, 4, 2, 0, 3]
+    assert top_k_indices(values, 0).tolist() == []
+
+def test_contributions_are_summed_per_activity_and_stage():
+    """Test per-activity and per-stage contributions and ranking."""
+    factors = FactorMatrix(["steel", "truck", "waste"],
+                           np.array([[2.0, 0.0, 1.0], [0.1, 0.0, 1.0], [-1.0, 0.0, 1.0]]))
+    stages = [
+        {"name": "Make", "activities": [{"activity": "steel", "quantity": 3.0},
+                                        {"activity": "truck", "quantity": 10.0}]},
+        {"name": "Ship", "activities": [{"activity": "truck", "quantity": 20.0},
+                                        {"activity": "waste", "quantity": 1.0}]}
+    ]
+    analysis = ContributionAnalysis(encode_stages(stages, factors), factors)
+    
+    np.testing.assert_allclose(analysis.totals, [8.0, 0.0, 34.0])
+    top = analysis.top_activities("co2", k=2)
+    assert [row["activity"] for row in top] == ["steel", "truck"]
+    assert top[0]["value"] == pytest.approx(6.0)
+    assert top[1]["value"] == pytest.approx(3.0)
+    
+    # Shares are relative to the summed magnitudes (6 + 3 + |-1| = 10)
+    assert top[0]["share"] == pytest.approx(0.6)
+    assert top[1]["cumulative_share"] == pytest.approx(0.9)
+    assert [row["stage"] for row in analysis.top_stages("co2")] == ["Make", "Ship"]
+    
+    assert analysis.count_for_share("co2", 0.8) == 2
+    assert analysis.count_for_share("co2", 0.6) == 1
+    assert analysis.count_for_share("water", 0.8) == 0
+    
+    ranks, cumulative = analysis.pareto_curve("co2")
+    assert ranks.tolist() == [1, 2, 3]
+    np.testing.assert_allclose(cumulative, [0.6, 0.9, 1.0])
+    
+    with pytest.raises(ValueError):
+        analysis.top_activities("nitrogen")
+
+def test_large_inventory():
+    """Test hotspots and the share count on a large random inventory."""
+    rng = np.random.default_rng(0)
+    n = 200_000
+    factors = FactorMatrix([f"a{i}" for i in range(n)], rng.lognormal(0.0, 2.0, (n, 3)))
+    stages = [{"name": "All", "activities": [{"activity": f"a{i}", "quantity": 1.0} for i in range(n)]}]
+    analysis = ContributionAnalysis(encode_stages(stages, factors), factors)
+    
+    co2 = factors.values[:, 0]
+    expected = np.sort(co2)[::-1]
+    assert [row["value"] for row in analysis.top_activities("co2", 5)] == pytest.approx(expected[:5].tolist())
+    
+    count = analysis.count_for_share("co2", 0.8)
+    cumulative = np.cumsum(expected) / expected.sum()
+    assert cumulative[count - 1] >= 0.8 and cumulative[count - 2] < 0.8
+    
+    ranks, curve = analysis.pareto_curve("co2", max_points=100)
+    assert len(ranks) <= 100 and ranks[-1] == n
+    assert curve[-1] == pytest.approx(1.0)
+
+def test_analyze_contributions():
+    """Test the controller summary on the default factors."""
+    stages = [{"name": "Production", "activities": [
+        {"activity": "material_steel_kg", "quantity": 10.0},
+        {"activity": "electricity_generation_coal_kwh", "quantity": 5.0}
+    ]}]
+    result = analyze_contributions(stages, top_k=1)
+    
+    assert result["co2"]["total"] == pytest.approx(10 * 2.0 + 5 * 1.1)
+    assert result["co2"]["top_activities"][0]["activity"] == "material_steel_kg"
+    assert len(result["co2"]["top_activities"]) == 1
+    assert result["co2"]["pareto"]["rank"] == [1, 2]
@@ -2,11 +2,18 @@
 Tests for the LCA module controllers.
 """
 import os
+import sys
 import pytest
+import numpy as np
 import pandas as pd
 import tempfile
 
-from src.modules.lca.src.controllers import calculate_impact, export_results
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from controllers import calculate_impact, export_results
 
 def test_calculate_impact():
     """Test the calculate_impact function."""
@@ -88,4 +95,51 @@ def test_export_results():
     finally:
         # Clean up
         if os.path.exists(temp_path):
-            os.unlink(temp_path)
\ No newline at end of file
+            os.unlink(temp_path)
+
+def test_export_numeric_results():
+    """Test exporting numeric arrays and columns in chunks."""
+    values = np.arange(30, dtype=np.float64).reshape(10, 3)
+    
+    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as temp_file:
+        temp_path = temp_file.name
+    
+    try:
+        # A 2D array with three columns gets the impact category headers
+        export_results(values, "csv", temp_path, chunk_size=3)
+        df = pd.read_csv(temp_path)
+        assert list(df.columns) == ["CO2 (kg)", "Water (L)", "Energy (kWh)"]
+        assert len(df) == 10
+        np.testing.assert_allclose(df.to_numpy(), values)
+        
+        # A dictionary of columns keeps its names and types
+        columns = {"stage_id": np.arange(10), "co2": values[:, 0]}
+        export_results(columns, "csv", temp_path, chunk_size=4)
+        df = pd.read_csv(temp_path)
+        assert list(df.columns) == ["stage_id", "co2"]
+        assert df["stage_id"].dtype.kind == "i"
+        
+        with pytest.raises(ValueError):
+            export_results(values, "pdf", temp_path)
+        with pytest.raises(ValueError):
+            export_results(np.zeros((2, 5)), "csv", temp_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+def test_export_parquet():
+    """Test exporting columns to Parquet."""
+    pytest.importorskip("pyarrow")
+    columns = {"stage_id": np.arange(5), "co2": np.linspace(0.0, 1.0, 5)}
+    
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as temp_file:
+        temp_path = temp_file.name
+    
+    try:
+        export_results(columns, "parquet", temp_path, chunk_size=2)
+        df = pd.read_parquet(temp_path)
+        assert list(df["stage_id"]) == [0, 1, 2, 3, 4]
+        np.testing.assert_allclose(df["co2"], columns["co2"])
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
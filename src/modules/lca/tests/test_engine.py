@@ -0,0 +1,130 @@
+"""
+Tests for the LCA module calculation engine.
+"""
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from engine import (
+    FactorMatrix, IMPACT_CATEGORIES, encode_stages, stage_impacts, total_impacts, to_impact_dict,
+    evaluate_scenarios
+)
+from controllers import (
+    calculate_impact_breakdown, calculate_impact_batch, get_scenario_columns
+)
+
+@pytest.fixture
+def stages():
+    """Create test stages."""
+    return [
+        {
+            "name": "Raw Materials",
+            "activities": [
+                {"activity": "material_steel_kg", "quantity": 100},
+                {"activity": "unknown_activity", "quantity": 5}
+            ]
+        },
+        {
+            "name": "Manufacturing",
+            "activities": [
+                {"activity": "electricity_generation_coal_kwh", "quantity": 500},
+                {"activity": "material_steel_kg", "quantity": 10}
+            ]
+        },
+        {
+            "name": "Empty",
+            "activities": []
+        }
+    ]
+
+def test_factor_matrix_from_defaults():
+    """Test building the factor matrix from the default factors."""
+    factors = FactorMatrix.from_defaults()
+
+    assert factors.n_categories == len(IMPACT_CATEGORIES)
+    row = factors.index_of("material_steel_kg")
+    assert list(factors.values[row]) == [2.0, 50.0, 25.0]
+    assert factors.index_of("unknown_activity") == -1
+
+    with pytest.raises(ValueError):
+        FactorMatrix(["a", "b"], np.zeros((3, 3)))
+
+def test_encode_stages(stages):
+    """Test encoding stages to index/quantity arrays."""
+    factors = FactorMatrix.from_defaults()
+    inventory = encode_stages(stages, factors)
+
+    assert inventory.n_entries == 3
+    assert inventory.n_stages == 3
+    assert inventory.stage_names == ["Raw Materials", "Manufacturing", "Empty"]
+    assert list(inventory.stage_index) == [0, 1, 1]
+    assert list(inventory.quantity) == [100.0, 500.0, 10.0]
+    assert inventory.missing == {"unknown_activity": 1}
+
+def test_stage_and_total_impacts(stages):
+    """Test per-stage and total impacts."""
+    factors = FactorMatrix.from_defaults()
+    inventory = encode_stages(stages, factors)
+
+    per_stage = stage_impacts(inventory, factors)
+    assert per_stage.shape == (3, 3)
+    np.testing.assert_allclose(per_stage[0], [200.0, 5000.0, 2500.0])
+    np.testing.assert_allclose(per_stage[1], [570.0, 1500.0, 750.0])
+    np.testing.assert_allclose(per_stage[2], [0.0, 0.0, 0.0])
+
+    totals = total_impacts(inventory, factors)
+    np.testing.assert_allclose(totals, per_stage.sum(axis=0))
+    assert to_impact_dict(totals) == pytest.approx({"co2": 770.0, "water": 6500.0, "energy": 3250.0})
+
+def test_calculate_impact_breakdown(stages):
+    """Test the controller breakdown against the engine."""
+    results = calculate_impact_breakdown(stages)
+
+    assert results["totals"] == pytest.approx({"co2": 770.0, "water": 6500.0, "energy": 3250.0})
+    assert [stage["name"] for stage in results["stages"]] == ["Raw Materials", "Manufacturing", "Empty"]
+    assert results["stages"][1]["co2"] == pytest.approx(570.0)
+
+def test_evaluate_scenarios(stages):
+    """Test batch scenario evaluation against per-scenario totals."""
+    factors = FactorMatrix.from_defaults()
+    inventory = encode_stages(stages, factors)
+    
+    # Columns: steel, unknown, coal, steel
+    scenarios = np.array([
+        [100.0, 5.0, 500.0, 10.0],
+        [0.0, 5.0, 0.0, 0.0],
+        [1.0, 1000.0, 2.0, 3.0]
+    ])
+    results = evaluate_scenarios(inventory, factors, scenarios)
+    
+    assert results.shape == (3, 3)
+    np.testing.assert_allclose(results[0], [770.0, 6500.0, 3250.0])
+    np.testing.assert_allclose(results[1], [0.0, 0.0, 0.0])
+    np.testing.assert_allclose(results[2], [4 * 2.0 + 2 * 1.1, 4 * 50.0 + 2 * 2.0, 4 * 25.0 + 2 * 1.0])
+    
+    # Chunked evaluation gives the same result
+    chunked = evaluate_scenarios(inventory, factors, scenarios, chunk_size=2)
+    np.testing.assert_allclose(chunked, results)
+    
+    with pytest.raises(ValueError):
+        evaluate_scenarios(inventory, factors, np.zeros((2, 3)))
+
+def test_calculate_impact_batch(stages):
+    """Test the controller batch API."""
+    columns = get_scenario_columns(stages)
+    assert [column["activity"] for column in columns] == [
+        "material_steel_kg", "unknown_activity", "electricity_generation_coal_kwh", "material_steel_kg"
+    ]
+    
+    base = np.array([column["quantity"] for column in columns])
+    scenarios = np.vstack([base, base * 2])
+    results = calculate_impact_batch(stages, scenarios, chunk_size=1, max_workers=2)
+    
+    np.testing.assert_allclose(results[0], [770.0, 6500.0, 3250.0])
+    np.testing.assert_allclose(results[1], [1540.0, 13000.0, 6500.0])
@@ -0,0 +1,138 @@
+"""
+Tests for the LCA module impact factor cache.
+"""
+import os
+import sys
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from models import ImpactFactor
+from factor_cache import FactorCache, factor_cache
+from controllers import get_impact_factors, get_factor_matrix
+from core.data.database import Base
+
+@pytest.fixture
+def db_session():
+    """Create an in-memory database session for testing."""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+def test_cache_hits_and_misses():
+    """Test that a factor table is loaded once per version."""
+    cache = FactorCache()
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        return {"steel": {"co2": 2.0, "water": 50.0, "energy": 25.0}}
+    
+    factors, matrix = cache.get("test", loader)
+    cache.get("test", loader)
+    cache.get("test", loader)
+    
+    assert len(calls) == 1
+    assert factors["steel"]["co2"] == 2.0
+    assert matrix.index_of("steel") == 0
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 1
+    
+    # Invalidation forces a reload
+    cache.invalidate()
+    cache.get("test", loader)
+    assert len(calls) == 2
+    assert cache.stats["version"] == 1
+
+def test_defaults_are_cached():
+    """Test that the default factor table is reused across calls."""
+    get_impact_factors()
+    misses = factor_cache.misses
+    
+    get_impact_factors()
+    matrix = get_factor_matrix()
+    
+    assert factor_cache.misses == misses
+    assert matrix is get_factor_matrix()
+
+def test_session_events_invalidate_cache(db_session):
+    """Test that inserting, updating and deleting ImpactFactor rows bumps the version."""
+    version = factor_cache.version
+    
+    factor = ImpactFactor(activity="material_steel_kg", co2=2.0, water=50.0, energy=25.0)
+    db_session.add(factor)
+    db_session.commit()
+    assert factor_cache.version > version
+    
+    factors = get_impact_factors(db_session)
+    assert factors["material_steel_kg"]["co2"] == 2.0
+    
+    # Update
+    version = factor_cache.version
+    factor.co2 = 3.0
+    db_session.commit()
+    assert factor_cache.version > version
+    assert get_impact_factors(db_session)["material_steel_kg"]["co2"] == 3.0
+    
+    # Bulk delete
+    version = factor_cache.version
+    db_session.query(ImpactFactor).delete()
+    db_session.commit()
+    assert factor_cache.version > version
+    assert get_impact_factors(db_session) == {}
+
+def test_load_between_flush_and_commit(tmp_path):
+    """Test that a table loaded by another session before a commit is not kept."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'factors.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    writer, reader = Session(), Session()
+    
+    factor = ImpactFactor(activity="material_steel_kg", co2=2.0, water=50.0, energy=25.0)
+    writer.add(factor)
+    writer.commit()
+    
+    # The reader caches the committed row while the update is flushed but not committed
+    factor.co2 = 3.0
+    writer.flush()
+    assert get_impact_factors(reader)["material_steel_kg"]["co2"] == 2.0
+    writer.commit()
+    
+    assert get_impact_factors(reader)["material_steel_kg"]["co2"] == 3.0
+    writer.close()
+    reader.close()
+    engine.dispose()
+
+def test_engines_do_not_share_tables(db_session):
+    """Test that two in-memory databases get their own factor tables."""
+    db_session.add(ImpactFactor(activity="material_steel_kg", co2=2.0, water=50.0, energy=25.0))
+    db_session.commit()
+    
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    other = sessionmaker(bind=engine)()
+    other.add(ImpactFactor(activity="material_steel_kg", co2=9.0, water=50.0, energy=25.0))
+    other.commit()
+    
+    assert get_impact_factors(db_session)["material_steel_kg"]["co2"] == 2.0
+    assert get_impact_factors(other)["material_steel_kg"]["co2"] == 9.0
+    other.close()
+
+def test_returned_factors_are_copies(db_session):
+    """Test that modifying the returned factors leaves the cache unchanged."""
+    db_session.add(ImpactFactor(activity="material_steel_kg", co2=2.0, water=50.0, energy=25.0))
+    db_session.commit()
+    
+    factors = get_impact_factors(db_session)
+    factors["material_steel_kg"]["co2"] = 100.0
+    factors["other"] = {}
+    
+    assert get_impact_factors(db_session) == {"material_steel_kg": {"co2": 2.0, "water": 50.0, "energy": 25.0}}
@@ -0,0 +1,142 @@
+"""
+Tests for the LCA module memory-mapped factor store.
+"""
+import gc
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import factor_store
+from factor_store import (
+    FactorStore, write_factor_store, build_factor_store, open_factor_store, iter_xml_factors
+)
+from engine import encode_stages, total_impacts
+from controllers import get_impact_factors
+
+CSV = """activity,unit,co2,water,energy
+steel_kg,kg,2.0,50,25
+électricité_kwh,kWh,0.5,1,1
+broken,kg,x,1,1
+steel_kg,kg,2.5,50,25
+"""
+
+XML = """<?xml version="1.0"?>
+<dataset xmlns="http://example.org/lca">
+  <activities>
+    <activity name="steel_kg" co2="2.0" water="50" energy="25"/>
+    <activity><name>truck_km</name><co2>0.1</co2><water>0.02</water><energy>0.4</energy></activity>
+    <activity name="incomplete" co2="1.0"/>
+  </activities>
+</dataset>
+"""
+
+def test_csv_import_and_lookup(tmp_path):
+    """Test importing a CSV dump and looking activities up in the store."""
+    source = tmp_path / "factors.csv"
+    source.write_text(CSV, encoding="utf-8")
+    store = build_factor_store(source, tmp_path / "store")
+    
+    # Invalid rows are skipped and the last duplicate wins
+    assert len(store) == 2
+    matrix = store.matrix
+    assert isinstance(store.values, np.memmap)
+    np.testing.assert_allclose(matrix.values[matrix.index_of("steel_kg")], [2.5, 50.0, 25.0])
+    assert matrix.index_of("électricité_kwh") >= 0
+    assert matrix.index_of("missing") == -1
+    assert matrix.encode(["zzz", "steel_kg", ""]).tolist() == [-1, matrix.index_of("steel_kg"), -1]
+    assert store.as_factor_dict()["électricité_kwh"]["co2"] == 0.5
+    
+    # The store works with the engine like any factor matrix
+    stages = [{"name": "A", "activities": [{"activity": "steel_kg", "quantity": 2.0}]}]
+    np.testing.assert_allclose(total_impacts(encode_stages(stages, matrix), matrix), [5.0, 100.0, 50.0])
+
+def test_xml_import(tmp_path):
+    """Test streaming activities from an XML dump."""
+    source = tmp_path / "factors.xml"
+    source.write_text(XML, encoding="utf-8")
+    chunks = list(iter_xml_factors(source, chunk_size=1))
+    assert [names.tolist() for names, _ in chunks] == [["steel_kg"], ["truck_km"]]
+    
+    store = build_factor_store(source, tmp_path / "store")
+    assert store.matrix.activities == ["steel_kg", "truck_km"]
+
+def test_store_is_reused_until_source_changes(tmp_path):
+    """Test that the imported store is reopened rather than rebuilt."""
+    source = tmp_path / "factors.csv"
+    source.write_text(CSV, encoding="utf-8")
+    first = open_factor_store(source)
+    created = first.meta["created"]
+    
+    assert open_factor_store(source).meta["created"] == created
+    assert len(open_factor_store(tmp_path / "factors.csv.store")) == 2
+    
+    source.write_text(CSV + "glass_kg,kg,0.8,10,15\n", encoding="utf-8")
+    assert len(open_factor_store(source)) == 3
+
+def test_external_store_from_config(tmp_path, monkeypatch):
+    """Test that lca_config.DATABASE enables the external store."""
+    source = tmp_path / "factors.csv"
+    source.write_text(CSV, encoding="utf-8")
+    monkeypatch.setitem(factor_store.DATABASE, "use_external_db", True)
+    monkeypatch.setitem(factor_store.DATABASE, "external_db_path", str(source))
+    factor_store.reset_external_store()
+    try:
+        store = factor_store.get_external_store()
+        assert store is factor_store.get_external_store()
+        assert len(store) == 2
+        
+        # get_impact_factors returns a copy of the store's factors
+        factors = get_impact_factors()
+        factors["steel_kg"]["co2"] = 0.0
+        assert get_impact_factors()["steel_kg"]["co2"] == store.as_factor_dict()["steel_kg"]["co2"] != 0.0
+    finally:
+        factor_store.reset_external_store()
+    
+    monkeypatch.setitem(factor_store.DATABASE, "use_external_db", False)
+    assert factor_store.get_external_store() is None
+
+def test_external_store_failure_is_cached(tmp_path, monkeypatch):
+    """Test that a database that can't be opened isn't retried on every call."""
+    monkeypatch.setitem(factor_store.DATABASE, "use_external_db", True)
+    monkeypatch.setitem(factor_store.DATABASE, "external_db_path", str(tmp_path / "missing.csv"))
+    calls = []
+    
+    def failing_open(*args, **kwargs):
+        calls.append(args)
+        raise FileNotFoundError("missing.csv")
+    
+    monkeypatch.setattr(factor_store, "open_factor_store", failing_open)
+    factor_store.reset_external_store()
+    try:
+        assert factor_store.get_external_store() is None
+        assert factor_store.get_external_store() is None
+        assert len(calls) == 1
+    finally:
+        factor_store.reset_external_store()
+
+def test_uncached_store_is_removed(tmp_path):
+    """Test that a store imported without caching is deleted with the store."""
+    source = tmp_path / "factors.csv"
+    source.write_text(CSV, encoding="utf-8")
+    store = open_factor_store(source, cache=False)
+    store_path = store.path
+    assert len(store) == 2
+    assert not (tmp_path / "factors.csv.store").exists()
+    
+    del store
+    gc.collect()
+    assert not store_path.parent.exists()
+
+def test_empty_store(tmp_path):
+    """Test writing and reading a store without activities."""
+    store = write_factor_store(tmp_path / "store", [])
+    assert len(store) == 0
+    assert store.matrix.index_of("steel_kg") == -1
+    with pytest.raises(FileNotFoundError):
+        FactorStore(tmp_path / "missing")
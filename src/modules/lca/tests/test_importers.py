@@ -0,0 +1,87 @@
+"""
+Tests for the LCA module inventory importer.
+"""
+import os
+import sys
+import tempfile
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from models import LifeCycleStage, StageActivity
+from engine import FactorMatrix
+from bulk import BulkStageWriter
+from importers import import_inventory, iter_inventory_chunks
+from controllers import get_factor_matrix
+from core.data.database import Base
+
+INVENTORY = """stage,activity,quantity
+Raw Materials,material_steel_kg,100
+Raw Materials,unknown_activity,5
+Manufacturing,electricity_generation_coal_kwh,500
+Manufacturing,material_steel_kg,not a number
+,material_steel_kg,1
+Manufacturing,material_steel_kg,-3
+Raw Materials,material_steel_kg,10
+"""
+
+@pytest.fixture
+def inventory_file():
+    """Write the test inventory to a temporary CSV file."""
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as temp_file:
+        temp_file.write(INVENTORY)
+        temp_path = temp_file.name
+    yield temp_path
+    os.unlink(temp_path)
+
+@pytest.fixture
+def db_session():
+    """Create an in-memory database session for testing."""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+def test_iter_inventory_chunks(inventory_file):
+    """Test reading the inventory in chunks."""
+    chunks = list(iter_inventory_chunks(inventory_file, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert list(chunks[0].columns) == ["stage", "activity", "quantity"]
+    
+    with pytest.raises(ValueError):
+        list(iter_inventory_chunks("inventory.json"))
+
+def test_import_inventory(inventory_file):
+    """Test validation and impact aggregation across chunks."""
+    report = import_inventory(inventory_file, FactorMatrix.from_defaults(), chunk_size=2)
+    
+    assert report["rows"] == 7
+    assert report["valid_rows"] == 4
+    assert report["invalid_rows"] == 3
+    assert len(report["errors"]) == 3
+    assert report["errors"][0].startswith("Row 4:")
+    assert report["missing"] == {"unknown_activity": 1}
+    assert report["stages"]["Raw Materials"] == pytest.approx({"co2": 220.0, "water": 5500.0, "energy": 2750.0})
+    assert report["stages"]["Manufacturing"] == pytest.approx({"co2": 550.0, "water": 1000.0, "energy": 500.0})
+    assert report["totals"]["co2"] == pytest.approx(770.0)
+    assert report["rows_per_second"] > 0
+
+def test_import_inventory_to_database(inventory_file, db_session):
+    """Test streaming an inventory into the database."""
+    with BulkStageWriter(db_session, batch_size=2) as writer:
+        report = import_inventory(inventory_file, get_factor_matrix(db_session), writer=writer,
+                                  chunk_size=2)
+    
+    assert report["valid_rows"] == 4
+    assert db_session.query(LifeCycleStage).count() == 2
+    assert db_session.query(StageActivity).count() == 3
+    
+    stage = db_session.query(LifeCycleStage).filter_by(name="Raw Materials").one()
+    assert sorted(activity["quantity"] for activity in stage.activities_list) == [10.0, 100.0]
@@ -0,0 +1,129 @@
+"""
+Tests for the LCA module incremental calculation.
+"""
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from engine import FactorMatrix
+from incremental import IncrementalLCA
+from controllers import calculate_impact_breakdown, create_incremental_session
+
+@pytest.fixture
+def stages():
+    """Create test stages."""
+    return [
+        {
+            "name": "Raw Materials",
+            "activities": [
+                {"activity": "material_steel_kg", "quantity": 100},
+                {"activity": "material_plastic_kg", "quantity": 10}
+            ]
+        },
+        {
+            "name": "Manufacturing",
+            "activities": [{"activity": "electricity_generation_coal_kwh", "quantity": 500}]
+        }
+    ]
+
+def assert_matches_full(session, stages):
+    """Check a session against a full recalculation of the same stages."""
+    expected = calculate_impact_breakdown(stages)
+    for category, value in expected["totals"].items():
+        assert session.totals[category] == pytest.approx(value)
+    for stage_result, expected_stage in zip(session.stage_totals, expected["stages"]):
+        assert stage_result["name"] == expected_stage["name"]
+        for category, value in expected["totals"].items():
+            assert stage_result[category] == pytest.approx(expected_stage[category])
+
+def test_from_stages(stages):
+    """Test that a new session matches the full calculation."""
+    session = IncrementalLCA.from_stages(stages, FactorMatrix.from_defaults(), entry_ids=["a", "b", "c"])
+
+    assert session.n_entries == 3
+    assert session.entry_ids == ["a", "b", "c"]
+    assert "b" in session
+    assert_matches_full(session, stages)
+
+def test_edits(stages):
+    """Test quantity, activity, add and remove edits."""
+    session = IncrementalLCA.from_stages(stages, FactorMatrix.from_defaults())
+
+    session.update_entry(0, quantity=50)
+    stages[0]["activities"][0]["quantity"] = 50
+    assert_matches_full(session, stages)
+
+    session.update_entry(1, activity="material_aluminum_kg")
+    stages[0]["activities"][1]["activity"] = "material_aluminum_kg"
+    assert_matches_full(session, stages)
+
+    entry_id = session.add_entry(1, "transportation_truck_km", 200)
+    stages[1]["activities"].append({"activity": "transportation_truck_km", "quantity": 200})
+    assert_matches_full(session, stages)
+
+    session.remove_entry(entry_id)
+    stages[1]["activities"].pop()
+    assert_matches_full(session, stages)
+
+    with pytest.raises(KeyError):
+        session.remove_entry(entry_id)
+    with pytest.raises(KeyError):
+        session.add_entry(5, "material_steel_kg", 1)
+
+def test_missing_activities(stages):
+    """Test entries without factors, and giving them factors."""
+    session = IncrementalLCA.from_stages(stages, FactorMatrix.from_defaults())
+    before = session.totals
+
+    entry_id = session.add_entry(0, "unknown_activity", 3)
+    assert session.missing == {"unknown_activity": 1}
+    assert session.totals == before
+
+    session.set_factor("unknown_activity", {"co2": 1.0, "water": 2.0, "energy": 0.0})
+    assert session.missing == {}
+    assert session.totals["co2"] == pytest.approx(before["co2"] + 3.0)
+    assert session.stage_totals[0]["water"] == pytest.approx(5000.0 + 800.0 + 6.0)
+
+    session.update_entry(entry_id, activity="another_unknown")
+    assert session.missing == {"another_unknown": 1}
+    assert session.totals["co2"] == pytest.approx(before["co2"])
+
+def test_set_factor(stages):
+    """Test that factor changes update every stage using the activity."""
+    factors = FactorMatrix.from_defaults()
+    session = IncrementalLCA.from_stages(stages, factors)
+    session.add_entry(1, "material_steel_kg", 10)
+
+    session.set_factor("material_steel_kg", [3.0, 50.0, 25.0])
+    assert session.stage_totals[0]["co2"] == pytest.approx(300.0 + 30.0)
+    assert session.stage_totals[1]["co2"] == pytest.approx(550.0 + 30.0)
+    # The shared factor matrix is not modified
+    assert factors.values[factors.index_of("material_steel_kg"), 0] == 2.0
+
+def test_recompute_bounds_drift():
+    """Test that many edits stay close to the exact result and trigger recomputation."""
+    factors = FactorMatrix(["a"], np.array([[0.1, 0.0, 0.0]]))
+    session = IncrementalLCA(factors, recompute_interval=100)
+    stage = session.add_stage("Stage")
+    session.add_entry(stage, "a", 1.0, entry_id="x")
+
+    rng = np.random.default_rng(0)
+    for quantity in rng.uniform(0, 1e6, 1050):
+        session.update_entry("x", quantity=quantity)
+
+    # Recomputed every 100 edits; only the last 51 accumulate rounding error
+    assert session._edits == 51
+    assert session.recompute() < 1e-6
+    assert session.totals["co2"] == pytest.approx(0.1 * quantity)
+
+def test_create_incremental_session(stages):
+    """Test the controller session."""
+    session = create_incremental_session(stages)
+
+    assert_matches_full(session, stages)
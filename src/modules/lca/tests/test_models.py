@@ -1,12 +1,19 @@
 """
 Tests for the LCA module models.
 """
+import os
+import sys
 import json
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from src.modules.lca.src.models import LifeCycleStage, ImpactFactor
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from models import LifeCycleStage, ImpactFactor, StageActivity
 from core.data.database import Base
 
 @pytest.fixture
@@ -91,4 +98,45 @@ def test_life_cycle_stage_creation(db_session):
         "name": "Manufacturing",
         "activities": new_activities,
         "project_id": None
-    }
\ No newline at end of file
+    }
+
+def test_stage_activity_normalization(db_session):
+    """Test moving stage activities from JSON to StageActivity rows."""
+    steel = ImpactFactor(activity="material_steel_kg", co2=2.0, water=50.0, energy=25.0)
+    db_session.add(steel)
+    db_session.commit()
+    
+    activities = [{"activity": "material_steel_kg", "quantity": 200.0}]
+    stage = LifeCycleStage(name="Raw Materials")
+    stage.activities_list = activities
+    
+    # Unknown activities leave the JSON column untouched
+    assert not stage.normalize_activities({})
+    assert stage.activities is not None
+    
+    assert stage.normalize_activities({"material_steel_kg": steel.id})
+    db_session.add(stage)
+    db_session.commit()
+    
+    retrieved = db_session.query(LifeCycleStage).first()
+    assert retrieved.activities is None
+    assert len(retrieved.stage_activities) == 1
+    assert retrieved.stage_activities[0].impact_factor.activity == "material_steel_kg"
+    assert retrieved.activities_list == activities
+    
+    # Deleting the stage removes its activity rows
+    db_session.delete(retrieved)
+    db_session.commit()
+    assert db_session.query(StageActivity).count() == 0
+    
+    # Known activities are normalized even when others are unknown
+    activities = [{"activity": "unknown_activity", "quantity": 1.0},
+                  {"activity": "material_steel_kg", "quantity": 200.0}]
+    stage = LifeCycleStage(name="Mixed")
+    stage.activities_list = activities
+    assert not stage.normalize_activities({"material_steel_kg": steel.id})
+    db_session.add(stage)
+    db_session.commit()
+    assert len(stage.stage_activities) == 1
+    assert json.loads(stage.activities) == activities[:1]
+    assert stage.activities_list == activities[1:] + activities[:1]
@@ -0,0 +1,133 @@
+"""
+Tests for the LCA module Monte Carlo engine.
+"""
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from engine import (
+    FactorMatrix, UncertaintySpec, encode_stages, total_impacts
+)
+from monte_carlo import sample_multipliers, run_monte_carlo
+import controllers
+from controllers import calculate_impact_uncertainty
+
+@pytest.fixture
+def stages():
+    """Create test stages."""
+    return [
+        {
+            "name": "Raw Materials",
+            "activities": [{"activity": "material_steel_kg", "quantity": 100}]
+        },
+        {
+            "name": "Manufacturing",
+            "activities": [{"activity": "electricity_generation_coal_kwh", "quantity": 500}]
+        }
+    ]
+
+def test_sample_multipliers():
+    """Test the lognormal and triangular samplers."""
+    spec = UncertaintySpec(
+        kind=np.array([0, 1, 2], dtype=np.int8),
+        sigma=np.array([0.0, 0.2, 0.0]),
+        low=np.array([1.0, 1.0, 0.5]),
+        high=np.array([1.0, 1.0, 2.0])
+    )
+    rng = np.random.default_rng(42)
+    multipliers = sample_multipliers(rng, spec, 20000)
+    
+    assert multipliers.shape == (20000, 3)
+    assert np.all(multipliers[:, 0] == 1.0)
+    assert np.median(multipliers[:, 1]) == pytest.approx(1.0, abs=0.01)
+    assert np.std(np.log(multipliers[:, 1])) == pytest.approx(0.2, abs=0.01)
+    assert multipliers[:, 2].min() >= 0.5
+    assert multipliers[:, 2].max() <= 2.0
+    # Mean of a triangular distribution is (low + mode + high) / 3
+    assert multipliers[:, 2].mean() == pytest.approx(3.5 / 3, abs=0.01)
+
+def test_uncertainty_from_factor_dict():
+    """Test that zero bounds are kept and bounds must enclose 1."""
+    factors = {
+        "a": {"uncertainty_type": "triangular", "uncertainty_min": 0.0, "uncertainty_max": 2.0},
+        "b": {"uncertainty_type": "lognormal", "uncertainty_sigma": 0.1},
+        "c": {}
+    }
+    spec = UncertaintySpec.from_factor_dict(factors, ["a", "b", "c"])
+    
+    assert list(spec.kind) == [2, 1, 0]
+    assert list(spec.low) == [0.0, 1.0, 1.0]
+    assert list(spec.high) == [2.0, 1.0, 1.0]
+    
+    factors["a"]["uncertainty_min"] = 1.2
+    with pytest.raises(ValueError):
+        UncertaintySpec.from_factor_dict(factors, ["a", "b", "c"])
+    factors["a"].update(uncertainty_min=0.5, uncertainty_max=0.0)
+    with pytest.raises(ValueError):
+        UncertaintySpec.from_factor_dict(factors, ["a", "b", "c"])
+
+def test_run_monte_carlo_without_uncertainty(stages):
+    """Test that fixed factors reproduce the deterministic result."""
+    factors = FactorMatrix.from_defaults()
+    inventory = encode_stages(stages, factors)
+    spec = UncertaintySpec.uniform(factors.n_activities, None)
+    
+    result = run_monte_carlo(inventory, factors, spec, max_samples=100, block_size=30)
+    
+    assert result.n_samples == 100
+    np.testing.assert_allclose(result.samples, np.tile(total_impacts(inventory, factors), (100, 1)))
+
+def test_run_monte_carlo_progress(stages):
+    """Test progress reports and stopping the run from the progress callback."""
+    factors = FactorMatrix.from_defaults()
+    inventory = encode_stages(stages, factors)
+    spec = UncertaintySpec.uniform(factors.n_activities, "lognormal", sigma=0.1)
+    
+    reports = []
+    run_monte_carlo(inventory, factors, spec, max_samples=100, block_size=30,
+                    progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(30, 100), (60, 100), (90, 100), (100, 100)]
+    
+    def cancel(done, total):
+        raise KeyboardInterrupt()
+    
+    with pytest.raises(KeyboardInterrupt):
+        run_monte_carlo(inventory, factors, spec, max_samples=100, block_size=30, progress=cancel)
+
+def test_run_monte_carlo_reproducible(stages):
+    """Test that results depend on the seed but not on the number of workers."""
+    factors = FactorMatrix.from_defaults()
+    inventory = encode_stages(stages, factors)
+    spec = UncertaintySpec.uniform(factors.n_activities, "lognormal", sigma=0.1)
+    
+    kwargs = dict(max_samples=8000, block_size=500, min_samples=1000, tolerance=0.01, seed=7)
+    serial = run_monte_carlo(inventory, factors, spec, **kwargs)
+    parallel = run_monte_carlo(inventory, factors, spec, max_workers=2, **kwargs)
+    
+    np.testing.assert_array_equal(serial.samples, parallel.samples)
+    assert serial.converged
+    # Convergence is checked after min_samples and whenever the sample count has doubled
+    assert serial.n_samples in (1000, 2000, 4000)
+
+def test_calculate_impact_uncertainty(stages, monkeypatch):
+    """Test the controller uncertainty summary."""
+    # Factors without a stored distribution have no uncertainty by default
+    results = calculate_impact_uncertainty(stages, n_samples=5000, seed=1)
+    assert results["uncertain_factors"] == 0
+    assert results["co2"]["p5"] == pytest.approx(results["co2"]["p95"])
+    
+    monkeypatch.setitem(controllers.UNCERTAINTY, "default_distribution", "lognormal")
+    results = calculate_impact_uncertainty(stages, n_samples=5000, seed=1)
+    
+    assert results["uncertain_factors"] == 2
+    assert results["samples"] <= 5000
+    for category, expected in (("co2", 750.0), ("water", 6000.0), ("energy", 3000.0)):
+        summary = results[category]
+        assert summary["p5"] < summary["p50"] < summary["p95"]
+        assert summary["p50"] == pytest.approx(expected, rel=0.05)
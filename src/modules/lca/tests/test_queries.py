@@ -0,0 +1,108 @@
+"""
+Tests for the LCA module SQL queries and migrations.
+"""
+import os
+import sys
+import json
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from models import LifeCycleStage, ImpactFactor, StageActivity
+from migrations import migrate_stage_activities
+from queries import stage_impact_totals, impact_rollup
+from core.data.models import Project
+from core.data.database import Base
+
+@pytest.fixture
+def db_session():
+    """Create an in-memory database session for testing."""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+def test_migrate_and_sum_stage_activities(db_session):
+    """Test migrating JSON activities and summing them in SQL."""
+    stages = [
+        LifeCycleStage(name="Raw Materials", activities=json.dumps([
+            {"activity": "material_steel_kg", "quantity": 100},
+            {"activity": "material_steel_kg", "quantity": 10}
+        ])),
+        LifeCycleStage(name="Manufacturing", activities=json.dumps([
+            {"activity": "electricity_generation_coal_kwh", "quantity": 500}
+        ])),
+        LifeCycleStage(name="Unknown", activities=json.dumps([
+            {"activity": "unknown_activity", "quantity": 1},
+            {"activity": "electricity_generation_coal_kwh", "quantity": 100}
+        ]))
+    ]
+    db_session.add_all(stages)
+    db_session.commit()
+    
+    result = migrate_stage_activities(db_session, batch_size=2)
+    assert result == {"migrated": 2, "skipped": 1}
+    assert db_session.query(StageActivity).count() == 4
+    
+    # Migrating again is a no-op for migrated stages
+    assert migrate_stage_activities(db_session) == {"migrated": 0, "skipped": 1}
+    
+    totals = stage_impact_totals(db_session)
+    assert totals[stages[0].id] == pytest.approx({"co2": 220.0, "water": 5500.0, "energy": 2750.0})
+    assert totals[stages[1].id] == pytest.approx({"co2": 550.0, "water": 1000.0, "energy": 500.0})
+    
+    # The known activities of a stage with an unknown one are still summed
+    assert totals[stages[2].id] == pytest.approx({"co2": 110.0, "water": 200.0, "energy": 100.0})
+    assert json.loads(stages[2].activities) == [{"activity": "unknown_activity", "quantity": 1}]
+    
+    assert list(stage_impact_totals(db_session, [stages[1].id])) == [stages[1].id]
+
+def test_impact_rollup(db_session):
+    """Test project and stage rollups returned as columnar arrays."""
+    projects = [Project(name="Plant A"), Project(name="Plant B")]
+    db_session.add_all(projects)
+    db_session.commit()
+    
+    steel = ImpactFactor(activity="material_steel_kg", co2=2.0, water=50.0, energy=25.0)
+    coal = ImpactFactor(activity="electricity_generation_coal_kwh", co2=1.1, water=2.0, energy=1.0)
+    db_session.add_all([steel, coal])
+    db_session.commit()
+    
+    stages = [
+        LifeCycleStage(name="Raw Materials", project_id=projects[0].id,
+                       stage_activities=[StageActivity(activity_id=steel.id, quantity=100)]),
+        LifeCycleStage(name="Manufacturing", project_id=projects[0].id,
+                       stage_activities=[StageActivity(activity_id=coal.id, quantity=500)]),
+        LifeCycleStage(name="Raw Materials", project_id=projects[1].id,
+                       stage_activities=[StageActivity(activity_id=steel.id, quantity=10),
+                                         StageActivity(activity_id=coal.id, quantity=10)]),
+        LifeCycleStage(name="Unassigned",
+                       stage_activities=[StageActivity(activity_id=steel.id, quantity=1)])
+    ]
+    db_session.add_all(stages)
+    db_session.commit()
+    
+    rollup = impact_rollup(db_session)
+    assert list(rollup["project_id"]) == [projects[0].id, projects[1].id]
+    np.testing.assert_allclose(rollup["co2"], [750.0, 31.0])
+    np.testing.assert_allclose(rollup["water"], [6000.0, 520.0])
+    np.testing.assert_allclose(rollup["energy"], [3000.0, 260.0])
+    
+    by_stage = impact_rollup(db_session, project_ids=[projects[0].id], by_stage=True)
+    assert list(by_stage["stage_id"]) == [stages[0].id, stages[1].id]
+    np.testing.assert_allclose(by_stage["co2"], [200.0, 550.0])
+    
+    frame = impact_rollup(db_session, as_frame=True)
+    assert list(frame.columns) == ["project_id", "co2", "water", "energy"]
+    assert len(frame) == 2
+    
+    empty = impact_rollup(db_session, project_ids=[999])
+    assert empty["co2"].shape == (0,)
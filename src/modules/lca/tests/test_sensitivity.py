@@ -0,0 +1,147 @@
+"""
+Tests for the LCA module sensitivity analysis.
+"""
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from engine import FactorMatrix, UncertaintySpec, encode_stages
+from monte_carlo import triangular_ppf
+from sensitivity import (
+    SensitivityProblem, run_sobol, local_sensitivities, QUANTITY, FACTOR,
+    _evaluate, _evaluate_mixed, _other_multipliers
+)
+from controllers import calculate_sensitivity
+
+@pytest.fixture
+def factors():
+    """Create a two-activity factor matrix."""
+    return FactorMatrix(["a", "b"], np.array([[1.0, 2.0, 0.0], [1.0, 1.0, 0.0]]))
+
+@pytest.fixture
+def inventory(factors):
+    """Create an inventory where 'b' contributes twice as much CO2 as 'a'."""
+    stages = [
+        {"name": "One", "activities": [{"activity": "a", "quantity": 1.0}]},
+        {"name": "Two", "activities": [{"activity": "b", "quantity": 2.0}]}
+    ]
+    return encode_stages(stages, factors)
+
+def test_triangular_ppf():
+    """Test the triangular inverse CDF at its bounds and mode."""
+    low = np.array([0.5, 0.8])
+    high = np.array([1.5, 2.0])
+    u = np.array([[0.0, 0.0], [0.999999, 0.999999]])
+
+    x = triangular_ppf(u, low, high)
+    np.testing.assert_allclose(x[0], low)
+    np.testing.assert_allclose(x[1], high, rtol=1e-2)
+    # The mode (1) sits at u = (1 - low) / (high - low)
+    split = (1.0 - low) / (high - low)
+    np.testing.assert_allclose(triangular_ppf(split[np.newaxis], low, high), [[1.0, 1.0]])
+
+def test_problem_parameters(factors, inventory):
+    """Test that only uncertain factors become factor parameters."""
+    spec = UncertaintySpec(
+        kind=np.array([2, 0], dtype=np.int8),
+        sigma=np.zeros(2),
+        low=np.array([0.5, 1.0]),
+        high=np.array([1.5, 1.0])
+    )
+    problem = SensitivityProblem(inventory, factors, spec, quantity_range=0.1)
+
+    assert problem.parameters == [
+        {"activity": "a", "parameter": QUANTITY},
+        {"activity": "b", "parameter": QUANTITY},
+        {"activity": "a", "parameter": FACTOR}
+    ]
+
+    with pytest.raises(ValueError):
+        run_sobol(SensitivityProblem(inventory, factors, spec.take(np.array([1, 1])), quantity_range=0.0))
+
+def test_mixed_evaluation_matches_full_matrices(factors, inventory):
+    """Test the rank-one AB_i outputs against evaluating the AB_i matrices."""
+    spec = UncertaintySpec.uniform(factors.n_activities, "lognormal", sigma=0.3)
+    problem = SensitivityProblem(inventory, factors, spec, quantity_range=0.2)
+    rng = np.random.default_rng(0)
+    a = problem.multipliers(rng.random((16, problem.n_parameters)))
+    b = problem.multipliers(rng.random((16, problem.n_parameters)))
+    args = (problem.quantities, problem.factor_rows, problem.position, problem.is_factor)
+
+    scale = (b - a) * problem.quantities[problem.position]
+    scale *= _other_multipliers(a, problem.position, problem.is_factor, problem.quantities.shape[0])
+    f_ab = _evaluate_mixed(_evaluate(a, *args), scale, problem.factor_rows[problem.position])
+
+    for i in range(problem.n_parameters):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        np.testing.assert_allclose(f_ab[i], _evaluate(ab, *args))
+
+def test_sobol_indices_of_linear_model(factors, inventory):
+    """Test the indices against the analytical values of an additive model."""
+    # Equal relative variances, so indices are proportional to squared contributions
+    spec = UncertaintySpec.uniform(factors.n_activities, "triangular", low=0.5, high=1.5)
+    problem = SensitivityProblem(inventory, factors, spec, quantity_range=0.0)
+
+    result = run_sobol(problem, base_samples=4096, n_bootstrap=100, seed=3)
+    co2 = result.as_dict["co2"]
+
+    # co2 = 1 * x_a + 2 * x_b
+    np.testing.assert_allclose(co2["first_order"], [0.2, 0.8], atol=0.03)
+    np.testing.assert_allclose(co2["total"], [0.2, 0.8], atol=0.03)
+    for (low, high), value in zip(co2["first_order_ci"], co2["first_order"]):
+        assert low <= value <= high
+    # A category without variance gets zero indices rather than NaN
+    assert result.as_dict["energy"]["first_order"] == [0.0, 0.0]
+    assert result.n_evaluations == 4096 * 4
+
+def test_run_sobol_convergence(factors, inventory):
+    """Test that sampling doubles until the tolerance is met and reports progress."""
+    spec = UncertaintySpec.uniform(factors.n_activities, "lognormal", sigma=0.2)
+    problem = SensitivityProblem(inventory, factors, spec, quantity_range=0.1)
+
+    reports = []
+    result = run_sobol(problem, base_samples=64, max_samples=1024, tolerance=1e-6, chunk_size=3,
+                       seed=1, progress=lambda done, total: reports.append((done, total)))
+
+    assert not result.converged
+    assert reports == [(64, 1024), (128, 1024), (256, 1024), (512, 1024), (1024, 1024)]
+    assert [round_["samples"] for round_ in result.history] == [64, 128, 256, 512, 1024]
+
+def test_run_sobol_reproducible(factors, inventory):
+    """Test that results depend on the seed but not on the number of workers."""
+    spec = UncertaintySpec.uniform(factors.n_activities, "lognormal", sigma=0.2)
+    problem = SensitivityProblem(inventory, factors, spec)
+
+    serial = run_sobol(problem, base_samples=256, chunk_size=1, seed=5)
+    parallel = run_sobol(problem, base_samples=256, chunk_size=1, seed=5, max_workers=2)
+
+    np.testing.assert_array_equal(serial.first_order, parallel.first_order)
+    np.testing.assert_array_equal(serial.total_ci, parallel.total_ci)
+
+def test_local_sensitivities(factors, inventory):
+    """Test that one-at-a-time sensitivities are the contribution shares."""
+    result = local_sensitivities(inventory, factors)
+
+    assert result["activities"] == ["a", "b"]
+    np.testing.assert_allclose(result["co2"], [1.0 / 3.0, 2.0 / 3.0])
+    np.testing.assert_allclose(result["water"], [0.5, 0.5])
+    assert result["energy"] == [0.0, 0.0]
+
+def test_calculate_sensitivity():
+    """Test the controller sensitivity summary."""
+    stages = [
+        {"name": "Raw Materials", "activities": [{"activity": "material_steel_kg", "quantity": 100}]},
+        {"name": "Manufacturing", "activities": [{"activity": "electricity_generation_coal_kwh", "quantity": 500}]}
+    ]
+    results = calculate_sensitivity(stages, n_samples=512, seed=2)
+
+    assert results["samples"] <= 512
+    assert len(results["parameters"]) == len(results["co2"]["first_order"])
+    assert sorted(results["local"]["activities"]) == ["electricity_generation_coal_kwh", "material_steel_kg"]
@@ -0,0 +1,122 @@
+"""
+Tests for the LCA module stage result cache.
+"""
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from engine import FactorMatrix, encode_stages, stage_impacts
+from stage_cache import (
+    StageCache, factor_fingerprint, stage_key, cached_stage_impacts, ENTRY_OVERHEAD
+)
+import controllers
+
+@pytest.fixture
+def stages():
+    """Create test stages, the first and last with the same activities."""
+    transport = {"name": "Transport", "activities": [
+        {"activity": "transportation_truck_km", "quantity": 200},
+        {"activity": "transportation_rail_km", "quantity": 500}
+    ]}
+    return [
+        transport,
+        {"name": "Manufacturing", "activities": [{"activity": "electricity_generation_coal_kwh", "quantity": 500}]},
+        {"name": "Delivery", "activities": list(reversed(transport["activities"]))}
+    ]
+
+def test_stage_key(stages):
+    """Test that keys ignore names and order but not quantities or factors."""
+    factors = FactorMatrix.from_defaults()
+    fingerprint = factor_fingerprint(factors)
+
+    assert factor_fingerprint(factors) == fingerprint
+    assert stage_key(stages[0], fingerprint) == stage_key(stages[2], fingerprint)
+    assert stage_key(stages[0], fingerprint) != stage_key(stages[1], fingerprint)
+
+    changed = {"name": "Transport", "activities": [{"activity": "transportation_truck_km", "quantity": 201}]}
+    assert stage_key(changed, fingerprint) != stage_key(stages[0], fingerprint)
+
+    other = FactorMatrix(factors.activities, factors.values * 2)
+    assert factor_fingerprint(other) != fingerprint
+
+def test_cached_stage_impacts(stages):
+    """Test that each distinct stage is computed once and results match the engine."""
+    factors = FactorMatrix.from_defaults()
+    cache = StageCache()
+    computed = []
+
+    def compute(pending):
+        computed.append(len(pending))
+        return stage_impacts(encode_stages(pending, factors), factors)
+
+    expected = stage_impacts(encode_stages(stages, factors), factors)
+    np.testing.assert_allclose(cached_stage_impacts(stages, factors, cache, compute), expected)
+    np.testing.assert_allclose(cached_stage_impacts(stages, factors, cache, compute), expected)
+
+    # Two distinct stages computed on the first call, nothing on the second
+    assert computed == [2]
+    stats = cache.stats
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert stats["hit_rate"] == 0.5
+
+def test_lru_eviction():
+    """Test eviction by entry count and by size."""
+    values = np.zeros(3)
+    cache = StageCache(max_entries=2)
+    cache.put_many([("a", values), ("b", values)])
+    cache.get_many(["a"])
+    cache.put_many([("c", values)])
+
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+    assert cache.stats["evictions"] == 1
+
+    entry_size = 1 + values.nbytes + ENTRY_OVERHEAD
+    cache = StageCache(max_bytes=3 * entry_size)
+    cache.put_many([(key, values) for key in "abcd"])
+    assert len(cache) == 3
+    assert cache.bytes == 3 * entry_size
+
+def test_persistent_tier(tmp_path):
+    """Test that results survive in the SQLite file and are pruned to its bound."""
+    path = tmp_path / "stage_cache.db"
+    cache = StageCache(path=path, max_disk_entries=2)
+    cache.put_many([("a", np.array([1.0, 2.0, 3.0]))])
+    cache.put_many([("b", np.array([4.0, 5.0, 6.0]))])
+    cache.close()
+
+    reopened = StageCache(path=path, max_disk_entries=2)
+    found = reopened.get_many(["b", "x"])
+    np.testing.assert_array_equal(found["b"], [4.0, 5.0, 6.0])
+    assert reopened.stats["disk_hits"] == 1
+    assert reopened.stats["misses"] == 1
+
+    # "a" is the least recently used entry, so it is deleted to make room for "c"
+    assert reopened.stats["disk_entries"] == 2
+    reopened.put_many([("c", np.zeros(3))])
+    reopened.put_many([("c", np.ones(3))])
+    assert reopened.stats["disk_entries"] == 2
+    reopened.clear()
+    found = reopened.get_many(["a", "b", "c"])
+    assert set(found) == {"b", "c"}
+    np.testing.assert_array_equal(found["c"], np.ones(3))
+    reopened.close()
+
+def test_missing_activities_reported_on_cache_hits(monkeypatch):
+    """Test that activities without factors are reported for cached stages too."""
+    reported = []
+    monkeypatch.setattr(controllers, "_log_missing_activities", reported.append)
+    stages = [{"name": "Partly Unknown", "activities": [
+        {"activity": "material_steel_kg", "quantity": 1},
+        {"activity": "unknown_activity", "quantity": 2}
+    ]}]
+
+    first = controllers.calculate_impact_breakdown(stages)
+    second = controllers.calculate_impact_breakdown(stages)
+    assert second == first
+    assert reported == [{"unknown_activity": 1}, {"unknown_activity": 1}]
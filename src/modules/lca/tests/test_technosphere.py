@@ -0,0 +1,96 @@
+"""
+Tests for the LCA module technosphere solver.
+"""
+import os
+import sys
+import numpy as np
+import pytest
+import scipy.sparse as sparse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from models import ImpactFactor, ProcessExchange
+from engine import FactorMatrix
+from technosphere import Technosphere
+from factor_cache import factor_cache
+from controllers import calculate_impact_linked, get_technosphere
+from core.data.database import Base
+
+@pytest.fixture
+def db_session():
+    """Create an in-memory database session for testing."""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+def make_chain() -> Technosphere:
+    """Steel consumes electricity and transport; transport consumes electricity."""
+    factors = FactorMatrix(
+        ["steel", "electricity", "transport"],
+        np.array([[2.0, 10.0, 5.0],
+                  [0.5, 1.0, 1.0],
+                  [0.1, 0.0, 0.2]])
+    )
+    # steel <- 3 electricity + 2 transport; transport <- 0.5 electricity
+    return Technosphere.from_exchanges(factors, [0, 0, 2], [1, 2, 1], [3.0, 2.0, 0.5])
+
+def test_supply_and_impacts():
+    """Test solving (I - A)x = f for one and several demands."""
+    technosphere = make_chain()
+    assert technosphere.n_exchanges == 3
+    
+    supply = technosphere.supply(np.array([1.0, 0.0, 0.0]))
+    np.testing.assert_allclose(supply, [1.0, 4.0, 2.0])
+    
+    # Direct impacts of the supply: 1 steel + 4 electricity + 2 transport
+    np.testing.assert_allclose(technosphere.impacts(np.array([1.0, 0.0, 0.0])), [4.2, 14.0, 9.4])
+    
+    # The factorization is reused for a matrix of demands
+    assert technosphere.is_factorized
+    demands = np.eye(3)
+    impacts = technosphere.impacts(demands)
+    assert impacts.shape == (3, 3)
+    np.testing.assert_allclose(impacts[1], [0.5, 1.0, 1.0])
+
+def test_cumulative_factors_match_solve():
+    """Test that cumulative factors give the same impacts as solving the demand."""
+    technosphere = make_chain()
+    cumulative = technosphere.cumulative_factors()
+    np.testing.assert_allclose(cumulative.values, technosphere.impacts(np.eye(3)))
+    assert cumulative.index_of("transport") == 2
+
+def test_singular_network():
+    """Test that a network producing less than it consumes is rejected."""
+    factors = FactorMatrix(["a", "b"], np.ones((2, 3)))
+    technosphere = Technosphere(factors, sparse.csr_matrix(np.array([[0.0, 1.0], [1.0, 0.0]])))
+    with pytest.raises(ValueError):
+        technosphere.factorize()
+
+def test_linked_calculation_from_database(db_session):
+    """Test linked impacts from ProcessExchange rows and cache invalidation."""
+    steel = ImpactFactor(activity="steel", co2=2.0, water=10.0, energy=5.0)
+    electricity = ImpactFactor(activity="electricity", co2=0.5, water=1.0, energy=1.0)
+    db_session.add_all([steel, electricity])
+    db_session.flush()
+    db_session.add(ProcessExchange(process_id=steel.id, input_id=electricity.id, amount=3.0))
+    db_session.commit()
+    
+    stages = [{"name": "Production", "activities": [{"activity": "steel", "quantity": 2.0}]}]
+    results = calculate_impact_linked(stages, db_session)
+    assert results["co2"] == pytest.approx(2 * (2.0 + 3 * 0.5))
+    assert get_technosphere(db_session) is get_technosphere(db_session)
+    
+    # Changing an exchange invalidates the cached factorization
+    version = factor_cache.version
+    db_session.query(ProcessExchange).one().amount = 1.0
+    db_session.commit()
+    assert factor_cache.version > version
+    assert calculate_impact_linked(stages, db_session)["co2"] == pytest.approx(2 * (2.0 + 0.5))
@@ -1,6 +1,8 @@
 """
 Tests for the LCA module views.
 """
+import os
+import sys
 import pytest
 from unittest.mock import MagicMock, patch
 from PyQt5.QtWidgets import QApplication
@@ -8,7 +10,12 @@ from PyQt5.QtWidgets import QApplication
 # Create a QApplication instance for testing
 app = QApplication([])
 
-from src.modules.lca.src.views import ActivityEntryWidget, LCAView
+# Add the project root, source directory and LCA module source to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from views import ActivityEntryWidget, LCAView
 
 def test_activity_entry_widget():
     """Test the ActivityEntryWidget."""
@@ -28,7 +35,7 @@ def test_activity_entry_widget():
     data = widget.get_activity_data()
     assert data == {"activity": "electricity_generation_coal_kwh", "quantity": 100.0}
 
-@patch('src.modules.lca.src.views.QMessageBox')
+@patch('views.QMessageBox')
 def test_lca_view(mock_messagebox):
     """Test the LCAView."""
     view = LCAView()
@@ -61,10 +68,12 @@ def test_lca_view(mock_messagebox):
     # Test on_calculate method with valid input
     view.stage_name_input.setText("Manufacturing")
     
-    # Mock the calculate_impact function
-    with patch('src.modules.lca.src.controllers.calculate_impact') as mock_calculate:
-        mock_calculate.return_value = {"co2": 100.0, "water": 200.0, "energy": 300.0}
+    # Mock the create_incremental_session function
+    with patch('controllers.create_incremental_session') as mock_calculate:
+        mock_calculate.return_value.totals = {"co2": 100.0, "water": 200.0, "energy": 300.0}
+        mock_calculate.return_value.entry_ids = []
         view.on_calculate()
+        assert view.task_runner.wait(timeout=10)
         mock_calculate.assert_called_once()
     
     # Test on_export method with no results
@@ -75,4 +84,25 @@ def test_lca_view(mock_messagebox):
     # Test on_clear method
     view.stage_name_input.setText("Test Stage")
     view.on_clear()
-    assert view.stage_name_input.text() == ""
\ No newline at end of file
+    assert view.stage_name_input.text() == ""
+
+def test_hotspots_use_activities_edited_during_calculation():
+    """Test that hotspots are found for the activities shown when the calculation finishes."""
+    from controllers import create_incremental_session
+    
+    view = LCAView()
+    widget = view.get_activity_widgets()[0]
+    widget.activity_dropdown.setCurrentText("electricity_generation_coal_kwh")
+    widget.quantity_input.setValue(100.0)
+    stage = {"name": "Manufacturing", "activities": view.get_activities()}
+    entry_ids = [widget.entry_id for widget in view.get_activity_widgets()]
+    session = create_incremental_session([stage], entry_ids)
+    
+    # The quantity is edited before the calculation finishes
+    widget.quantity_input.setValue(250.0)
+    with patch.object(view, "run_async") as mock_run_async:
+        view.on_session_ready(session, stage)
+    
+    stages = mock_run_async.call_args[0][1]
+    assert stages == [{"name": "Manufacturing", "activities": view.get_activities()}]
+    assert stages[0]["activities"][0] == {"activity": "electricity_generation_coal_kwh", "quantity": 250.0}
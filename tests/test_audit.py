@@ -0,0 +1,134 @@
+"""
+Tests for the asynchronous audit log writer and audit trail queries.
+"""
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+# Add the project root and source directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from core.data.database import Base, configure_database, create_db_engine, session_scope, init_db
+from core.data.models import User, Audit
+from core.data.audit import (
+    AuditWriter, enable_auditing, disable_auditing, get_audit_page, iter_audit_trail
+)
+
+@pytest.fixture
+def writer():
+    """Run auditing against a fresh in-memory database."""
+    configure_database("sqlite:///:memory:")
+    init_db()
+    writer = enable_auditing(AuditWriter(batch_size=2, flush_interval=0.01))
+    yield writer
+    disable_auditing()
+
+def test_committed_changes_are_audited(writer):
+    """Test that creates, updates and deletes are written after commit."""
+    with session_scope() as db:
+        db.info["user_id"] = 7
+        user = User(name="Test User", email="test@example.com")
+        db.add(user)
+        db.flush()
+        user_id = user.id
+
+    with session_scope() as db:
+        user = db.get(User, user_id)
+        user.name = "Renamed"
+
+    with session_scope() as db:
+        db.delete(db.get(User, user_id))
+
+    writer.flush()
+
+    with session_scope() as db:
+        records = db.query(Audit).order_by(Audit.id).all()
+        assert [record.action for record in records] == ["create", "update", "delete"]
+        assert all(record.entity_type == "User" and record.entity_id == user_id for record in records)
+        assert records[0].user_id == 7
+        assert json.loads(records[0].changes)["email"] == "test@example.com"
+        assert json.loads(records[1].changes) == {"name": ["Test User", "Renamed"]}
+
+    assert writer.written == 3
+    assert writer.dropped == 0
+
+def test_records_are_written_to_the_session_database(writer):
+    """Test that a session bound to another engine gets its own audit rows."""
+    engine = create_db_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = Session(bind=engine)
+    db.add(User(name="Other", email="other@example.com"))
+    db.commit()
+    writer.flush()
+
+    assert db.query(Audit).count() == 1
+    db.close()
+    with session_scope() as app_db:
+        assert app_db.query(Audit).count() == 0
+
+def test_rolled_back_changes_are_not_audited(writer):
+    """Test that records of a rolled-back transaction are discarded."""
+    with pytest.raises(RuntimeError):
+        with session_scope() as db:
+            db.add(User(name="Rolled Back", email="rollback@example.com"))
+            db.flush()
+            raise RuntimeError("abort")
+
+    writer.flush()
+
+    with session_scope() as db:
+        assert db.query(Audit).count() == 0
+
+def test_stop_writes_queued_records():
+    """Test that stopping the writer drains the queue."""
+    configure_database("sqlite:///:memory:")
+    init_db()
+    writer = AuditWriter(batch_size=100, flush_interval=60)
+    writer.start()
+    writer.submit([
+        {"user_id": None, "action": "create",
+         "entity_type": "Project", "entity_id": i, "changes": "{}"}
+        for i in range(5)
+    ])
+    writer.stop()
+
+    with session_scope() as db:
+        assert db.query(Audit).count() == 5
+
+def test_paginated_audit_trail():
+    """Test filtering and keyset pagination of the audit trail."""
+    configure_database("sqlite:///:memory:")
+    init_db()
+    start = datetime(2024, 1, 1)
+    with session_scope() as db:
+        db.execute(insert(Audit.__table__), [
+            {"user_id": i % 2, "timestamp": start + timedelta(hours=i // 3), "action": "update",
+             "entity_type": "Project", "entity_id": i % 4, "changes": "{}"}
+            for i in range(30)
+        ])
+
+    with session_scope() as db:
+        records, cursor = get_audit_page(db, limit=7)
+        assert len(records) == 7
+        assert cursor == (records[-1].timestamp, records[-1].id)
+        assert records[0].timestamp == start + timedelta(hours=9)
+
+        # Paging through gives every row exactly once, newest first
+        trail = list(iter_audit_trail(db, page_size=7))
+        assert [record.id for record in trail] == sorted(range(1, 31), key=lambda i: (-((i - 1) // 3), -i))
+        assert [record.id for record in iter_audit_trail(db, page_size=4, newest_first=False)] == list(range(1, 31))
+
+        history = list(iter_audit_trail(db, entity_type="Project", entity_id=1, page_size=2))
+        assert [record.id for record in history] == [30, 26, 22, 18, 14, 10, 6, 2]
+
+        window = list(iter_audit_trail(db, user_id=0, since=start + timedelta(hours=2),
+                                       until=start + timedelta(hours=4)))
+        assert [record.id for record in window] == [11, 9, 7]
+
+        assert get_audit_page(db, entity_type="User") == ([], None)
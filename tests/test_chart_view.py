@@ -0,0 +1,94 @@
+"""
+Tests for incremental chart rendering.
+"""
+import os
+import sys
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+# Add the project root and source directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+# Create a QApplication instance for testing
+app = QApplication.instance() or QApplication([])
+
+from core.ui.components import ChartView, decimate_minmax
+
+def test_decimate_minmax_keeps_extremes():
+    """Test that decimation keeps every bucket's minimum and maximum."""
+    x = np.arange(100_001, dtype=np.float64)
+    y = np.sin(x / 1000.0)
+    y[12_345] = 50.0
+    y[67_890] = -50.0
+
+    x_small, y_small = decimate_minmax(x, y, 500)
+    assert len(x_small) <= 2 * 500 + 3
+    assert np.all(np.diff(x_small) > 0)
+    assert y_small.max() == 50.0 and y_small.min() == -50.0
+    assert x_small[0] == 0 and x_small[-1] == 100_000
+
+    # Short lines are left alone
+    x_short, y_short = decimate_minmax(x[:10], y[:10], 500)
+    assert len(x_short) == 10
+
+def test_charts_update_in_place():
+    """Test that repeated plots reuse the existing artists."""
+    view = ChartView()
+    view.plot_bar_chart(["a", "b"], [1.0, 2.0], "Bars")
+    view.flush()
+    bars = list(view._bars)
+    view.plot_bar_chart(["a", "b"], [3.0, 4.0], "Bars")
+    view.flush()
+    assert list(view._bars) == bars
+    assert [bar.get_height() for bar in bars] == [3.0, 4.0]
+
+    view.plot_pie_chart(["a", "b", "c"], [1.0, 1.0, 2.0], "Pie")
+    view.flush()
+    wedges, texts, autotexts = view._pie_artists
+    view.plot_pie_chart(["a", "b", "c"], [2.0, 1.0, 1.0], "Pie")
+    view.flush()
+    assert view._pie_artists[0] == wedges
+    assert [(wedge.theta1, wedge.theta2) for wedge in wedges] == [(0.0, 180.0), (180.0, 270.0), (270.0, 360.0)]
+    assert [text.get_text() for text in autotexts] == ["50.0%", "25.0%", "25.0%"]
+    assert texts[0].get_position() == pytest.approx((0.0, 1.1), abs=1e-9)
+
+    # The in-place layout matches a freshly drawn pie
+    fresh = ChartView()
+    fresh.plot_pie_chart(["a", "b", "c"], [2.0, 1.0, 1.0], "Pie")
+    for updated, drawn in zip(view._pie_artists[1] + view._pie_artists[2],
+                              fresh._pie_artists[1] + fresh._pie_artists[2]):
+        assert updated.get_position() == pytest.approx(drawn.get_position(), abs=1e-6)
+        assert updated.get_text() == drawn.get_text()
+        assert updated.get_horizontalalignment() == drawn.get_horizontalalignment()
+
+    x = np.arange(1_000_000, dtype=np.float64)
+    view.plot_line_chart(x, np.sin(x / 1e4))
+    view.flush()
+    line = view._line
+    assert len(line.get_xdata()) < 10_000
+
+    # Data within the current limits is blitted onto the saved background
+    assert view._background is not None
+    view.plot_line_chart(x, 0.5 * np.sin(x / 1e4))
+    assert not view._full_draw_pending
+    view.flush()
+    assert view._line is line
+
+    # Data outside them rescales the axes
+    view.plot_line_chart(x, 10 * np.sin(x / 1e4))
+    assert view.ax.get_ylim()[1] >= 10
+    view.flush()
+    assert view._line is line
+
+def test_redraws_are_coalesced():
+    """Test that several updates within one frame cause one redraw."""
+    view = ChartView(max_fps=10)
+    draws = []
+    view.canvas.mpl_connect("draw_event", lambda event: draws.append(event))
+    for i in range(5):
+        view.plot_bar_chart(["a", "b"], [i, i + 1])
+    assert draws == []
+    view.flush()
+    assert len(draws) == 1
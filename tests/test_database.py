@@ -0,0 +1,48 @@
+"""
+Tests for the core database engine factory and session handling.
+"""
+import os
+import sys
+import pytest
+from sqlalchemy import text
+
+# Add the project root and source directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from core.data import database
+from core.data.database import create_db_engine, configure_database, session_scope, init_db
+from core.data.models import User
+
+def test_sqlite_pragmas(tmp_path):
+    """Test that PRAGMAs are applied to file database connections."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}", pragmas={"cache_size": -2000})
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert connection.execute(text("PRAGMA cache_size")).scalar() == -2000
+    engine.dispose()
+
+def test_session_scope_with_memory_database():
+    """Test swapping in an in-memory database and committing/rolling back."""
+    configure_database("sqlite:///:memory:")
+    init_db()
+    
+    with session_scope() as db:
+        db.add(User(name="Test User", email="test@example.com"))
+    
+    # A new session sees the committed row on the shared in-memory connection
+    with session_scope() as db:
+        assert db.query(User).count() == 1
+    
+    with pytest.raises(RuntimeError):
+        with session_scope() as db:
+            db.add(User(name="Rolled Back", email="rollback@example.com"))
+            db.flush()
+            raise RuntimeError("abort")
+    
+    with session_scope() as db:
+        assert db.query(User).count() == 1
+    
+    assert database.get_engine() is database.engine
@@ -7,13 +7,15 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-# Add the project root to the Python path
+# Add the project root, source directory and LCA module source to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'modules', 'lca', 'src')))
 
-from src.core.data.database import Base
-from src.core.data.models import User, Project
-from src.modules.lca.src.models import LifeCycleStage, ImpactFactor
-from src.modules.lca.src.controllers import calculate_impact
+from core.data.database import Base
+from core.data.models import User, Project
+from models import LifeCycleStage, ImpactFactor
+from controllers import calculate_impact
 
 @pytest.fixture
 def db_session():
@@ -0,0 +1,82 @@
+"""
+Tests for the queued logging pipeline.
+"""
+import io
+import os
+import sys
+import time
+import logging
+
+# Add the project root and source directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from core.utils.logger import ConsoleHandler, DuplicateFilter, setup_logger, shutdown_logging
+
+def make_record(message, level=logging.WARNING, **extra):
+    """Create a log record."""
+    record = logging.LogRecord("test", level, __file__, 1, message, (), None)
+    record.__dict__.update(extra)
+    return record
+
+def test_duplicate_filter_counts_repeats():
+    """Test that repeated warnings are suppressed and counted."""
+    dedup = DuplicateFilter(interval=3600)
+    assert dedup.filter(make_record("missing X"))
+    assert not dedup.filter(make_record("missing X"))
+    assert not dedup.filter(make_record("missing X"))
+    assert dedup.filter(make_record("missing Y"))
+
+    # Info records and records with a different key pass
+    assert dedup.filter(make_record("progress", level=logging.INFO))
+    assert dedup.filter(make_record("progress", level=logging.INFO))
+    assert dedup.filter(make_record("missing X (1 entries)", dedup_key="X"))
+    assert not dedup.filter(make_record("missing X (2 entries)", dedup_key="X"))
+
+    summaries = sorted(record.getMessage() for record in dedup.drain())
+    assert summaries == ["missing X (2 entries) (repeated 1 more times)",
+                         "missing X (repeated 2 more times)"]
+    assert dedup.drain() == []
+
+def test_duplicate_filter_window():
+    """Test that the first repeat after the window reports the count."""
+    dedup = DuplicateFilter(interval=0.05)
+    assert dedup.filter(make_record("slow"))
+    assert not dedup.filter(make_record("slow"))
+    time.sleep(0.06)
+    record = make_record("slow")
+    assert dedup.filter(record)
+    assert record.getMessage().startswith("slow (repeated 1 more times")
+
+def test_pipeline_writes_through_listener(tmp_path):
+    """Test that loggers share one queue per file and records reach it."""
+    log_file = tmp_path / "logs" / "test.log"
+    first = setup_logger("pipeline.first", log_file=log_file)
+    second = setup_logger("pipeline.second", log_file=log_file)
+    assert first.handlers[0] is second.handlers[0]
+
+    first.info("hello")
+    for _ in range(100):
+        second.warning("disk full")
+    shutdown_logging()
+
+    lines = log_file.read_text().splitlines()
+    assert lines[0].endswith("pipeline.first - INFO - hello")
+    assert lines[1].endswith("pipeline.second - WARNING - disk full")
+    assert lines[2].endswith("disk full (repeated 99 more times)")
+    assert len(lines) == 3
+
+    # Shutdown detaches the stopped pipeline from its loggers
+    assert first.handlers == [] and second.handlers == []
+
+def test_console_handler_skips_closed_stream(monkeypatch):
+    """Test that the console handler follows sys.stderr and ignores it once closed."""
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", stream)
+    handler = ConsoleHandler()
+
+    handler.handle(make_record("written"))
+    assert stream.getvalue() == "written\n"
+
+    stream.close()
+    handler.handle(make_record("dropped"))
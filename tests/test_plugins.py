@@ -0,0 +1,144 @@
+"""
+Tests for module manifests and lazy module loading.
+"""
+import os
+import sys
+import json
+import threading
+from concurrent.futures import Future
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+# Add the project root and source directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+# Create a QApplication instance for testing
+app = QApplication.instance() or QApplication([])
+
+from core.data.database import configure_database, init_db
+from core.ui.main_window import MainWindow
+from core.plugins import ModuleManifest, ModuleRegistry, PluginLoader, load_manifest
+from config.settings import MODULES_DIR
+
+@pytest.fixture
+def window():
+    """Create a main window on an in-memory database."""
+    configure_database("sqlite:///:memory:")
+    init_db()
+    return MainWindow()
+
+def test_manifest_from_file(tmp_path):
+    """Test reading and validating manifests."""
+    module_dir = tmp_path / "demo"
+    module_dir.mkdir()
+    (module_dir / "module.json").write_text(json.dumps({"title": "Demo"}))
+
+    manifest = ModuleManifest.from_file(module_dir / "module.json")
+    assert manifest.name == "demo"
+    assert manifest.entry_point == "main:run_module"
+    assert manifest.src_dir == module_dir / "src"
+
+    (module_dir / "module.json").write_text("{}")
+    with pytest.raises(ValueError):
+        ModuleManifest.from_file(module_dir / "module.json")
+
+    assert load_manifest("missing", tmp_path) is None
+
+def test_modules_open_on_demand(window):
+    """Test that registering only adds a menu entry and opening imports the module."""
+    loader = PluginLoader(window)
+    assert loader.register_module("lca", MODULES_DIR) is not None
+    assert loader.register_module("pha", MODULES_DIR) is None
+
+    actions = window.modules_menu.actions()
+    assert [action.text() for action in actions] == ["Life Cycle Analysis"]
+    assert not loader.is_loaded("lca")
+    assert window.tabs.count() == 0
+
+    actions[0].trigger()
+    assert loader.is_loaded("lca")
+    assert window.tabs.count() == 1
+    assert window.tabs.tabText(0) == "Life Cycle Analysis"
+
+    # Opening again switches to the existing tab
+    assert loader.open_module("lca")
+    assert window.tabs.count() == 1
+
+    # A closed module gets a new tab
+    window.close_tab(0)
+    assert loader.open_module("lca")
+    assert window.tabs.count() == 1
+
+def test_registry_discovery_uses_cached_index(tmp_path):
+    """Test that the index is rebuilt only when module files change."""
+    modules_dir = tmp_path / "modules"
+    for name in ("alpha", "beta"):
+        (modules_dir / name / "src").mkdir(parents=True)
+        (modules_dir / name / "src" / "main.py").write_text("")
+    (modules_dir / "alpha" / "module.json").write_text(json.dumps({"title": "Alpha", "init": "setup:run"}))
+    (modules_dir / "not_a_module").mkdir()
+    index_path = tmp_path / "index.json"
+
+    registry = ModuleRegistry(modules_dir, index_path)
+    manifests = registry.discover()
+    assert registry.index_rebuilt
+    assert sorted(manifests) == ["alpha", "beta"]
+    assert manifests["alpha"].init == "setup:run"
+    assert manifests["beta"].title == "Beta"
+
+    registry = ModuleRegistry(modules_dir, index_path)
+    assert sorted(registry.discover()) == ["alpha", "beta"]
+    assert not registry.index_rebuilt
+
+    # Editing a manifest invalidates the index
+    manifest_path = modules_dir / "alpha" / "module.json"
+    manifest_path.write_text(json.dumps({"title": "Alpha 2"}))
+    os.utime(manifest_path, ns=(0, 1))
+    registry = ModuleRegistry(modules_dir, index_path)
+    assert registry.discover()["alpha"].title == "Alpha 2"
+    assert registry.index_rebuilt
+
+    # Missing modules are skipped
+    assert [manifest.name for manifest in registry.enabled(["beta", "pha", "alpha"])] == ["beta", "alpha"]
+
+def test_registry_initialization_is_isolated(tmp_path):
+    """Test that background initialization runs, is timed and isolates failures."""
+    configure_database("sqlite:///:memory:")
+    init_db()
+    registry = ModuleRegistry(MODULES_DIR, tmp_path / "index.json")
+    lca = registry.enabled(["lca"])[0]
+    broken = ModuleManifest("broken", "Broken", MODULES_DIR / "broken", init="startup:initialize")
+
+    # The broken module's init can't be imported; lca is unaffected
+    registry.initialize([lca, broken])
+    assert registry.wait("lca")
+    assert not registry.wait("broken")
+    assert "broken" in registry.errors and "lca" not in registry.errors
+    assert registry.timings["lca"]["init"] > 0
+    assert registry.report().startswith("lca: init")
+    registry.shutdown()
+
+def test_open_during_initialization_shows_placeholder(window, tmp_path):
+    """Test that opening a module that is still initializing doesn't block."""
+    registry = ModuleRegistry(MODULES_DIR, tmp_path / "index.json")
+    loader = PluginLoader(window, registry)
+    loader.register(registry.enabled(["lca"])[0])
+
+    # Stand in for an initialization that is still running
+    future = Future()
+    registry._futures["lca"] = future
+    assert loader.open_module("lca")
+    assert not loader.is_loaded("lca")
+    assert window.tabs.count() == 1
+    assert window.tabs.tabText(0) == "Life Cycle Analysis"
+    placeholder = window.tabs.widget(0)
+
+    # Finishing on another thread replaces the placeholder on the GUI thread
+    thread = threading.Thread(target=future.set_result, args=(None,))
+    thread.start()
+    thread.join()
+    app.processEvents()
+    assert loader.is_loaded("lca")
+    assert window.tabs.count() == 1
+    assert window.tabs.widget(0) is not placeholder
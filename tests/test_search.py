@@ -0,0 +1,98 @@
+"""
+Tests for project search.
+"""
+import os
+import sys
+import pytest
+from sqlalchemy import text
+
+# Add the project root and source directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from core.data.database import configure_database, session_scope, init_db
+from core.data.models import Project, Tag
+from core.data.search import search_projects, to_match_query
+
+@pytest.fixture
+def projects():
+    """Create tagged projects in a fresh in-memory database."""
+    configure_database("sqlite:///:memory:")
+    init_db()
+    with session_scope() as db:
+        steel, concrete, bridge = Tag(name="steel"), Tag(name="concrete"), Tag(name="bridge")
+        db.add_all([
+            Project(name="River Bridge", description="Steel truss crossing", tags=[steel, bridge]),
+            Project(name="Parking Garage", description="Precast concrete decks on concrete columns", tags=[concrete]),
+            Project(name="Footbridge", description="Concrete and steel bridge", tags=[steel, concrete, bridge]),
+            Project(name="Warehouse", description=None, tags=[steel])
+        ])
+
+def names(result):
+    """Get the project names of a search result."""
+    return [hit.name for hit in result["results"]]
+
+def test_text_search(projects):
+    """Test ranked prefix search over names and descriptions."""
+    with session_scope() as db:
+        # A name match outranks a description-only match
+        assert names(search_projects(db, "bridge")) == ["River Bridge", "Footbridge"]
+        # More matching terms rank higher
+        assert names(search_projects(db, "concr")) == ["Parking Garage", "Footbridge"]
+        assert names(search_projects(db, "steel truss")) == ["River Bridge"]
+        assert search_projects(db, "nothing")["results"] == []
+        assert search_projects(db, "***")["results"] == []
+
+def test_tag_intersection(projects):
+    """Test that tag filters require every tag."""
+    with session_scope() as db:
+        assert names(search_projects(db, tags=["steel"])) == ["Footbridge", "River Bridge", "Warehouse"]
+        assert names(search_projects(db, tags=["steel", "concrete"])) == ["Footbridge"]
+        assert names(search_projects(db, "crossing", tags=["steel"])) == ["River Bridge"]
+        assert names(search_projects(db, "crossing", tags=["concrete"])) == []
+
+def test_tag_intersection_counts_distinct_tags():
+    """Test that repeated tags and repeated association rows don't satisfy other tags."""
+    configure_database("sqlite:///:memory:")
+    with session_scope() as db:
+        # An association table from before the (tag_id, project_id) primary key
+        db.execute(text("CREATE TABLE tags_association (tag_id INTEGER, project_id INTEGER)"))
+    init_db()
+    with session_scope() as db:
+        steel = Tag(name="steel")
+        warehouse = Project(name="Warehouse", tags=[steel])
+        db.add_all([warehouse, Tag(name="concrete")])
+        db.flush()
+        db.execute(text("INSERT INTO tags_association (tag_id, project_id) VALUES (:tag, :project)"),
+                   {"tag": steel.id, "project": warehouse.id})
+
+    with session_scope() as db:
+        assert names(search_projects(db, tags=["steel", "steel"])) == ["Warehouse"]
+        assert names(search_projects(db, tags=["steel", "concrete"])) == []
+
+def test_pagination(projects):
+    """Test page boundaries."""
+    with session_scope() as db:
+        first = search_projects(db, tags=["steel"], page=1, page_size=2)
+        second = search_projects(db, tags=["steel"], page=2, page_size=2)
+        assert names(first) == ["Footbridge", "River Bridge"] and first["has_more"]
+        assert names(second) == ["Warehouse"] and not second["has_more"]
+
+def test_index_follows_orm_changes(projects):
+    """Test that inserts, updates and deletes are reflected in the index."""
+    with session_scope() as db:
+        warehouse = db.query(Project).filter_by(name="Warehouse").one()
+        warehouse.description = "Timber frame storage"
+        db.add(Project(name="Timber Pavilion"))
+
+    with session_scope() as db:
+        assert sorted(names(search_projects(db, "timber"))) == ["Timber Pavilion", "Warehouse"]
+        db.delete(db.query(Project).filter_by(name="Timber Pavilion").one())
+
+    with session_scope() as db:
+        assert names(search_projects(db, "timber")) == ["Warehouse"]
+
+def test_match_query_escaping():
+    """Test that free text is turned into quoted prefix terms."""
+    assert to_match_query('steel "OR" bridge-') == '"steel"* "OR"* "bridge"*'
+    assert to_match_query("  ") is None
@@ -0,0 +1,81 @@
+"""
+Tests for the array-backed table view.
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt, QItemSelectionModel
+from PyQt5.QtWidgets import QApplication
+
+# Add the project root and source directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+# Create a QApplication instance for testing
+app = QApplication.instance() or QApplication([])
+
+from core.ui.components import TableView
+
+def test_row_api():
+    """Test the row-based API used by existing views."""
+    table = TableView()
+    table.set_headers(["Stage", "CO2 (kg)"])
+    table.add_row(["Manufacturing", 1.5])
+    table.add_row(["Transport", 0.25])
+
+    assert table.rowCount() == 2
+    assert table.columnCount() == 2
+    assert table.get_data() == [["Manufacturing", "1.5"], ["Transport", "0.25"]]
+
+    columns = table.get_columns()
+    assert columns["CO2 (kg)"].dtype == np.float64
+    assert columns["CO2 (kg)"].tolist() == [1.5, 0.25]
+
+    table.clear_rows()
+    assert table.rowCount() == 0
+    assert table.columnCount() == 2
+
+def test_large_array_is_not_copied():
+    """Test showing a million-row array."""
+    table = TableView()
+    data = np.arange(3_000_000, dtype=np.float64).reshape(-1, 3)
+    table.set_array(data, ["a", "b", "c"])
+
+    assert table.rowCount() == 1_000_000
+    assert np.shares_memory(table.get_columns()["a"], data)
+    index = table.table_model.index(999_999, 2)
+    assert table.table_model.data(index) == "3e+06"
+
+def test_sort_and_filter():
+    """Test sorting and filtering through the model."""
+    table = TableView()
+    table.set_dataframe(pd.DataFrame({"name": ["beta", "Alpha", "gamma"], "value": [2, 3, 1]}))
+
+    table.sortByColumn(1, Qt.AscendingOrder)
+    assert table.get_columns()["name"].tolist() == ["gamma", "beta", "Alpha"]
+    table.sortByColumn(0, Qt.DescendingOrder)
+    assert table.get_columns()["name"].tolist() == ["gamma", "beta", "Alpha"]
+
+    table.set_filter("A", column=0)
+    assert table.rowCount() == 3
+    table.set_filter("ta")
+    assert table.get_columns()["name"].tolist() == ["beta"]
+
+    # Rows appended while filtered stay visible
+    table.add_row(["delta", 4])
+    assert table.rowCount() == 2
+    table.set_filter("")
+    assert table.rowCount() == 4
+
+def test_copy_selection():
+    """Test copying selected cells as tab-separated text."""
+    table = TableView()
+    table.set_columns({"x": np.array([1, 2, 3]), "y": np.array([0.5, 1.5, 2.5])})
+    selection = table.selectionModel()
+    for row in (0, 2):
+        for column in (0, 1):
+            selection.select(table.table_model.index(row, column), QItemSelectionModel.Select)
+
+    assert table.copy_selection() == "1\t0.5\n3\t2.5"
+    assert QApplication.clipboard().text() == "1\t0.5\n3\t2.5"
@@ -0,0 +1,91 @@
+"""
+Tests for the background task runner.
+"""
+import os
+import sys
+import threading
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+# Add the project root and source directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+# Create a QApplication instance for testing
+app = QApplication.instance() or QApplication([])
+
+from core.ui.tasks import TaskRunner
+
+@pytest.fixture
+def runner():
+    """Create a task runner."""
+    return TaskRunner()
+
+def test_result_delivered_on_gui_thread(runner):
+    """Test that the function runs on a worker thread and callbacks on the GUI thread."""
+    events = {}
+    
+    def work(x, y=1):
+        events["worker"] = threading.current_thread()
+        return x + y
+    
+    def finished(result):
+        events["result"] = result
+        events["callback"] = threading.current_thread()
+    
+    task = runner.submit(work, 2, y=3, on_finished=finished)
+    assert runner.wait(timeout=10)
+    assert task.done
+    assert events["result"] == 5
+    assert events["worker"] is not threading.main_thread()
+    assert events["callback"] is threading.main_thread()
+
+def test_failure(runner):
+    """Test that exceptions are passed to on_failed."""
+    errors = []
+    
+    def work():
+        raise ValueError("bad input")
+    
+    runner.submit(work, on_failed=errors.append, on_finished=lambda result: errors.append("finished"))
+    assert runner.wait(timeout=10)
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+
+def test_progress_and_cancellation(runner):
+    """Test progress reports and cooperative cancellation."""
+    started = threading.Event()
+    release = threading.Event()
+    progress = []
+    outcome = []
+    
+    def work(context):
+        context.report(1, 4, "first")
+        started.set()
+        release.wait(10)
+        for done in range(2, 5):
+            context.report(done, 4)
+        return "completed"
+    
+    task = runner.submit(work, pass_context=True, on_progress=lambda p, m: progress.append((p, m)),
+                         on_finished=outcome.append, on_cancelled=lambda: outcome.append("cancelled"))
+    assert started.wait(10)
+    task.cancel()
+    release.set()
+    assert runner.wait(timeout=10)
+    
+    assert outcome == ["cancelled"]
+    assert progress == [(25, "first")]
+    assert runner.active_count == 0
+
+def test_cancelled_result_is_discarded(runner):
+    """Test that a task without cancellation checks has its result discarded."""
+    release = threading.Event()
+    outcome = []
+    
+    task = runner.submit(lambda: release.wait(10), on_finished=outcome.append,
+                         on_cancelled=lambda: outcome.append("cancelled"))
+    runner.cancel_all()
+    release.set()
+    assert runner.wait(timeout=10)
+    assert task.cancelled
+    assert outcome == ["cancelled"]